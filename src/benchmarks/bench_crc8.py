@@ -0,0 +1,79 @@
+"""
+Benchmark of the CRC8 used to validate protocol frames.
+
+Compares the previous call pattern of SerialProtocolFmcw (copy the frame into a list and append
+a placeholder byte for calculate_crc) with crc8() on the zero-copy view of the receive buffer,
+and with crc8_many() validating a batch of frames in one call. Frame sizes match the protocol:
+a 4-byte command, a 150-byte status reply and a 1027-byte ADC frame.
+
+Run from the src folder:
+
+    python -m benchmarks.bench_crc8
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from serialbsp.crc8 import crc8, crc8_many, crc8_table
+
+FRAME_SIZES = [4, 150, 1027]
+BATCH_SIZE = 256  # Frames per crc8_many() call
+REPEAT = 5
+
+
+def legacy_crc(data):
+    """Previous implementation of calculate_crc, list-indexed table over data[:-1]."""
+    crc = 0
+    for byte in data[:-1]:
+        crc = crc8_table[crc ^ byte]
+    return crc
+
+
+def build_frames(size: int, count: int = BATCH_SIZE, seed: int = 1) -> list[memoryview]:
+    """Builds frames with a valid CRC byte, returned as views like RingBuffer.view() hands out."""
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        frame = bytearray(rng.randrange(256) for _ in range(size - 1))
+        frame.append(legacy_crc(frame + b"\0"))
+        frames.append(memoryview(frame))
+    return frames
+
+
+def legacy_batch(frames) -> int:
+    return sum(legacy_crc(list(frame[:-1]) + [0]) == frame[-1] for frame in frames)
+
+
+def crc8_batch(frames) -> int:
+    return sum(crc8(frame, 0, len(frame) - 1) == frame[-1] for frame in frames)
+
+
+def crc8_many_batch(frames) -> int:
+    return sum(crc == frame[-1] for crc, frame in zip(crc8_many(frames, end_offset=1), frames))
+
+
+def measure(function, frames) -> tuple[float, int]:
+    """Returns the best time per frame in microseconds and the number of valid frames."""
+    best = float("inf")
+    valid = 0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        valid = function(frames)
+        best = min(best, time.perf_counter() - start)
+    return best / len(frames) * 1e6, valid
+
+
+if __name__ == '__main__':
+    print(f"{BATCH_SIZE} frames per size, best of {REPEAT} runs, time per frame")
+    print(f"{'size':>6} {'legacy [us]':>12} {'crc8 [us]':>10} {'crc8_many [us]':>15} {'speedup':>8} {'many':>7}")
+    for size in FRAME_SIZES:
+        frames = build_frames(size)
+        legacy_time, legacy_valid = measure(legacy_batch, frames)
+        crc8_time, crc8_valid = measure(crc8_batch, frames)
+        many_time, many_valid = measure(crc8_many_batch, frames)
+        assert legacy_valid == crc8_valid == many_valid == len(frames)
+        print(f"{size:>6} {legacy_time:>12.2f} {crc8_time:>10.2f} {many_time:>15.2f}"
+              f" {legacy_time / crc8_time:>7.1f}x {legacy_time / many_time:>6.1f}x")
@@ -0,0 +1,69 @@
+"""
+Benchmark of the memory-mapped frame store.
+
+Writes sweeps of ADC and FFT frames of all four antennas to a temporary store, then opens it
+and times the index lookup of a time range and the load of one antenna's ADC frames, the
+way a browser of an overnight capture would.
+
+Run from the src folder:
+
+    python -m benchmarks.bench_frame_store [sweeps]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from measurement.frame_store import FrameStore, FrameStoreWriter, index_path
+from measurement.frames import ADC, ANTENNAS, FFT, MeasurementFrame, measurement_type
+
+SWEEPS = 20000
+SWEEP_PERIOD = 0.01  # seconds between sweeps in the generated timestamps
+
+
+def build_frames() -> list[MeasurementFrame]:
+    """One sweep of frames with random samples, reused with new timestamps."""
+    rng = np.random.default_rng(1)
+    frames = []
+    for antenna in ANTENNAS:
+        for kind in (ADC, FFT):
+            measurement = measurement_type(kind, antenna)
+            samples = rng.integers(0, 4096, measurement.sample_count).astype(measurement.dtype)
+            frames.append(MeasurementFrame(antenna, kind, 0.0, samples, measurement.code))
+    return frames
+
+
+if __name__ == '__main__':
+    sweeps = int(sys.argv[1]) if len(sys.argv) > 1 else SWEEPS
+    sweep = build_frames()
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench.fms")
+        started = time.perf_counter()
+        with FrameStoreWriter(path) as writer:
+            for index in range(sweeps):
+                for frame in sweep:
+                    frame.timestamp = index * SWEEP_PERIOD
+                    writer(frame)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path) + os.path.getsize(index_path(path))
+        print(f"write  {writer.frames:,} frames, {size / 1e6:,.1f} MB in {elapsed:.2f} s "
+              f"({writer.frames / elapsed:,.0f} frames/s, {size / elapsed / 1e6:,.0f} MB/s)")
+
+        started = time.perf_counter()
+        store = FrameStore(path)
+        print(f"open   {(time.perf_counter() - started) * 1000:.2f} ms")
+        middle = sweeps * SWEEP_PERIOD / 2
+        started = time.perf_counter()
+        positions = store.select(middle, middle + 10.0, antenna=2, kind=FFT)
+        print(f"select {len(positions):,} FFT frames of antenna 2 in 10 s: {(time.perf_counter() - started) * 1000:.2f} ms")
+        started = time.perf_counter()
+        timestamps, samples = store.load(ADC, 1)
+        elapsed = time.perf_counter() - started
+        print(f"load   all ADC frames of antenna 1 {samples.shape}: {elapsed * 1000:.1f} ms "
+              f"({samples.nbytes / elapsed / 1e6:,.0f} MB/s)")
+        store.close()
+        del timestamps, samples
@@ -0,0 +1,108 @@
+"""
+Benchmark of the unsolicited-line framing used by SerialProtocolFmcw.
+
+Compares the previous implementation (decode the whole buffer as UTF-8 and search for three
+delimiters after every extracted line) with the incremental LineScanner over a RingBuffer.
+The input is a 64 KB stream of firmware debug text mixed with binary blocks, fed in chunks
+the way SerialPortReader delivers them.
+
+Run from the src folder:
+
+    python -m benchmarks.bench_line_framing
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from serialbsp.line_scanner import LineScanner
+from serialbsp.ring_buffer import RingBuffer
+
+STREAM_SIZE = 64 * 1024
+MAXIMUM_PACKET_SIZE = 1024  # Same runaway limit as the protocol
+CHUNK_SIZES = [64, 1024, 4096]
+REPEAT = 5
+
+
+def build_stream(size: int = STREAM_SIZE, seed: int = 1) -> bytes:
+    """Builds a mixed stream of debug lines and binary blocks without line delimiters."""
+    rng = random.Random(seed)
+    stream = bytearray()
+    while len(stream) < size:
+        if rng.random() < 0.8:
+            line = f"[dbg] t={rng.randint(0, 99999)} adc={rng.randint(0, 4095)} state={rng.choice(['IDLE', 'MEAS', 'FFT'])}"
+            stream += line.encode() + rng.choice([b"\r\n", b"\n", b"\r"])
+        else:
+            block = bytes(rng.randrange(256) for _ in range(rng.randint(16, 600)))
+            stream += block.replace(b"\r", b"").replace(b"\n", b"") + b"\n"
+    return bytes(stream[:size])
+
+
+def legacy_framing(stream: bytes, chunk_size: int) -> int:
+    """Previous implementation: whole-buffer decode plus three find() calls per line."""
+    buffer = bytearray()
+    lines = 0
+    for offset in range(0, len(stream), chunk_size):
+        buffer.extend(stream[offset:offset + chunk_size])
+        while buffer:
+            decoded_buffer = buffer.decode('utf-8', errors='ignore')
+            consumed = 0
+            for delimiter in ['\r\n', '\n', '\r']:
+                end_index = decoded_buffer.find(delimiter)
+                if end_index != -1:
+                    consumed = end_index + len(delimiter)
+                    message = bytes(buffer[:consumed]).decode('utf-8', errors='ignore').strip()
+                    lines += bool(message)
+                    break
+            if not consumed:
+                if len(buffer) > 2 * MAXIMUM_PACKET_SIZE:
+                    buffer.clear()
+                break
+            del buffer[:consumed]
+    return lines
+
+
+def incremental_framing(stream: bytes, chunk_size: int) -> int:
+    """Current implementation: LineScanner over a RingBuffer, decoding only extracted lines."""
+    buffer = RingBuffer(16 * MAXIMUM_PACKET_SIZE)
+    scanner = LineScanner()
+    lines = 0
+    for offset in range(0, len(stream), chunk_size):
+        buffer.extend(stream[offset:offset + chunk_size])
+        while buffer:
+            consumed = scanner.find_line_end(buffer)
+            if consumed == -1:
+                if len(buffer) > 2 * MAXIMUM_PACKET_SIZE:
+                    buffer.clear()
+                    scanner.reset()
+                break
+            message = str(buffer.view(0, consumed), 'utf-8', errors='ignore').strip()
+            lines += bool(message)
+            buffer.consume(consumed)
+            scanner.consumed(consumed)
+    return lines
+
+
+def measure(function, stream: bytes, chunk_size: int) -> tuple[float, int]:
+    best = float("inf")
+    lines = 0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        lines = function(stream, chunk_size)
+        best = min(best, time.perf_counter() - start)
+    return best, lines
+
+
+if __name__ == '__main__':
+    stream = build_stream()
+    print(f"Stream: {len(stream)} bytes of mixed text/binary, best of {REPEAT} runs")
+    print(f"{'chunk':>6} {'legacy [ms]':>12} {'incremental [ms]':>17} {'speedup':>8} {'lines':>7}")
+    for chunk_size in CHUNK_SIZES:
+        legacy_time, legacy_lines = measure(legacy_framing, stream, chunk_size)
+        new_time, new_lines = measure(incremental_framing, stream, chunk_size)
+        print(f"{chunk_size:>6} {legacy_time * 1000:>12.2f} {new_time * 1000:>17.2f} {legacy_time / new_time:>7.1f}x {new_lines:>7}"
+              + ("" if legacy_lines == new_lines else f"  (legacy: {legacy_lines})"))
+    print("The legacy line count differs because it uses character offsets of the decoded buffer as byte")
+    print("offsets, which drift whenever the binary blocks contain bytes that are not valid UTF-8.")
@@ -0,0 +1,79 @@
+"""
+Benchmark of the decoding of ADC measurement frames into sample arrays.
+
+Compares unpacking the 1027-byte ADC frame with struct into a tuple of ints, the zero-copy
+np.frombuffer() view of decode_measurement_frame(), the full MeasurementPipeline.feed() path,
+and decode_measurement_batch() on a batch of frames.
+
+Run from the src folder:
+
+    python -m benchmarks.bench_measurement_decode
+"""
+import os
+import random
+import struct
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from measurement.frames import MeasurementPipeline, decode_measurement_batch, decode_measurement_frame, measurement_type
+from serialbsp.crc8 import crc8
+
+FRAMES = 20000
+BATCH_SIZE = 256
+REPEAT = 3
+
+
+def build_adc_frames(count: int, antenna: int = 1, seed: int = 1) -> list[bytes]:
+    """Builds ADC responses with random 12-bit samples and a valid CRC."""
+    measurement = measurement_type("adc", antenna)
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(min(count, 64)):
+        frame = bytearray([measurement.code, 0])
+        frame += struct.pack(f"<{measurement.sample_count}H", *(rng.randrange(4096) for _ in range(measurement.sample_count)))
+        frame.append(crc8(frame))
+        frames.append(bytes(frame))
+    return [frames[i % len(frames)] for i in range(count)]
+
+
+def best_of(function, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def struct_unpack(frames):
+    unpack = struct.Struct("<512H").unpack_from
+    for frame in frames:
+        unpack(frame, 2)
+
+
+def frombuffer(frames):
+    for frame in frames:
+        decode_measurement_frame(frame, 0.0)
+
+
+def pipeline(frames):
+    measurement_pipeline = MeasurementPipeline()
+    measurement_pipeline.add_stage(lambda frame: frame.samples.mean())
+    for frame in frames:
+        measurement_pipeline.feed(frame, 0.0)
+
+
+def batched(frames):
+    for start in range(0, len(frames), BATCH_SIZE):
+        decode_measurement_batch(frames[start:start + BATCH_SIZE])
+
+
+if __name__ == '__main__':
+    frames = build_adc_frames(FRAMES)
+    print(f"{FRAMES} ADC frames of {len(frames[0])} bytes")
+    for name, function in (("struct.unpack", struct_unpack), ("np.frombuffer", frombuffer),
+                           ("pipeline + mean", pipeline), (f"batch of {BATCH_SIZE}", batched)):
+        elapsed = best_of(function, frames)
+        print(f"{name:<18} {FRAMES / elapsed:>12,.0f} frames/s")
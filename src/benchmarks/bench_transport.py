@@ -0,0 +1,90 @@
+"""
+Load test of the protocol stack over the in-memory loopback transport.
+
+Runs SerialManager, SerialPortReader and SerialProtocolFmcw against a LoopbackTransport whose
+responder answers like the device, and sends pipelined command scripts for a small status
+frame and a 1027-byte ADC frame. No hardware is needed, so the stack can be pushed far beyond
+the rate of a physical UART.
+
+Run from the src folder:
+
+    python -m benchmarks.bench_transport
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from serialbsp.command_script import CommandScript, ScriptStep
+from serialbsp.commands import get_command_by_code, get_command_by_name
+from serialbsp.crc8 import crc8
+from serialbsp.protocol_fmcw import SerialProtocolFmcw
+from serialbsp.serial_manager import SerialManager
+from serialbsp.fd_transport import LoopbackTransport
+from serialbsp.traffic_trace import traffic_trace
+
+REQUEST_SIZE = 3  # [cmd, data, crc]
+REQUESTS = 2000
+PIPELINE_DEPTHS = [1, 8]
+UART_BAUDRATE = 115200
+
+
+def build_response(code: int) -> bytes:
+    """Builds a valid response frame for a command code."""
+    command = get_command_by_code(code)
+    frame = bytearray([code, 0]) + bytes(i & 0xFF for i in range(command.response_size - 3))
+    frame.append(crc8(frame))
+    return bytes(frame)
+
+
+class DeviceStandIn:
+    """Responder of the loopback transport, answers every request with a canned frame."""
+
+    def __init__(self):
+        self.responses = {}
+        self.pending = bytearray()
+
+    def __call__(self, data: bytes) -> bytes:
+        self.pending += data
+        reply = bytearray()
+        while len(self.pending) >= REQUEST_SIZE:
+            code = self.pending[0]
+            del self.pending[:REQUEST_SIZE]
+            if code not in self.responses:
+                self.responses[code] = build_response(code)
+            reply += self.responses[code]
+        return bytes(reply)
+
+
+def run(app, protocol, command_name: str, depth: int):
+    command = get_command_by_name(command_name)
+    script = CommandScript([ScriptStep(command, [0])] * REQUESTS, command_name, depth)
+    job = script.start(protocol)
+    while not job.done():
+        app.processEvents()
+    return job.result()
+
+
+if __name__ == '__main__':
+    app = QCoreApplication(sys.argv)
+    traffic_trace.log_hex = False
+    manager = SerialManager()
+    protocol = SerialProtocolFmcw()
+    manager.data_received.connect(protocol.handle_raw_data)
+    protocol.command_encoded.connect(lambda data: manager.send_data(bytes(data)))
+    manager.open_serial_port("loop://", transport=LoopbackTransport(responder=DeviceStandIn()))
+
+    print(f"{REQUESTS} requests per run over the loopback transport")
+    print(f"{'command':<30} {'depth':>5} {'time [s]':>9} {'req/s':>8} {'MB/s':>7} {'x UART':>7} {'failed':>6}")
+    for name in ["CMD_GET_DEVICE_STATUS", "CMD_START_ADC_MEAS_ANTENNA_1"]:
+        for depth in PIPELINE_DEPTHS:
+            result = run(app, protocol, name, depth)
+            seconds = result.wall_time_ms / 1000
+            received = sum(len(step.response or b"") for step in result.steps)
+            uart_bytes_per_s = UART_BAUDRATE / 10
+            print(f"{name:<30} {depth:>5} {seconds:>9.3f} {REQUESTS / seconds:>8.0f} {received / seconds / 1e6:>7.2f}"
+                  f" {received / seconds / uart_bytes_per_s:>6.0f}x {len(result.failed):>6}")
+    print(f"Writer: {manager.get_writer_stats()}")
+    manager.close_serial_port()
@@ -26,9 +26,14 @@ TEMP_VOLT2CELCIUS_TGAIN0 = ((1000/1.8527))
 class ISL94203Driver:
     """This class provides operations to read and update the configuration values of the ISL94203 battery management system IC. It can translate back and fourth the raw values from the registers to the actual configuration values based on the datasheet.
     """     
-    def __init__(self, resistor: float = 0.005):
-        """Initialize the BMSConfiguration instance with an ISL94203 instance."""
-        self.isl94203_hal = ISL94203Factory.create_instance()
+    def __init__(self, resistor: float = 0.005, hal=None):
+        """Initialize the BMSConfiguration instance with an ISL94203 instance.
+
+        Args:
+            resistor (float): Current sense resistor value.
+            hal (ISL94203_HAL | None): Register image to work on, defaults to the shared instance.
+        """
+        self.isl94203_hal = hal or ISL94203Factory.create_instance()
         self.resistor = resistor # Current sense resistor value in mOhm
 
         # Voltage Limits
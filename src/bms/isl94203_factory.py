@@ -12,3 +12,10 @@ class ISL94203Factory:
         if not cls._instance:
             cls._instance = ISL94203_HAL()
         return cls._instance
+
+    @classmethod
+    def create_device_instance(cls):
+        """
+        Creates a HAL that is not shared, for processes that drive several BMS boards.
+        """
+        return ISL94203_HAL()
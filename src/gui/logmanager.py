@@ -16,10 +16,11 @@ class LogManager:
 
     def log_message(self, message: str):
         """
-        Log a message to the UserLog.
+        Log a message to the UserLog. Can be called from any thread, the message is appended
+        in the GUI thread through the UserLog's message_received signal.
         """
         if self.user_log:
-            self.user_log.append_message(message)
+            self.user_log.message_received.emit(message)
         else:
             print("LogManager not initialized.")
 
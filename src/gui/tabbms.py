@@ -11,17 +11,21 @@ from bms.isl94203_factory import ISL94203Factory
 import logging
 
 from serialbsp.commands import *
+from serialbsp.traffic_trace import HexDump
+from serialbsp.tx_scheduler import TxScheduler
 from gui.global_log_manager import log_manager
 from gui.global_status_bar_manager import status_bar_manager
 from gui.bms_parser import parse_bms_values
 
-REPLY_TIMEOUT = 2000  # seconds
+RAM_LOG_JOB = "bms_ram_log"  # TxScheduler job name of the periodic RAM read
+
 
 class BmsTab:
-    def __init__(self, ui, serial_manager, serial_protocol, bms_driver):
+    def __init__(self, ui, serial_manager, serial_protocol, bms_driver, tx_scheduler=None):
         self.ui = ui
         self.serial_manager = serial_manager
         self.serial_protocol = serial_protocol
+        self.tx_scheduler = tx_scheduler or TxScheduler(serial_protocol)
         
         self.resistor = 0.005
         self.isl94203_driver = bms_driver
@@ -33,8 +37,8 @@ class BmsTab:
         self.cmd_write_eeprom = get_command_by_name("CMD_WRITE_EEPROM")
         self.cmd_write_persistent = get_command_by_name("CMD_WRITE_EEPROM_PERSISTENT")
 
-        self.serial_protocol.data_received.connect(self.process_bms_read_config_response)
-        self.serial_protocol.data_received.connect(self.process_bms_ram_read_config_response)
+        self.serial_protocol.gui_signals.data_received.connect(self.process_bms_read_config_response)
+        self.serial_protocol.gui_signals.data_received.connect(self.process_bms_ram_read_config_response)
 
         # Connect button click to Send Serial Command
         self.ui.findChild(QPushButton, "readPackButton").clicked.connect(self.read_bms_config)
@@ -679,7 +683,7 @@ class BmsTab:
         """
         if self.serial_manager.is_open():
             log_manager.log_message(log_message)
-            self.serial_protocol.encode_command(command, data)
+            self.tx_scheduler.submit(command, data)
             
         else:
             log_manager.log_message("Serial port not open")
@@ -692,8 +696,7 @@ class BmsTab:
             if packet[0] != self.cmd_read_all_memory.code:
                 return
             self.reply_timer.stop()
-            print("packet:", " ".join(f"0x{byte:02x}" for byte in packet))
-            print("packet length:", len(packet))
+            logging.debug("packet [%d bytes]: %s", len(packet), HexDump(packet))
             self.isl94203.set_registers(list(packet[2:-1]))
             self.ui_update_fields()
             register_cfg = self.isl94203.get_registers()
@@ -713,7 +716,7 @@ class BmsTab:
             return
 
         try:
-            self.reply_timer.start(REPLY_TIMEOUT)
+            self.reply_timer.start(self.serial_protocol.response_timeout(self.cmd_read_all_memory))
             self.serial_manager.reset_input_buffer()
             self.serial_manager.reset_output_buffer()
             self._encode_and_send(self.cmd_read_all_memory, [0], self.cmd_read_all_memory.description)
@@ -731,8 +734,7 @@ class BmsTab:
             if packet[0] != self.cmd_read_ram.code:
                 return
             self.reply_timer.stop()
-            print("packet:", " ".join(f"0x{byte:02x}" for byte in packet))
-            print("packet length:", len(packet))
+            logging.debug("packet [%d bytes]: %s", len(packet), HexDump(packet))
             self.isl94203.set_ram_registers(list(packet[2:-1]))
             self.ui_update_ram_fields()
             ram_values = self.isl94203.get_ram_registers()
@@ -752,7 +754,7 @@ class BmsTab:
             status_bar_manager.update_message(f"Error: {ERROR_MESSAGE}.", category="error")
             return
         try:
-            self.reply_timer.start(REPLY_TIMEOUT)
+            self.reply_timer.start(self.serial_protocol.response_timeout(self.cmd_read_ram))
             self.serial_manager.reset_input_buffer()
             self.serial_manager.reset_output_buffer()
             self._encode_and_send(self.cmd_read_ram, [0], self.cmd_read_ram.description)
@@ -762,7 +764,15 @@ class BmsTab:
             status_bar_manager.update_message(f"Error: {e}", category="error")
 
     def log_bms_ram_config(self):
+        """
+        Starts or stops logging the BMS RAM. The RAM is polled as a background job of the transmit
+        scheduler, so it yields the line to interactive commands while keeping its sampling rate.
+        """
         if self.startStopLogButton.isChecked():
+            if not self.serial_manager or not self.serial_manager.is_open():
+                log_manager.log_message("Serial port not open")
+                self.startStopLogButton.setChecked(False)
+                return
             self.startStopLogButton.setText("Stop Log")
             status_bar_manager.update_logging_status(True)
             delay = self.logRateSpinBox.value()
@@ -771,25 +781,30 @@ class BmsTab:
                 self.ram_log_handler = LogHandler(log_type='ram')
 
             self.ram_log_handler.start_log()
-
-            self.read_bms_ram_config()
-
-            ram_values =  self.isl94203.get_ram_registers()
-
-            if ram_values:
-                # Parse the raw data
-                parsed_values = parse_bms_values(ram_values)
-
-                # Write the log entry (raw + parsed data)
-                self.ram_log_handler.write_log_entry(raw_data=ram_values, parsed_data=parsed_values)
-
-            QTimer.singleShot(delay * 1000, self.log_bms_ram_config)
+            self.tx_scheduler.add_periodic(RAM_LOG_JOB, self.cmd_read_ram, [0], delay * 1000, self._log_ram_sample)
         else:
+            self.tx_scheduler.remove_periodic(RAM_LOG_JOB)
             self.startStopLogButton.setText("Start Log")
             status_bar_manager.update_logging_status(False)
             if hasattr(self, 'ram_log_handler'):
                 self.ram_log_handler.stop_log()
 
+    def _log_ram_sample(self, request) -> None:
+        """
+        Writes one RAM sample of the logging job to the log file.
+        """
+        if request.cancelled() or request.exception() is not None:
+            logging.warning(f"BMS RAM log sample failed: {request.exception() if not request.cancelled() else 'cancelled'}")
+            return
+        packet = request.result()
+        ram_values = list(packet[2:-1])
+        if ram_values and hasattr(self, 'ram_log_handler'):
+            # Parse the raw data
+            parsed_values = parse_bms_values(ram_values)
+
+            # Write the log entry (raw + parsed data)
+            self.ram_log_handler.write_log_entry(raw_data=ram_values, parsed_data=parsed_values)
+
     def load_default_config(self):
         config_path = os.path.join(os.path.dirname(__file__), '../..', 'config', 'default_config.yaml')
         try:
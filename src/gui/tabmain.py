@@ -1,23 +1,35 @@
 import logging
-from PySide6.QtCore import QTimer, QByteArray, Slot
+from PySide6.QtCore import QByteArray, Slot
 from PySide6.QtWidgets import (
     QCheckBox,
     QComboBox,
+    QFileDialog,
     QLineEdit,
     QPushButton,
 )
 
 from gui.global_log_manager import log_manager
+from measurement.frame_store import FrameStoreWriter
+from measurement.frames import FFT, MeasurementFrame, MeasurementPipeline
+from measurement.spectrum import FftCrossCheck
+from measurement.streaming import ContinuousAcquisition
+from measurement.sweep import AntennaSweep
 from serialbsp.commands import *
+from serialbsp.command_script import CommandScript
+from serialbsp.port_monitor import PortInfo, PortMonitor
+from serialbsp.traffic_trace import TX, traffic_trace
+from serialbsp.tx_scheduler import TxScheduler
 from gui.global_status_bar_manager import status_bar_manager
 
-REFRESH_RATE = 2000
 MESSAGE_DURATION = 5000
+TARGET_VID = "2047"
+TARGET_PID = "03DF"
 
 class MainTab:
-    def __init__(self, ui, serial_manager, serial_protocol):
+    def __init__(self, ui, serial_manager, serial_protocol, tx_scheduler=None):
         self.ui = ui
         self.serial_manager = serial_manager
+        self.tx_scheduler = tx_scheduler or TxScheduler(serial_protocol)
         self.serial_protocol = serial_protocol
         self.init_ui()
         self.cmd_start_adc_meas_antenna_1 = get_command_by_name("CMD_START_ADC_MEAS_ANTENNA_1")
@@ -61,10 +73,28 @@ class MainTab:
         self.cmd_set_rtc_second = get_command_by_name("CMD_SET_RTC_SECOND")
         self.cmd_set_rtc_calibration = get_command_by_name("CMD_SET_RTC_CALIBRATION")
         self.cmd_set_rtc_dow = get_command_by_name("CMD_SET_RTC_DOW")
+
+        # Map command codes to their respective parsers
+        self._command_parsers = {
+            self.cmd_filter_request.code: self._parse_filter_config_response,
+            self.cmd_get_device_status.code: self._parse_device_status_response,
+            self.cmd_get_sdcard_status.code: self._parse_sd_info_response,
+            # Add more command parsers here as needed
+        }
  
-        #  Connect protocol's command_encoded signal to SerialManager's send_data
-        self.serial_protocol.command_encoded.connect(self._send_encoded_data)
-        self.serial_protocol.data_received.connect(self._process_received_data)
+        #  Connect protocol's command_encoded signal to SerialManager's send_data. The signals are
+        #  taken from gui_signals, which delivers them in the GUI thread when the protocol runs in a worker
+        self.serial_protocol.gui_signals.command_encoded.connect(self._send_encoded_data)
+        self.serial_protocol.gui_signals.response_decoded.connect(self._process_decoded_response)
+
+        # ADC and FFT responses are decoded into sample arrays in the protocol's thread
+        self.measurement_pipeline = MeasurementPipeline()
+        self.fft_cross_check = FftCrossCheck()  # Device FFT against the host FFT of the last ADC frame
+        self.measurement_pipeline.add_stage(self.fft_cross_check)
+        self.measurement_pipeline.add_stage(self._log_measurement_frame)
+        self.measurement_pipeline.attach(self.serial_protocol)
+        self.continuous_acquisition = None
+        self.frame_recorder = None
 
 
     def init_ui(self):
@@ -77,6 +107,7 @@ class MainTab:
         self.setup_var32bits_controls()
         self.setup_remote_controls()
         self.setup_test_command()
+        self.setup_tools_menu()
         self.setup_timers()
 
 
@@ -107,11 +138,13 @@ class MainTab:
             self.serialComboBox.setEnabled(False)
             status_bar_manager.update_message("Serial port connected", category="success", timeout=MESSAGE_DURATION)
             status_bar_manager.update_connection_status(True)
+            self.serial_protocol.baudrate = self.serial_manager.serial_port.baudrate
         else:
             self.serialOpenCloseButton.setText("Open")
             self.serialComboBox.setEnabled(True)
             status_bar_manager.update_message("Serial port disconnected", category="success", timeout=MESSAGE_DURATION)
             status_bar_manager.update_connection_status(False)
+            self.stop_continuous_acquisition()
 
     @Slot(str)
     def log_serial_error(self, error_message: str):
@@ -128,50 +161,44 @@ class MainTab:
         This slot is connected to the serial_protocol's command_encoded signal.
         """
         self.serial_manager.send_data(bytes(encoded_data))
-        hex_values = " ".join(f"0x{byte:02X}" for byte in bytes(encoded_data))
-        log_manager.log_message(f"Tx: {hex_values}\n")
+        log_line = traffic_trace.log_line(TX, encoded_data.data())
+        if log_line:
+            log_manager.log_message(log_line + "\n")
 
     def setup_timers(self):
-        self.timer = QTimer(self.ui)
-        self.timer.timeout.connect(self.update_serial_ports)
-        self.timer.start(REFRESH_RATE)
+        # Ports are enumerated in the monitor's thread, the GUI only handles plug and unplug events
+        self.port_monitor = PortMonitor(vid=TARGET_VID, parent=self.ui)
+        self.port_monitor.port_added.connect(self.on_serial_port_added)
+        self.port_monitor.port_removed.connect(self.on_serial_port_removed)
+        self.port_monitor.start()
 
-    def update_serial_ports(self):
-        TARGET_VID = "2047"
-        TARGET_PID = "03DF"
+    def on_serial_port_added(self, port: PortInfo):
         """
-        Populates the serial port combo box with available ports and auto-connects to the target device.
-        Also checks if the currently opened port is still available and closes it if not.
+        Adds a plugged-in port to the combo box and auto-connects to the target device.
         """
+        self.serialComboBox.addItem(f"{port.device} - {port.description}", port.device)
 
-        available_ports = self.serial_manager.get_available_ports()
-        port_names = [port for port, *_ in available_ports]
-        self.serialComboBox.clear()
-
-        target_index = -1
-        target_port = None
+        # If the target device is found, select it and open the port if not already open
+        if port.pid == TARGET_PID and not self.serial_manager.is_open():
+            self.serialComboBox.setCurrentIndex(self.serialComboBox.findData(port.device))
+            self.toggle_serial()
 
-        # Repopulate the combo box and find the target device
-        for index, (port, description, vid, pid) in enumerate(available_ports):
-            self.serialComboBox.addItem(f"{port} - {description}", port)
-            if vid == TARGET_VID and pid == TARGET_PID:
-                target_index = index
-                target_port = port
-                break  # Stop searching after finding the target device
+    def on_serial_port_removed(self, device: str):
+        """
+        Removes an unplugged port from the combo box and closes it if it is the open port.
+        """
+        index = self.serialComboBox.findData(device)
+        if index != -1:
+            self.serialComboBox.removeItem(index)
 
         # If the currently opened port is no longer available, close it
-        if self.serial_manager.current_port and self.serial_manager.current_port not in port_names:
+        if self.serial_manager.current_port == device:
+            self.stop_continuous_acquisition()
             self.serial_manager.close_serial_port()
             status_bar_manager.update_message(
                 "Serial port disconnected (device removed)", category="warning", timeout=MESSAGE_DURATION
             )
 
-        # If the target device is found, select it and open the port if not already open
-        if target_index != -1:
-            self.serialComboBox.setCurrentIndex(target_index)
-            if not self.serial_manager.is_open():
-                self.toggle_serial()
-
     def toggle_serial(self):
         """Opens or closes the serial port based on its current state."""
         if self.serial_manager.is_open():
@@ -299,7 +326,7 @@ class MainTab:
         """
         if self.serial_manager.is_open():
             log_manager.log_message(log_message)
-            self.serial_protocol.encode_command(command, data)
+            self.tx_scheduler.submit(command, data)
         else:
             log_manager.log_message("Serial port not open")
 
@@ -396,6 +423,49 @@ class MainTab:
         self.modemATI1PushButton.clicked.connect(self.send_modem_ati1)
         self.modemATCOPSPushButton.clicked.connect(self.send_modem_atcops)
         
+    def setup_tools_menu(self):
+        """Adds the Tools menu with the jobs that have no control in the form."""
+        self.toolsMenu = self.ui.menuBar().addMenu("&Tools")
+        self.statusOverviewAction = self.toolsMenu.addAction("Read status overview")
+        self.statusOverviewAction.triggered.connect(self.read_status_overview)
+        self.runScriptAction = self.toolsMenu.addAction("Run command script...")
+        self.runScriptAction.triggered.connect(self.choose_command_script)
+        self.antennaSweepAction = self.toolsMenu.addAction("Antenna sweep (ADC + FFT)")
+        self.antennaSweepAction.triggered.connect(lambda: self.run_antenna_sweep())
+        self.continuousAcquisitionAction = self.toolsMenu.addAction("Continuous FFT acquisition")
+        self.continuousAcquisitionAction.setCheckable(True)
+        self.continuousAcquisitionAction.toggled.connect(self.toggle_continuous_acquisition)
+        self.frameRecordingAction = self.toolsMenu.addAction("Record measurement frames...")
+        self.frameRecordingAction.setCheckable(True)
+        self.frameRecordingAction.toggled.connect(self.toggle_frame_recording)
+        self.toolsMenu.addSeparator()
+        self.logHexAction = self.toolsMenu.addAction("Log traffic as hex")
+        self.logHexAction.setCheckable(True)
+        self.logHexAction.setChecked(traffic_trace.log_hex)
+        self.logHexAction.toggled.connect(self.set_log_hex)
+
+    def toggle_continuous_acquisition(self, enabled: bool):
+        if not enabled:
+            self.stop_continuous_acquisition()
+        elif self.start_continuous_acquisition() is None:
+            self.continuousAcquisitionAction.setChecked(False)
+
+    def toggle_frame_recording(self, enabled: bool):
+        if not enabled:
+            self.stop_frame_recording()
+            return
+        path, _ = QFileDialog.getSaveFileName(self.ui, "Record measurement frames", "", "Frame stores (*.fms)")
+        if not path or self.start_frame_recording(path) is None:
+            self.frameRecordingAction.setChecked(False)
+
+    def set_log_hex(self, enabled: bool):
+        traffic_trace.log_hex = enabled
+
+    def choose_command_script(self):
+        script_path, _ = QFileDialog.getOpenFileName(self.ui, "Run command script", "", "Command scripts (*.yaml *.yml)")
+        if script_path:
+            self.run_command_script(script_path)
+
     def send_modem_command(self, command, log_message):
         self._encode_and_send(command, [0], log_message)
 
@@ -471,6 +541,111 @@ class MainTab:
     def read_remote_status(self):
         self.read_status(self.cmd_get_remote_status, "Sent read remote status command\n")
 
+    def read_status_overview(self):
+        """
+        Reads device status, SD card status and filter configuration back-to-back.
+        The protocol matches each response to its request, so the commands are pipelined
+        instead of waiting for a full round trip each.
+        """
+        self.read_device_status()
+        self.read_sdcard_status()
+        self.read_filter_config()
+
+    def run_command_script(self, script_path: str):
+        """
+        Runs a YAML command script (see config/acceptance_script.yaml) as one pipelined job and
+        logs the per-step report when every step has completed.
+        """
+        if not self.serial_manager.is_open():
+            log_manager.log_message("Serial port not open")
+            return None
+        try:
+            script = CommandScript.from_yaml(script_path)
+        except Exception as e:
+            logging.error(f"Failed to load command script {script_path}: {e}")
+            status_bar_manager.update_message(f"Error: {e}", category="error")
+            return None
+        log_manager.log_message(f"Running script '{script.name}' with {len(script.steps)} steps\n")
+        job = script.start(self.tx_scheduler)
+        job.add_done_callback(lambda done: log_manager.log_message(done.result().report() + "\n"))
+        return job
+
+    def run_antenna_sweep(self, kinds: tuple[str, ...] = ("adc", "fft"), sweeps: int = 1):
+        """
+        Acquires ADC and/or FFT frames of all four antennas as one pipelined job, with the FFT
+        sample count of the measurement controls.
+
+        Returns:
+            Future[SweepResult] | None: The (sweeps, antennas, samples) blocks once complete.
+        """
+        if not self.serial_manager.is_open():
+            log_manager.log_message("Serial port not open")
+            return None
+        sweep = AntennaSweep(kinds, fft_samples=int(self.measurementFFTSamplesComboBox.currentText()))
+        job = sweep.start(self.tx_scheduler, sweeps)
+        job.add_done_callback(lambda done: log_manager.log_message(
+            f"Antenna sweep: {sweeps} x {len(sweep.antennas)} antennas in {done.result().wall_time_ms:.1f} ms, "
+            f"{len(done.result().errors)} errors\n"))
+        return job
+
+    def start_continuous_acquisition(self, source: str = "fft"):
+        """
+        Acquires all antennas continuously and keeps running spectrum statistics on the host,
+        with the FFT sample count of the measurement controls. Stop with stop_continuous_acquisition().
+        """
+        if not self.serial_manager.is_open():
+            log_manager.log_message("Serial port not open")
+            return None
+        if self.continuous_acquisition is not None and self.continuous_acquisition.running:
+            return self.continuous_acquisition
+        self.continuous_acquisition = ContinuousAcquisition(
+            self.tx_scheduler, source, fft_samples=int(self.measurementFFTSamplesComboBox.currentText()))
+        self.continuous_acquisition.start().add_done_callback(self._log_continuous_acquisition)
+        log_manager.log_message(f"Continuous {source.upper()} acquisition started\n")
+        return self.continuous_acquisition
+
+    def stop_continuous_acquisition(self):
+        if self.continuous_acquisition is not None:
+            self.continuous_acquisition.stop()
+
+    def _log_continuous_acquisition(self, done) -> None:
+        """Runs in the GUI thread, the acquisition is started on the TxScheduler."""
+        self.continuousAcquisitionAction.setChecked(False)
+        acquisition = self.continuous_acquisition
+        lines = [f"Continuous acquisition stopped: {acquisition.sweeps} sweeps, {acquisition.sweep_rate():.1f} sweeps/s, "
+                 f"{acquisition.failed_frames} failed frames"]
+        if done.exception() is not None:
+            lines[0] += f" ({done.exception()})"
+        for antenna, stats in sorted(acquisition.snapshot().items()):
+            lines.append(f"  Antenna {antenna}: mean {stats.mean.mean():.1f} dB, std {stats.std.mean():.2f} dB, "
+                         f"max-hold peak {stats.max_hold.max():.1f} dB at bin {stats.max_hold.argmax()}")
+        log_manager.log_message("\n".join(lines) + "\n")
+
+    def start_frame_recording(self, path: str):
+        """
+        Records every ADC and FFT frame to a frame store (see measurement.frame_store) until
+        stop_frame_recording() is called.
+        """
+        self.stop_frame_recording()
+        try:
+            self.frame_recorder = FrameStoreWriter(path)
+        except OSError as e:
+            logging.error(f"Failed to create frame store {path}: {e}")
+            status_bar_manager.update_message(f"Error: {e}", category="error")
+            return None
+        self.measurement_pipeline.add_stage(self.frame_recorder)
+        log_manager.log_message(f"Recording measurement frames to {path}\n")
+        return self.frame_recorder
+
+    def stop_frame_recording(self):
+        recorder = self.frame_recorder
+        if recorder is None:
+            return
+        self.frame_recorder = None
+        self.measurement_pipeline.remove_stage(recorder)
+        recorder.close()
+        log_manager.log_message(f"Recorded {recorder.frames} frames ({recorder.bytes} bytes) to {recorder.path}\n")
+
     def send_test_command(self):
         self._encode_and_send(self.cmd_test, [0xff], "Sent test command\n")
 
@@ -528,27 +703,20 @@ class MainTab:
         selected_cal = int(self.rtcCalibrateComboBox.currentText())
         self._encode_and_send(self.cmd_set_rtc_year, [selected_cal], f"Sent RTC calibrate cmd with value: {selected_cal}\n")
     
-    def _process_received_data(self, packet: bytes) -> None:
+    @Slot(int, object)
+    def _process_decoded_response(self, command_code: int, record) -> None:
         """
-        Processes the received data from the serial manager.
+        Processes a response decoded by the protocol.
 
-        This method is connected to the SerialManager's data_received signal.
-        It delegates the processing to specific parsers based on the command code.
+        This method is connected to the protocol's response_decoded signal, the record was
+        already decoded with the command's schema in the protocol's thread. It delegates the
+        processing to specific parsers based on the command code.
         """
         try:
-            command_code = packet[0]
-
-            # Map command codes to their respective parsers
-            command_parsers = {
-                self.cmd_filter_request.code: self._parse_filter_config_response,
-                self.cmd_get_device_status.code: self._parse_device_status_response,
-                self.cmd_get_sdcard_status.code: self._parse_sd_info_response,
-                # Add more command parsers here as needed
-            }
-
             # Check if a parser exists for the command code
-            if command_code in command_parsers:
-                command_parsers[command_code](packet)
+            parser = self._command_parsers.get(command_code)
+            if parser is not None:
+                parser(record)
             else:
                 logging.warning(f"No parser available for command code: 0x{command_code:02X}")
 
@@ -556,59 +724,56 @@ class MainTab:
             logging.error(f"Failed to process received data: {e}")
             status_bar_manager.update_message(f"Error: {e}", category="error")
 
-    def _parse_filter_config_response(self, packet: bytes) -> None:
+    def _log_measurement_frame(self, frame: MeasurementFrame) -> None:
+        """
+        Logs a summary of an ADC or FFT measurement. Runs in the protocol's thread.
         """
-        Parses the response for the filter configuration command.
+        if self.continuous_acquisition is not None and self.continuous_acquisition.running:
+            return  # Summarized when the acquisition stops
+        samples = frame.samples
+        log_manager.log_message(
+            f"Antenna {frame.antenna} {frame.kind.upper()}: {len(samples)} samples, "
+            f"min {samples.min()}, max {samples.max()}, mean {samples.mean():.1f}\n"
+        )
+        comparison = self.fft_cross_check.results.get(frame.antenna)
+        if frame.kind == FFT and comparison is not None:
+            log_manager.log_message(
+                f"Antenna {frame.antenna} FFT vs host FFT: rms error {comparison.rms_error_db:.2f} dB, "
+                f"max {comparison.max_error_db:.2f} dB at bin {comparison.max_error_bin}, "
+                f"correlation {comparison.correlation:.3f}\n"
+            )
+
+    def _parse_filter_config_response(self, config) -> None:
+        """
+        Shows the filter configuration (FILTER_CONFIG_SCHEMA record).
         """
         try:
-            # Assuming the packet structure is [cmd_code, poti1, poti2, poti3, poti4]
-            if len(packet) >= self.cmd_filter_request.response_size:
-                poti1_value = packet[2]
-                poti2_value = packet[3]
-                poti3_value = packet[4]
-                poti4_value = packet[5]
-
-                self.poti1ComboBox.setCurrentText(str(poti1_value))
-                self.poti2ComboBox.setCurrentText(str(poti2_value))
-                self.poti3ComboBox.setCurrentText(str(poti3_value))
-                self.poti4ComboBox.setCurrentText(str(poti4_value))
-
-                status_bar_manager.update_message("Configuration read successfully.", category="success")
-            else:
-                raise ValueError("Packet length is insufficient to update filter configuration.")
+            self.poti1ComboBox.setCurrentText(str(config.poti1))
+            self.poti2ComboBox.setCurrentText(str(config.poti2))
+            self.poti3ComboBox.setCurrentText(str(config.poti3))
+            self.poti4ComboBox.setCurrentText(str(config.poti4))
+
+            status_bar_manager.update_message("Configuration read successfully.", category="success")
         except Exception as e:
             logging.error(f"Failed to parse filter configuration response: {e}")
             status_bar_manager.update_message(f"Error: {e}", category="error")
 
-    def _parse_sd_info_response(self, packet: bytes) -> None:
+    def _parse_sd_info_response(self, sd_info) -> None:
         """
-        Parses the response for the CMD_SUB_SD_INFO command.
+        Logs the response of the CMD_SUB_SD_INFO command.
 
         Args:
-            packet (bytes): The raw data packet received from the serial manager.
+            sd_info (SchemaRecord): The SD_CARD_STATUS_SCHEMA record decoded by the protocol.
         """
         try:
-            # Ensure the packet length is sufficient
-            if len(packet) < self.cmd_get_sdcard_status.response_size:
-                raise ValueError("Packet length is insufficient for CMD_SUB_SD_INFO.")
-
-            # Parse sector_address (8 bytes, big-endian)
-            sector_address = int.from_bytes(packet[2:10], byteorder='big')
-
-            # Parse sector_cnt (4 bytes, big-endian)
-            sector_cnt = int.from_bytes(packet[10:14], byteorder='big')
-
-            # Parse CardType (2 bytes, big-endian)
-            card_type = int.from_bytes(packet[14:16], byteorder='big')
-
             # Log the parsed data
             log_message = (
                 f"SD Card Info:\n"
-                f"  Card capacity: {sector_cnt * 512 / (1024 ** 3):.2f} GB\n"
-                f"  Sector Address: {sector_address}\n"
-                f"  Sector Count: {sector_cnt}\n"
+                f"  Card capacity: {sd_info.sector_cnt * 512 / (1024 ** 3):.2f} GB\n"
+                f"  Sector Address: {sd_info.sector_address}\n"
+                f"  Sector Count: {sd_info.sector_cnt}\n"
                 f"  Sector Size: 512 bytes\n"
-                f"  Card Type: {card_type}\n"
+                f"  Card Type: {sd_info.card_type}\n"
             )
             log_manager.log_message(log_message)
 
@@ -616,72 +781,49 @@ class MainTab:
             logging.error(f"Failed to parse SD card info response: {e}")
             log_manager.log_message(f"Error: {e}")
 
-    def _parse_device_status_response(self, packet: bytes) -> None:
+    def _parse_device_status_response(self, status) -> None:
         """
-        Parses the response for the device status command, including voltage and time data.
+        Logs the device status (DEVICE_STATUS_SCHEMA record), including voltage and time data.
         """
         try:
-            if packet[0] == self.cmd_get_device_status.code:
-                
-                if len(packet) >= self.cmd_get_device_status.response_size:
-                    adc_battery = (packet[3] << 8) | packet[2]
-                    adc_3v3 = (packet[5] << 8) | packet[4]
-                    adc_5v = (packet[7] << 8) | packet[6]
-                    adc_12v = (packet[9] << 8) | packet[8]
-                    adc_20v = (packet[11] << 8) | packet[10]
-                    adc_temp = (packet[13] << 8) | packet[12]
-
-
-                    # Decode time values
-                    tm_min = packet[14]
-                    tm_hour = packet[15]
-                    tm_mday = packet[16]
-                    tm_sec =packet[17]
-                    tm_mon = packet[18]
-                    tm_wday = packet[19]
-                    tm_year = (packet[21] << 8) | packet[20]  + 1900
-                    software_version = (packet[23] << 8) | packet[22]
-                    # Example resistor values for the voltage dividers
-                    R1_BATTERY = 680000
-                    R2_BATTERY = 82000
-
-                    R1_3V3 = 10000
-                    R2_3V3 = 10000
-
-                    R1_12V = 105000
-                    R2_12V = 18700
-
-                    R1_20V = 1000000
-                    R2_20V = 100000
-
-                    # Convert ADC values to millivolts
-                    battery_mv = convert_adc_to_millivolts(adc_battery, R1_BATTERY, R2_BATTERY)
-                    rail_3v3_mv = convert_adc_to_millivolts(adc_3v3, R1_3V3, R2_3V3)
-                    rail_12v_mv = convert_adc_to_millivolts(adc_12v, R1_12V, R2_12V)
-                    rail_20v_mv = convert_adc_to_millivolts(adc_20v, R1_20V, R2_20V)
-
-                    # Log the results
-                    day_of_week_map = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
-                    day_of_week_str = day_of_week_map[tm_wday]
-
-                    log_message = (
-                        f"Voltage Measurements:\n"
-                        f"  Battery Rail: {battery_mv / 1000:.2f} V\n"
-                        f"  3.3V Rail: {rail_3v3_mv / 1000:.2f} V\n"
-                        f"  12V Rail: {rail_12v_mv / 1000:.2f} V\n"
-                        f"  20V Rail: {rail_20v_mv / 1000:.2f} V\n"
-                        f"\n"
-                        f"Time Information:\n"
-                        f"  Time: {tm_hour:02}:{tm_min:02}:{tm_sec:02}\n"
-                        f"  Date: {tm_year}-{tm_mon:02}-{tm_mday:02}\n"
-                        f"  Day of Week: {day_of_week_str}\n"
-                        f"\n"
-                        f"Software Version: {software_version >> 8}.{software_version & 0xFF:02}\n"
-                    )
-                    log_manager.log_message(log_message)
-
-                else:
-                    raise ValueError("Packet length is insufficient to update device status.")
+            # Example resistor values for the voltage dividers
+            R1_BATTERY = 680000
+            R2_BATTERY = 82000
+
+            R1_3V3 = 10000
+            R2_3V3 = 10000
+
+            R1_12V = 105000
+            R2_12V = 18700
+
+            R1_20V = 1000000
+            R2_20V = 100000
+
+            # Convert ADC values to millivolts
+            battery_mv = convert_adc_to_millivolts(status.adc_battery, R1_BATTERY, R2_BATTERY)
+            rail_3v3_mv = convert_adc_to_millivolts(status.adc_3v3, R1_3V3, R2_3V3)
+            rail_12v_mv = convert_adc_to_millivolts(status.adc_12v, R1_12V, R2_12V)
+            rail_20v_mv = convert_adc_to_millivolts(status.adc_20v, R1_20V, R2_20V)
+
+            # Log the results
+            day_of_week_map = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+            day_of_week_str = day_of_week_map[status.tm_wday]
+
+            log_message = (
+                f"Voltage Measurements:\n"
+                f"  Battery Rail: {battery_mv / 1000:.2f} V\n"
+                f"  3.3V Rail: {rail_3v3_mv / 1000:.2f} V\n"
+                f"  12V Rail: {rail_12v_mv / 1000:.2f} V\n"
+                f"  20V Rail: {rail_20v_mv / 1000:.2f} V\n"
+                f"\n"
+                f"Time Information:\n"
+                f"  Time: {status.tm_hour:02}:{status.tm_min:02}:{status.tm_sec:02}\n"
+                f"  Date: {status.tm_year}-{status.tm_mon:02}-{status.tm_mday:02}\n"
+                f"  Day of Week: {day_of_week_str}\n"
+                f"\n"
+                f"Software Version: {status.software_version}\n"
+            )
+            log_manager.log_message(log_message)
         except Exception as e:
             logging.error(f"Failed to process received data: {e}")
             status_bar_manager.update_message(f"Error: {e}", category="error")
@@ -19,6 +19,8 @@ from gui.userlog import UserLog
 
 from serialbsp.serial_manager import SerialManager
 from serialbsp.protocol_fmcw import SerialProtocolFmcw
+from serialbsp.protocol_worker import ProtocolWorker
+from serialbsp.tx_scheduler import TxScheduler
 
 from logger.logging_config import configure_logging
 
@@ -108,11 +110,13 @@ class FMCWApplication(QMainWindow):
 
         # Initialize SerialManager
         self.serial_manager = SerialManager()
-        self.serial_protocol = SerialProtocolFmcw()
+        self.serial_protocol = SerialProtocolFmcw(metrics=self.serial_manager.metrics)
+        self.protocol_worker = ProtocolWorker(self.serial_protocol, parent=self)
+        self.tx_scheduler = TxScheduler(self.serial_protocol, parent=self)
 
         # Connect SerialManager and SerialProtocolFmcw
         self.serial_manager.data_received.connect(self.serial_protocol.handle_raw_data)
-        self.serial_protocol.log_message.connect(log_manager.log_message)
+        self.serial_protocol.gui_signals.log_message.connect(log_manager.log_message)
 
 
         # Initialize BMS configuration
@@ -122,8 +126,8 @@ class FMCWApplication(QMainWindow):
         self.user_log = UserLog(window)
         log_manager.initialize(self.user_log)
 
-        self.main_tab = MainTab(self, self.serial_manager, self.serial_protocol)
-        self.bms_tab = BmsTab(self, self.serial_manager, self.serial_protocol, self.bms_config)
+        self.main_tab = MainTab(self, self.serial_manager, self.serial_protocol, self.tx_scheduler)
+        self.bms_tab = BmsTab(self, self.serial_manager, self.serial_protocol, self.bms_config, self.tx_scheduler)
 
         # Create and set up the status bar
         self.status_bar = QStatusBar()
@@ -131,5 +135,16 @@ class FMCWApplication(QMainWindow):
 
         status_bar_manager.initialize_status_bar_manager(self.status_bar)   
 
+        # Parse the received data off the GUI thread
+        self.protocol_worker.start()
+
+    def closeEvent(self, event):
+        self.main_tab.stop_continuous_acquisition()
+        self.main_tab.port_monitor.stop()
+        self.serial_manager.close_serial_port()
+        self.protocol_worker.stop()
+        self.main_tab.stop_frame_recording()
+        super().closeEvent(event)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,290 @@
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from measurement.frames import ADC, FFT, MEASUREMENT_TYPES, MeasurementFrame
+
+# A store is two files:
+#   <path>        header, then the raw sample payloads of the frames back to back
+#   <path>.index  header, then one INDEX_DTYPE record per frame in receive order
+# Both headers are HEADER_SIZE bytes: magic, format version, creation time as Unix time.
+# Only the index says where the payloads are, so the data file may be longer than its content.
+DATA_MAGIC = b"FMCWFRM\0"
+INDEX_MAGIC = b"FMCWIDX\0"
+STORE_VERSION = 1
+HEADER = struct.Struct("<8sHd")
+HEADER_SIZE = 64  # Header padded to a fixed size, the first payload starts here
+INDEX_SUFFIX = ".index"
+INDEX_DTYPE = np.dtype([
+    ("timestamp", "<f8"),  # Unix time the frame was received
+    ("offset", "<u8"),  # Position of the payload in the data file
+    ("samples", "<u4"),  # Sample count of the payload
+    ("code", "u1"),  # Measurement command code, gives the sample format
+    ("antenna", "u1"),
+    ("kind", "u1"),  # KIND_CODES
+    ("reserved", "u1"),
+])
+KIND_CODES = {ADC: 0, FFT: 1}
+KINDS = {code: kind for kind, code in KIND_CODES.items()}
+
+GROWTH_CHUNK = 64 * 1024 * 1024  # The data file is extended this much at a time
+FLUSH_FRAMES = 64  # Frames written between flushes, a reader of a live store sees up to the last flush
+
+
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def _write_header(file, magic: bytes) -> None:
+    file.write(HEADER.pack(magic, STORE_VERSION, time.time()).ljust(HEADER_SIZE, b"\0"))
+
+
+def _check_header(path: str, magic: bytes) -> float:
+    """Returns the creation time of a store file, raises ValueError if it is not one."""
+    with open(path, 'rb') as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:len(magic)] != magic:
+        raise ValueError(f"{path} is not a frame store file")
+    _magic, version, created = HEADER.unpack_from(header)
+    if version != STORE_VERSION:
+        raise ValueError(f"Unsupported frame store version {version}")
+    return created
+
+
+class FrameStoreWriter:
+    """
+    Appends measurement frames to a frame store.
+
+    The payload is written as it came off the line, the samples are not converted. The data
+    file is extended in GROWTH_CHUNK steps so an overnight capture does not resize it for every
+    frame, and is cut back to its content on close(). The writer is a MeasurementPipeline stage,
+    so it runs in the protocol's thread; close() may be called from another thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.frames = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._data = open(path, 'w+b')
+        self._index = open(index_path(path), 'wb')
+        _write_header(self._data, DATA_MAGIC)
+        _write_header(self._index, INDEX_MAGIC)
+        self._end = HEADER_SIZE
+        self._allocated = HEADER_SIZE
+        self._record = np.zeros(1, dtype=INDEX_DTYPE)
+
+    def __call__(self, frame: MeasurementFrame) -> None:
+        self.append(frame)
+
+    def append(self, frame: MeasurementFrame) -> None:
+        """Appends a frame, does nothing once the store is closed."""
+        payload = np.ascontiguousarray(frame.samples)
+        with self._lock:
+            if self._data is None:
+                return
+            if self._end + payload.nbytes > self._allocated:
+                self._allocated += max(GROWTH_CHUNK, payload.nbytes)
+                self._data.truncate(self._allocated)
+            self._data.seek(self._end)
+            self._data.write(payload.data)
+            record = self._record[0]
+            record["timestamp"] = frame.timestamp
+            record["offset"] = self._end
+            record["samples"] = payload.size
+            record["code"] = frame.code
+            record["antenna"] = frame.antenna
+            record["kind"] = KIND_CODES[frame.kind]
+            self._index.write(self._record.tobytes())
+            self._end += payload.nbytes
+            self.frames += 1
+            self.bytes += payload.nbytes
+            if self.frames % FLUSH_FRAMES == 0:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._data is not None:
+                self._flush()
+
+    def _flush(self) -> None:
+        # Payloads first, so an index record never points past the data a reader can see
+        self._data.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._data is None:
+                return
+            self._flush()
+            self._data.truncate(self._end)
+            self._data.close()
+            self._index.close()
+            self._data = None
+            self._index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class FrameStore:
+    """
+    Read access to a frame store through np.memmap.
+
+    Opening maps the index and the data file, nothing is read until it is used. select()
+    finds frames by time range, antenna and kind on the index alone (time ranges by binary
+    search, the frames are in receive order), and samples() copies only the selected payloads.
+    A store that is still being written can be opened, it shows the frames flushed so far;
+    call refresh() to see newer ones.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a frame store.
+
+        Raises:
+            OSError: If the files cannot be opened.
+            ValueError: If the files are not a frame store or have an unsupported version.
+        """
+        self.path = path
+        self.created = _check_header(path, DATA_MAGIC)
+        _check_header(index_path(path), INDEX_MAGIC)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Maps the store again, to include the frames written since it was opened."""
+        # Whole records only, the last one may be cut off while the store is being written
+        count = (os.path.getsize(index_path(self.path)) - HEADER_SIZE) // INDEX_DTYPE.itemsize
+        if count > 0:
+            self.index = np.memmap(index_path(self.path), dtype=INDEX_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+            self.data = np.memmap(self.path, dtype=np.uint8, mode='r')
+        else:
+            self.index = np.empty(0, dtype=INDEX_DTYPE)
+            self.data = np.empty(0, dtype=np.uint8)
+
+    def close(self) -> None:
+        """Drops the mappings, views returned by frame() must not be used afterwards."""
+        self.index = np.empty(0, dtype=INDEX_DTYPE)
+        self.data = np.empty(0, dtype=np.uint8)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.index["timestamp"]
+
+    def time_range(self) -> tuple[float, float] | None:
+        """Returns the timestamps of the first and last frame, None for an empty store."""
+        if not len(self.index):
+            return None
+        return float(self.index["timestamp"][0]), float(self.index["timestamp"][-1])
+
+    def select(self, start: float | None = None, end: float | None = None, antenna: int | None = None,
+               kind: str | None = None) -> np.ndarray:
+        """
+        Returns the positions of the matching frames in receive order.
+
+        Args:
+            start (float | None): First timestamp included, Unix time.
+            end (float | None): Timestamps before this one are included.
+            antenna (int | None): Only this antenna.
+            kind (str | None): ADC or FFT only.
+        """
+        timestamps = self.index["timestamp"]
+        first = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        last = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        positions = np.arange(first, max(first, last))
+        if antenna is None and kind is None:
+            return positions
+        records = self.index[first:max(first, last)]
+        mask = np.ones(len(records), dtype=bool)
+        if antenna is not None:
+            mask &= records["antenna"] == antenna
+        if kind is not None:
+            mask &= records["kind"] == KIND_CODES[kind]
+        return positions[mask]
+
+    def frame(self, position: int) -> MeasurementFrame:
+        """Returns one frame, its samples are a read-only view of the mapped file."""
+        record = self.index[position]
+        measurement = MEASUREMENT_TYPES[int(record["code"])]
+        samples = np.frombuffer(self.data, dtype=measurement.dtype, count=int(record["samples"]), offset=int(record["offset"]))
+        return MeasurementFrame(int(record["antenna"]), KINDS[int(record["kind"])], float(record["timestamp"]),
+                                samples, int(record["code"]))
+
+    def samples(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gathers frames of one measurement type into a (frames, samples) array.
+
+        Args:
+            positions (np.ndarray): Frame positions from select().
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The timestamps and the samples.
+
+        Raises:
+            ValueError: If the frames are not all of the same measurement type.
+        """
+        records = self.index[positions]
+        if not len(records):
+            return np.empty(0), np.empty((0, 0), dtype=np.uint16)
+        codes = np.unique(records["code"])
+        if len(codes) > 1 or len(np.unique(records["samples"])) > 1:
+            raise ValueError("All frames must be of the same measurement type, select() one kind and antenna")
+        dtype = MEASUREMENT_TYPES[int(codes[0])].dtype
+        sample_count = int(records["samples"][0])
+        # Payloads start at multiples of the sample size, so the mapping can be read as words
+        words = self.data[:len(self.data) // dtype.itemsize * dtype.itemsize].view(dtype)
+        starts = records["offset"].astype(np.int64) // dtype.itemsize
+        steps = np.diff(starts)
+        if len(steps) and steps[0] > 0 and np.all(steps == steps[0]):
+            # Evenly spaced frames, e.g. one antenna of regular sweeps: one strided copy
+            view = np.lib.stride_tricks.as_strided(words[starts[0]:], shape=(len(starts), sample_count),
+                                                   strides=(int(steps[0]) * dtype.itemsize, dtype.itemsize))
+            samples = np.array(view)
+        else:
+            samples = np.empty((len(starts), sample_count), dtype=dtype)
+            for row, start in enumerate(starts.tolist()):
+                samples[row] = words[start:start + sample_count]
+        return records["timestamp"].copy(), samples
+
+    def load(self, kind: str, antenna: int, start: float | None = None,
+             end: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the timestamps and (frames, samples) array of one kind and antenna in a time range."""
+        return self.samples(self.select(start, end, antenna, kind))
+
+    def summary(self) -> dict:
+        """Returns the frame counts per kind and antenna, the time span and the payload size."""
+        summary = {"frames": len(self.index), "duration_s": 0.0, "payload_bytes": 0, "by_antenna": {}}
+        if not len(self.index):
+            return summary
+        first, last = self.time_range()
+        summary["duration_s"] = round(last - first, 3)
+        itemsizes = np.zeros(256, dtype=np.int64)
+        for code, measurement in MEASUREMENT_TYPES.items():
+            itemsizes[code] = measurement.dtype.itemsize
+        summary["payload_bytes"] = int((self.index["samples"].astype(np.int64) * itemsizes[self.index["code"]]).sum())
+        for (antenna, kind), count in zip(*np.unique(self.index[["antenna", "kind"]], return_counts=True)):
+            summary["by_antenna"].setdefault(int(antenna), {})[KINDS[int(kind)]] = int(count)
+        return summary
+
+
+if __name__ == '__main__':
+    import sys
+
+    # Example: python -m measurement.frame_store overnight.fms
+    with FrameStore(sys.argv[1]) as store:
+        print(store.summary())
@@ -0,0 +1,196 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from serialbsp.commands import COMMANDS
+from serialbsp.schemas import PAYLOAD_OFFSET
+
+ADC = "adc"
+FFT = "fft"
+ANTENNAS = (1, 2, 3, 4)
+
+# Sample formats of the measurement payloads, little-endian like the other device words
+ADC_SAMPLE_DTYPE = np.dtype("<u2")  # 12-bit ADC codes in 16-bit words
+FFT_SAMPLE_DTYPE = np.dtype("<u2")  # Magnitude bins computed by the device
+
+
+@dataclass(frozen=True)
+class MeasurementType:
+    """
+    Layout of the response of one measurement command.
+
+    Args:
+        code (int): The command code.
+        kind (str): ADC or FFT.
+        antenna (int): Antenna number, 1 to 4.
+        frame_size (int): Size of the response frame in bytes.
+        dtype (np.dtype): Sample format of the payload.
+    """
+    code: int
+    kind: str
+    antenna: int
+    frame_size: int
+    dtype: np.dtype
+
+    @property
+    def sample_count(self) -> int:
+        return (self.frame_size - PAYLOAD_OFFSET - 1) // self.dtype.itemsize
+
+
+def _measurement_types() -> dict[int, MeasurementType]:
+    types = {}
+    for command in COMMANDS:
+        for kind, dtype in ((ADC, ADC_SAMPLE_DTYPE), (FFT, FFT_SAMPLE_DTYPE)):
+            prefix = f"CMD_START_{kind.upper()}_MEAS_ANTENNA_"
+            if command.name.startswith(prefix):
+                antenna = int(command.name[len(prefix):])
+                types[command.code] = MeasurementType(command.code, kind, antenna, command.response_size, dtype)
+    return types
+
+
+MEASUREMENT_TYPES = _measurement_types()  # By command code
+MEASUREMENT_CODES = {(measurement.kind, measurement.antenna): code for code, measurement in MEASUREMENT_TYPES.items()}
+
+
+def measurement_type(kind: str, antenna: int) -> MeasurementType:
+    """
+    Returns the measurement type of a kind and antenna.
+
+    Raises:
+        ValueError: If there is no such measurement command.
+    """
+    code = MEASUREMENT_CODES.get((kind, antenna))
+    if code is None:
+        raise ValueError(f"No {kind} measurement for antenna {antenna}")
+    return MEASUREMENT_TYPES[code]
+
+
+@dataclass
+class MeasurementFrame:
+    """
+    Samples of one ADC or FFT response.
+
+    samples is a read-only view over the response frame (np.frombuffer), no bytes are copied.
+    Call samples.copy() to keep a modifiable array.
+    """
+    antenna: int
+    kind: str
+    timestamp: float  # Unix time the frame was received
+    samples: np.ndarray
+    code: int = 0
+
+
+def decode_measurement_frame(packet, timestamp: float | None = None) -> MeasurementFrame:
+    """
+    Decodes an ADC or FFT response into its sample array.
+
+    Args:
+        packet (bytes | bytearray | memoryview): The complete response frame [cmd, cmd, payload, crc].
+        timestamp (float | None): Receive time, defaults to now.
+
+    Returns:
+        MeasurementFrame: The samples, tagged with antenna, kind and timestamp.
+
+    Raises:
+        ValueError: If the packet is not a measurement response or is too short.
+    """
+    measurement = MEASUREMENT_TYPES.get(packet[0])
+    if measurement is None:
+        raise ValueError(f"CMD 0x{packet[0]:02X} is not a measurement command")
+    if len(packet) < measurement.frame_size:
+        raise ValueError(f"{measurement.kind} frame of {len(packet)} bytes, expected {measurement.frame_size}")
+    samples = np.frombuffer(packet, dtype=measurement.dtype, count=measurement.sample_count, offset=PAYLOAD_OFFSET)
+    return MeasurementFrame(measurement.antenna, measurement.kind, time.time() if timestamp is None else timestamp,
+                            samples, measurement.code)
+
+
+def decode_measurement_batch(packets: list[bytes]) -> np.ndarray:
+    """
+    Decodes frames of the same measurement type into one (frames, samples) array.
+
+    The frames are joined once and the payloads are exposed as a strided view of that buffer,
+    so a batch costs one copy regardless of its size.
+
+    Raises:
+        ValueError: If the frames are not all of the same measurement type.
+    """
+    if not packets:
+        return np.empty((0, 0), dtype=ADC_SAMPLE_DTYPE)
+    measurement = MEASUREMENT_TYPES.get(packets[0][0])
+    if measurement is None or any(packet[0] != measurement.code or len(packet) != measurement.frame_size for packet in packets):
+        raise ValueError("All frames of a batch must be complete responses of the same measurement command")
+    frames = np.frombuffer(b"".join(packets), dtype=np.uint8).reshape(len(packets), measurement.frame_size)
+    payload = frames[:, PAYLOAD_OFFSET:PAYLOAD_OFFSET + measurement.sample_count * measurement.dtype.itemsize]
+    return payload.view(measurement.dtype)
+
+
+@dataclass
+class PipelineStats:
+    frames: int = 0
+    errors: int = 0
+    busy_time: float = 0.0  # seconds spent decoding and in the stages
+    by_kind: dict = field(default_factory=lambda: {ADC: 0, FFT: 0})
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "errors": self.errors,
+            "adc_frames": self.by_kind[ADC],
+            "fft_frames": self.by_kind[FFT],
+            "frames_per_busy_s": round(self.frames / self.busy_time, 1) if self.busy_time > 0 else 0.0,
+        }
+
+
+class MeasurementPipeline:
+    """
+    Decodes the measurement responses of a protocol and passes them through processing stages.
+
+    A stage is a callable taking a MeasurementFrame, added with add_stage(). Other responses
+    are skipped with one dict lookup. attach() connects the pipeline to the protocol's
+    data_received signal directly, so with a ProtocolWorker the frames are decoded and
+    processed in the protocol's thread; stages that touch widgets must hand over to the GUI.
+    """
+
+    def __init__(self):
+        self.stages: list[Callable[[MeasurementFrame], None]] = []
+        self.stats = PipelineStats()
+
+    def add_stage(self, stage: Callable[[MeasurementFrame], None]) -> None:
+        self.stages.append(stage)
+
+    def remove_stage(self, stage: Callable[[MeasurementFrame], None]) -> None:
+        self.stages.remove(stage)
+
+    def attach(self, protocol) -> None:
+        """Feeds the pipeline with the responses of a SerialProtocolFmcw."""
+        protocol.data_received.connect(self.feed)
+
+    def detach(self, protocol) -> None:
+        protocol.data_received.disconnect(self.feed)
+
+    def feed(self, packet: bytes, timestamp: float | None = None) -> MeasurementFrame | None:
+        """
+        Decodes a response and runs the stages on it.
+
+        Returns:
+            MeasurementFrame | None: The frame, None if the packet is not a measurement.
+        """
+        if not packet or packet[0] not in MEASUREMENT_TYPES:
+            return None
+        started = time.perf_counter()
+        try:
+            frame = decode_measurement_frame(packet, timestamp)
+            for stage in self.stages:
+                stage(frame)
+        except Exception:
+            self.stats.errors += 1
+            logging.exception(f"Measurement pipeline failed on CMD 0x{packet[0]:02X}")
+            return None
+        finally:
+            self.stats.busy_time += time.perf_counter() - started
+        self.stats.frames += 1
+        self.stats.by_kind[frame.kind] += 1
+        return frame
@@ -0,0 +1,206 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from measurement.frames import ADC, ANTENNAS, FFT, MeasurementFrame, measurement_type
+
+ADC_FULL_SCALE = 4096  # 12-bit ADC, a sine of this peak-to-peak amplitude is 0 dBFS
+DEVICE_FFT_SIZE = 512  # The device transforms one 512-sample ADC frame, its FFT frame holds the first bins
+MAGNITUDE_FLOOR = 1e-12  # Avoids log10(0) for empty bins
+
+WINDOWS = {
+    "rect": np.ones,
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+}
+
+
+@dataclass(frozen=True)
+class SpectrumConfig:
+    """
+    Settings of the host FFT.
+
+    Args:
+        window (str): One of WINDOWS.
+        fft_size (int | None): FFT length, the samples are zero padded to it. None uses the
+            next power of two of the sample count.
+        remove_dc (bool): Subtract the mean of each frame before windowing.
+        full_scale (float): Peak-to-peak amplitude of a 0 dB sine.
+    """
+    window: str = "hann"
+    fft_size: int | None = None
+    remove_dc: bool = True
+    full_scale: float = ADC_FULL_SCALE
+
+    def __post_init__(self):
+        if self.window not in WINDOWS:
+            raise ValueError(f"Unknown window '{self.window}', expected one of {', '.join(WINDOWS)}")
+
+
+class SpectrumProcessor:
+    """
+    Vectorized magnitude spectrum of ADC frames.
+
+    compute() accepts the samples of one frame (samples,) or any stack of frames, e.g.
+    (frames, samples) or (sweeps, antennas, samples), and transforms the last axis in one
+    np.fft.rfft call. The window is scaled by its coherent gain, so a full scale sine reads
+    0 dB in its bin whatever window and zero padding are used.
+    """
+
+    def __init__(self, config: SpectrumConfig | None = None):
+        self.config = config or SpectrumConfig()
+        self._windows: dict[int, tuple[np.ndarray, float]] = {}
+
+    def fft_size(self, sample_count: int) -> int:
+        if self.config.fft_size is not None:
+            if self.config.fft_size < sample_count:
+                raise ValueError(f"fft_size {self.config.fft_size} is smaller than the {sample_count} samples")
+            return self.config.fft_size
+        return 1 << (sample_count - 1).bit_length()
+
+    def _window(self, sample_count: int) -> tuple[np.ndarray, float]:
+        """Returns the window for a frame length and its amplitude scale, cached per length."""
+        cached = self._windows.get(sample_count)
+        if cached is None:
+            window = WINDOWS[self.config.window](sample_count)
+            # Coherent gain sum(w)/2 turns an rfft bin into a peak amplitude, full_scale/2 is the 0 dB peak
+            scale = 1.0 / (window.sum() / 2 * self.config.full_scale / 2)
+            cached = self._windows[sample_count] = (window, scale)
+        return cached
+
+    def compute(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Returns the magnitude spectrum in dB.
+
+        Args:
+            samples (np.ndarray): ADC samples, frames on the last axis.
+
+        Returns:
+            np.ndarray: Shape (..., fft_size // 2 + 1), float64.
+        """
+        data = np.asarray(samples, dtype=np.float64)
+        sample_count = data.shape[-1]
+        window, scale = self._window(sample_count)
+        if self.config.remove_dc:
+            data = data - data.mean(axis=-1, keepdims=True)
+        spectrum = np.fft.rfft(data * window, n=self.fft_size(sample_count), axis=-1)
+        magnitude = np.abs(spectrum) * scale
+        return 20 * np.log10(np.maximum(magnitude, MAGNITUDE_FLOOR))
+
+    def frequencies(self, sample_count: int, sample_rate: float) -> np.ndarray:
+        """Returns the frequency of each bin of compute() in Hz."""
+        return np.fft.rfftfreq(self.fft_size(sample_count), 1.0 / sample_rate)
+
+
+def device_spectrum_db(bins: np.ndarray) -> np.ndarray:
+    """Converts the magnitude bins of an on-device FFT frame to dB."""
+    return 20 * np.log10(np.maximum(np.asarray(bins, dtype=np.float64), MAGNITUDE_FLOOR))
+
+
+@dataclass
+class SpectrumComparison:
+    """
+    Error of the device FFT against the host FFT over the bins both cover. For a stack of
+    frames every field is an array with one value per frame.
+    """
+    bins: int
+    offset_db: np.ndarray  # Level difference removed before the comparison
+    rms_error_db: np.ndarray
+    max_error_db: np.ndarray
+    max_error_bin: np.ndarray
+    correlation: np.ndarray
+
+    def passed(self, max_rms_db: float) -> bool:
+        return bool(np.all(self.rms_error_db <= max_rms_db))
+
+
+def check_fft_sizes(host_fft_size: int, device_fft_size: int = DEVICE_FFT_SIZE) -> int:
+    """
+    Returns how many host bins make up one device bin.
+
+    Raises:
+        ValueError: If the host FFT is not the device's length or an integer multiple of it,
+            then the host bins do not lie at the device bin frequencies.
+    """
+    if host_fft_size < device_fft_size or host_fft_size % device_fft_size:
+        raise ValueError(f"Host FFT of {host_fft_size} points cannot be compared with the "
+                         f"{device_fft_size}-point device FFT, use a multiple of {device_fft_size}")
+    return host_fft_size // device_fft_size
+
+
+def compare_spectra(host_db: np.ndarray, device_bins: np.ndarray, align: bool = True,
+                    first_bin: int = 1, host_fft_size: int | None = None,
+                    device_fft_size: int = DEVICE_FFT_SIZE) -> SpectrumComparison:
+    """
+    Compares host spectra from SpectrumProcessor.compute() with on-device FFT frames.
+
+    The spectra are compared at the device's bin frequencies: a zero padded host FFT is
+    decimated to the device's FFT length first. The device scales its bins differently from the
+    host, so with align the median level difference is removed and the errors describe the
+    shape of the spectrum.
+
+    Args:
+        host_db (np.ndarray): Host spectra in dB, (..., host_bins).
+        device_bins (np.ndarray): Device FFT magnitudes, (..., device_bins), same leading shape.
+        align (bool): Remove the median level difference before comparing.
+        first_bin (int): First bin compared, 1 skips the DC bin.
+        host_fft_size (int | None): FFT length of host_db, defaults to 2 * (host_bins - 1).
+        device_fft_size (int): FFT length the device bins come from.
+
+    Returns:
+        SpectrumComparison: The errors, per frame for stacked input.
+
+    Raises:
+        ValueError: If the FFT lengths do not share the device's bin frequencies.
+    """
+    if host_fft_size is None:
+        host_fft_size = 2 * (host_db.shape[-1] - 1)
+    host_db = host_db[..., ::check_fft_sizes(host_fft_size, device_fft_size)]  # Bin k at the device's bin k frequency
+    bins = min(host_db.shape[-1], np.shape(device_bins)[-1])
+    host = host_db[..., first_bin:bins]
+    device = device_spectrum_db(device_bins)[..., first_bin:bins]
+    difference = device - host
+    offset = np.median(difference, axis=-1, keepdims=True) if align else np.zeros(difference.shape[:-1] + (1,))
+    error = np.abs(difference - offset)
+    host_centered = host - host.mean(axis=-1, keepdims=True)
+    device_centered = device - device.mean(axis=-1, keepdims=True)
+    norm = np.sqrt((host_centered ** 2).sum(axis=-1) * (device_centered ** 2).sum(axis=-1))
+    correlation = np.divide((host_centered * device_centered).sum(axis=-1), norm,
+                            out=np.zeros(norm.shape), where=norm > 0)
+    return SpectrumComparison(
+        bins=bins - first_bin,
+        offset_db=offset[..., 0],
+        rms_error_db=np.sqrt((error ** 2).mean(axis=-1)),
+        max_error_db=error.max(axis=-1),
+        max_error_bin=error.argmax(axis=-1) + first_bin,
+        correlation=correlation,
+    )
+
+
+class FftCrossCheck:
+    """
+    MeasurementPipeline stage comparing each device FFT frame with the host FFT of the latest
+    ADC frame of the same antenna. The latest comparison per antenna is kept in results.
+
+    Raises:
+        ValueError: If the host FFT length is not a multiple of device_fft_size.
+    """
+
+    def __init__(self, processor: SpectrumProcessor | None = None, align: bool = True,
+                 device_fft_size: int = DEVICE_FFT_SIZE):
+        self.processor = processor or SpectrumProcessor()
+        self.align = align
+        self.device_fft_size = device_fft_size
+        check_fft_sizes(self.processor.fft_size(measurement_type(ADC, ANTENNAS[0]).sample_count), device_fft_size)
+        self.results: dict[int, SpectrumComparison] = {}
+        self._host_spectra: dict[int, tuple[np.ndarray, int]] = {}  # Spectrum and its FFT length
+
+    def __call__(self, frame: MeasurementFrame) -> None:
+        if frame.kind == ADC:
+            self._host_spectra[frame.antenna] = (self.processor.compute(frame.samples),
+                                                 self.processor.fft_size(len(frame.samples)))
+        elif frame.kind == FFT and frame.antenna in self._host_spectra:
+            host_db, host_fft_size = self._host_spectra[frame.antenna]
+            self.results[frame.antenna] = compare_spectra(host_db, frame.samples, self.align, host_fft_size=host_fft_size,
+                                                          device_fft_size=self.device_fft_size)
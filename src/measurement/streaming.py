@@ -0,0 +1,233 @@
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import numpy as np
+
+from measurement.frames import ADC, ANTENNAS, FFT
+from measurement.spectrum import SpectrumProcessor, device_spectrum_db
+from measurement.sweep import AntennaSweep, SweepResult
+
+MAX_EMPTY_SWEEPS = 5  # Consecutive sweeps without a valid frame before the acquisition gives up
+
+
+@dataclass
+class SpectrumStatistics:
+    """Copy of the running statistics of one antenna, safe to use while acquisition continues."""
+    count: int
+    mean: np.ndarray
+    variance: np.ndarray
+    max_hold: np.ndarray
+    min_hold: np.ndarray
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+
+class RunningSpectrumStats:
+    """
+    Running mean, variance, max-hold and min-hold per bin (Welford's algorithm).
+
+    Only the accumulators are kept, so memory stays the same however many spectra are added.
+    Batches are merged with Chan's parallel update, which gives the same result as adding the
+    spectra one by one. update() and snapshot() may be called from different threads.
+    """
+
+    def __init__(self, bins: int):
+        self.bins = bins
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.count = 0
+            self._mean = np.zeros(self.bins)
+            self._m2 = np.zeros(self.bins)
+            self._max = np.full(self.bins, -np.inf)
+            self._min = np.full(self.bins, np.inf)
+
+    def update(self, spectra: np.ndarray) -> None:
+        """
+        Adds one spectrum (bins,) or a batch (n, bins).
+        """
+        batch = np.asarray(spectra, dtype=np.float64).reshape(-1, self.bins)
+        batch_count = batch.shape[0]
+        if not batch_count:
+            return
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+        with self._lock:
+            total = self.count + batch_count
+            delta = batch_mean - self._mean
+            self._mean += delta * (batch_count / total)
+            self._m2 += batch_m2 + delta ** 2 * (self.count * batch_count / total)
+            self.count = total
+            np.maximum(self._max, batch.max(axis=0), out=self._max)
+            np.minimum(self._min, batch.min(axis=0), out=self._min)
+
+    def snapshot(self) -> SpectrumStatistics:
+        """Returns a copy of the current statistics, the variance is the sample variance."""
+        with self._lock:
+            variance = self._m2 / (self.count - 1) if self.count > 1 else np.zeros(self.bins)
+            return SpectrumStatistics(self.count, self._mean.copy(), variance, self._max.copy(), self._min.copy())
+
+
+class ContinuousAcquisition:
+    """
+    Repeats an antenna sweep until stopped and keeps running statistics of the spectra.
+
+    Spectra are taken from the device FFT frames (source FFT) or computed on the host from the
+    ADC frames (source ADC), in dB. Each sweep is merged into one RunningSpectrumStats per
+    antenna and then dropped, so an hour-long run uses the same memory as a single sweep.
+    snapshot() returns the live statistics at any time.
+
+    Every attempted sweep counts towards max_sweeps, and after MAX_EMPTY_SWEEPS sweeps in a row
+    without a valid frame (device gone, port closed) the acquisition stops with ConnectionError.
+    The next sweep is started from a loop rather than from the completion callback, so sweeps
+    that fail at once do not grow the stack.
+    """
+
+    def __init__(self, protocol, source: str = FFT, antennas: tuple[int, ...] = ANTENNAS,
+                 fft_samples: int = 1, processor: SpectrumProcessor | None = None):
+        """
+        Initialize the acquisition.
+
+        Args:
+            protocol (TxScheduler | SerialProtocolFmcw): Where the requests are sent, see CommandScript.start().
+            source (str): FFT for the device spectra, ADC for host spectra of the ADC frames.
+            antennas (tuple[int, ...]): The antennas to acquire.
+            fft_samples (int): Number of spectra the device averages per FFT measurement.
+            processor (SpectrumProcessor | None): Host FFT settings for source ADC.
+        """
+        if source not in (ADC, FFT):
+            raise ValueError(f"Unknown source '{source}'")
+        self.protocol = protocol
+        self.source = source
+        self.sweep = AntennaSweep((source,), antennas, fft_samples)
+        self.processor = processor or SpectrumProcessor()
+        self.stats: dict[int, RunningSpectrumStats] = {}
+        self.sweeps = 0  # Attempted sweeps
+        self.empty_sweeps = 0  # Consecutive sweeps without a valid frame
+        self.failed_frames = 0
+        self.started_at = None
+        self._running = False
+        self._stopped = Future()
+        self._max_sweeps = None
+        self._lock = threading.Lock()
+        self._scheduling = False  # A _next_sweep() loop is running further up some stack
+        self._sweep_due = False  # A sweep completed while the loop was running
+
+    @property
+    def running(self) -> bool:
+        """True from start() until the stop future completes, including the sweep that ends after stop()."""
+        return self.started_at is not None and not self._stopped.done()
+
+    def start(self, max_sweeps: int | None = None) -> Future:
+        """
+        Starts acquiring, the statistics of a previous run are kept (see reset()).
+
+        Args:
+            max_sweeps (int | None): Stop after this many sweeps, None runs until stop().
+
+        Returns:
+            Future[int]: Completes with the number of sweeps once the acquisition has stopped.
+        """
+        if self.running:
+            return self._stopped
+        self._running = True
+        self._max_sweeps = max_sweeps
+        self.empty_sweeps = 0
+        self._stopped = Future()
+        self.started_at = time.monotonic()
+        self._next_sweep()
+        return self._stopped
+
+    def stop(self) -> None:
+        """Stops after the sweep in progress."""
+        self._running = False
+
+    def reset(self) -> None:
+        for stats in self.stats.values():
+            stats.reset()
+        self.sweeps = 0
+        self.empty_sweeps = 0
+        self.failed_frames = 0
+
+    def snapshot(self) -> dict[int, SpectrumStatistics]:
+        """Returns the current statistics per antenna."""
+        return {antenna: stats.snapshot() for antenna, stats in list(self.stats.items())}
+
+    def sweep_rate(self) -> float:
+        """Returns the sweeps per second since start()."""
+        elapsed = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        return self.sweeps / elapsed if elapsed > 0 else 0.0
+
+    def _next_sweep(self) -> None:
+        """
+        Starts sweeps until one is still in progress. A sweep that completes inside start()
+        (every request failed at once) only flags the loop, which then starts the next one.
+        """
+        with self._lock:
+            if self._scheduling:
+                self._sweep_due = True
+                return
+            self._scheduling = True
+        while True:
+            if self._finished():
+                with self._lock:
+                    self._scheduling = False
+                return
+            self._sweep_due = False
+            self.sweeps += 1
+            try:
+                self.sweep.start(self.protocol).add_done_callback(self._on_sweep)
+            except Exception as e:
+                self._fail(e)
+            with self._lock:
+                if not self._sweep_due:
+                    self._scheduling = False
+                    return
+
+    def _finished(self) -> bool:
+        """Completes the stop future once the acquisition is over, returns True then."""
+        if self._stopped.done():
+            return True
+        if self.empty_sweeps >= MAX_EMPTY_SWEEPS:
+            self._fail(ConnectionError(f"No valid frame in {self.empty_sweeps} sweeps in a row"))
+            return True
+        if not self._running or (self._max_sweeps is not None and self.sweeps >= self._max_sweeps):
+            self._running = False
+            self._stopped.set_result(self.sweeps)
+            return True
+        return False
+
+    def _fail(self, error: Exception) -> None:
+        self._running = False
+        if not self._stopped.done():
+            self._stopped.set_exception(error)
+
+    def _on_sweep(self, done: Future) -> None:
+        try:
+            self._accumulate(done.result())
+        except Exception as e:
+            self._fail(e)
+            return
+        self._next_sweep()
+
+    def _accumulate(self, result: SweepResult) -> None:
+        block = result.blocks[self.source]
+        valid = block.valid[0]
+        self.failed_frames += int((~valid).sum())
+        if not valid.any():
+            self.empty_sweeps += 1
+            return
+        self.empty_sweeps = 0
+        samples = block.samples[0][valid]
+        spectra = self.processor.compute(samples) if self.source == ADC else device_spectrum_db(samples)
+        for antenna, spectrum in zip(np.asarray(result.antennas)[valid].tolist(), spectra):
+            stats = self.stats.get(antenna)
+            if stats is None:
+                stats = self.stats[antenna] = RunningSpectrumStats(spectrum.shape[-1])
+            stats.update(spectrum)
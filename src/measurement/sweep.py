@@ -0,0 +1,161 @@
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import partial
+
+import numpy as np
+
+from measurement.frames import ADC, ANTENNAS, FFT, measurement_type
+from serialbsp.command_script import CommandScript, ScriptResult, ScriptStep, StepResult
+from serialbsp.commands import COMMANDS_BY_CODE
+from serialbsp.protocol_fmcw import PIPELINE_DEPTH
+from serialbsp.schemas import PAYLOAD_OFFSET
+
+DEFAULT_FFT_SAMPLES = 1  # Spectra averaged by the device per FFT measurement
+SWEEP_PIPELINE_DEPTH = PIPELINE_DEPTH  # Frames in flight, each request's timeout starts when it is answered next
+
+
+@dataclass
+class SweepBlock:
+    """
+    Samples of one measurement kind over all sweeps.
+
+    Args:
+        samples (np.ndarray): (sweeps, antennas, samples), zero where a step failed.
+        timestamps (np.ndarray): (sweeps, antennas) Unix receive times, NaN where a step failed.
+        valid (np.ndarray): (sweeps, antennas) True where the frame was received.
+    """
+    samples: np.ndarray
+    timestamps: np.ndarray
+    valid: np.ndarray
+
+    @classmethod
+    def allocate(cls, sweeps: int, antennas: int, sample_count: int, dtype: np.dtype) -> "SweepBlock":
+        return cls(np.zeros((sweeps, antennas, sample_count), dtype=dtype),
+                   np.full((sweeps, antennas), np.nan),
+                   np.zeros((sweeps, antennas), dtype=bool))
+
+
+@dataclass
+class SweepResult:
+    """
+    Result of AntennaSweep: one SweepBlock per acquired kind. The antenna axis follows
+    antennas, e.g. adc.samples[:, antennas.index(3)] is antenna 3.
+    """
+    antennas: tuple[int, ...]
+    blocks: dict[str, SweepBlock]
+    errors: list[str] = field(default_factory=list)
+    wall_time_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def adc(self) -> np.ndarray | None:
+        block = self.blocks.get(ADC)
+        return block.samples if block else None
+
+    @property
+    def fft(self) -> np.ndarray | None:
+        block = self.blocks.get(FFT)
+        return block.samples if block else None
+
+    def sweep(self, index: int, kind: str = ADC) -> np.ndarray:
+        """Returns the (antennas, samples) array of one sweep."""
+        return self.blocks[kind].samples[index]
+
+
+class AntennaSweep:
+    """
+    Acquires all antennas as one pipelined job.
+
+    Every sweep triggers the ADC and/or FFT measurement of each antenna in turn. The requests
+    run as a CommandScript, so the next antenna is requested while the previous frame is still
+    on the line. Each frame is copied into arrays allocated for the whole job as soon as it
+    arrives and is then dropped, so peak memory is the arrays plus the frames in flight:
+    (antennas, samples) per sweep, (sweeps, antennas, samples) for repeated sweeps. That is the
+    layout of the angle-of-arrival and calibration scripts.
+    """
+
+    def __init__(self, kinds: tuple[str, ...] = (ADC,), antennas: tuple[int, ...] = ANTENNAS,
+                 fft_samples: int = DEFAULT_FFT_SAMPLES, pipeline_depth: int = SWEEP_PIPELINE_DEPTH,
+                 timeout_ms: int | None = None):
+        """
+        Initialize the sweep.
+
+        Args:
+            kinds (tuple[str, ...]): ADC and/or FFT.
+            antennas (tuple[int, ...]): The antennas to acquire, in array order.
+            fft_samples (int): Number of spectra the device averages per FFT measurement (1-255).
+            pipeline_depth (int): Maximum number of requests in flight.
+            timeout_ms (int | None): Response timeout per frame, defaults to the protocol's.
+
+        Raises:
+            ValueError: If a kind or antenna has no measurement command.
+        """
+        if not 1 <= fft_samples <= 255:
+            raise ValueError("fft_samples must be between 1 and 255")
+        self.kinds = tuple(kinds)
+        self.antennas = tuple(antennas)
+        self.types = {(kind, antenna): measurement_type(kind, antenna) for kind in self.kinds for antenna in self.antennas}
+        self.fft_samples = fft_samples
+        self.pipeline_depth = pipeline_depth
+        self.timeout_ms = timeout_ms
+
+    def script(self, sweeps: int = 1) -> CommandScript:
+        """Returns the command script of the job, sweeps x antennas x kinds steps."""
+        steps = []
+        for sweep in range(sweeps):
+            for antenna in self.antennas:
+                for kind in self.kinds:
+                    measurement = self.types[(kind, antenna)]
+                    data = [self.fft_samples] if kind == FFT else [0]
+                    steps.append(ScriptStep(COMMANDS_BY_CODE[measurement.code], data, self.timeout_ms,
+                                            f"sweep {sweep + 1} antenna {antenna} {kind}"))
+        return CommandScript(steps, "antenna sweep", self.pipeline_depth)
+
+    def start(self, protocol, sweeps: int = 1) -> Future:
+        """
+        Starts the acquisition without blocking on a TxScheduler or protocol, see CommandScript.start().
+
+        Returns:
+            Future[SweepResult]: Completes once every frame was received or failed.
+        """
+        if sweeps < 1:
+            raise ValueError("sweeps must be at least 1")
+        blocks = {kind: SweepBlock.allocate(sweeps, len(self.antennas), self.types[(kind, self.antennas[0])].sample_count,
+                                            self.types[(kind, self.antennas[0])].dtype)
+                  for kind in self.kinds}
+        future = Future()
+        job = self.script(sweeps).start(protocol, partial(self._store_step, blocks))
+        job.add_done_callback(lambda done: self._collect(done, blocks, future))
+        return future
+
+    def run(self, protocol, sweeps: int = 1, timeout: float | None = None) -> SweepResult:
+        """Runs the acquisition and waits for it, for headless tools (see CommandScript.run())."""
+        return self.start(protocol, sweeps).result(timeout)
+
+    def _store_step(self, blocks: dict[str, SweepBlock], index: int, step: StepResult) -> None:
+        """Copies a received frame into its block, steps run sweep by sweep, antenna by antenna, kind by kind."""
+        if not step.ok:
+            return
+        kind = self.kinds[index % len(self.kinds)]
+        antenna_index = index // len(self.kinds) % len(self.antennas)
+        sweep = index // (len(self.kinds) * len(self.antennas))
+        measurement = self.types[(kind, self.antennas[antenna_index])]
+        block = blocks[kind]
+        block.samples[sweep, antenna_index] = np.frombuffer(
+            step.response, dtype=measurement.dtype, count=measurement.sample_count, offset=PAYLOAD_OFFSET)
+        block.timestamps[sweep, antenna_index] = step.received_at
+        block.valid[sweep, antenna_index] = True
+        step.response = None  # The samples are in the block now
+
+    def _collect(self, job: Future, blocks: dict[str, SweepBlock], future: Future) -> None:
+        try:
+            script_result: ScriptResult = job.result()
+            result = SweepResult(self.antennas, blocks, wall_time_ms=script_result.wall_time_ms)
+            result.errors = [f"{step.step.label}: {step.error}" for step in script_result.failed]
+        except Exception as e:
+            future.set_exception(e)
+            return
+        future.set_result(result)
@@ -0,0 +1,180 @@
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+from serialbsp.commands import COMMANDS_BY_CODE
+from serialbsp.crc8 import crc8
+from serialbsp.traffic_trace import RX, TX
+
+# File layout: header, then one record per chunk
+#   header: magic, format version, capture start as Unix time
+#   record: microseconds since the start, direction, length, then the raw bytes
+CAPTURE_MAGIC = b"FMCWCAP\0"
+CAPTURE_VERSION = 1
+HEADER = struct.Struct("<8sHd")
+RECORD = struct.Struct("<QBI")
+DIRECTION_CODES = {RX: 0, TX: 1}
+DIRECTIONS = {code: direction for direction, code in DIRECTION_CODES.items()}
+
+MAX_REQUEST_SIZE = 16  # Longest request frame looked for when splitting written chunks
+
+
+@dataclass
+class CaptureChunk:
+    time: float  # seconds since the start of the capture
+    direction: str  # RX or TX
+    data: bytes
+
+
+class CaptureWriter:
+    """
+    Writes timestamped raw Rx/Tx chunks to a capture file.
+
+    record() is called from the reader and writer threads of a SerialManager, the chunks are
+    timestamped under the lock so the file is always in time order.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.chunks = 0
+        self.bytes = {RX: 0, TX: 0}
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._start = time.perf_counter()
+        self._file.write(HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, time.time()))
+
+    def record(self, direction: str, data) -> None:
+        """Appends a chunk, does nothing once the capture is closed."""
+        with self._lock:
+            if self._file is None:
+                return
+            elapsed_us = int((time.perf_counter() - self._start) * 1_000_000)
+            self._file.write(RECORD.pack(elapsed_us, DIRECTION_CODES[direction], len(data)))
+            self._file.write(data)
+            self.chunks += 1
+            self.bytes[direction] += len(data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_capture(path: str) -> Iterator[CaptureChunk]:
+    """
+    Opens a capture file and returns an iterator over its chunks in order. The header is
+    checked at once, the chunks are read lazily.
+
+    Raises:
+        OSError: If the file cannot be opened.
+        ValueError: If the file is not a capture or has an unsupported version.
+    """
+    file = open(path, 'rb')
+    try:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a capture file")
+        _magic, version, _started = HEADER.unpack(header)
+        if version != CAPTURE_VERSION:
+            raise ValueError(f"Unsupported capture version {version}")
+    except Exception:
+        file.close()
+        raise
+    return _read_chunks(file)
+
+
+def _read_chunks(file) -> Iterator[CaptureChunk]:
+    with file:
+        while True:
+            record = file.read(RECORD.size)
+            if len(record) < RECORD.size:
+                return  # End of file, or a record cut off when the capture was interrupted
+            elapsed_us, direction, length = RECORD.unpack(record)
+            data = file.read(length)
+            if len(data) < length:
+                return
+            yield CaptureChunk(elapsed_us / 1_000_000, DIRECTIONS[direction], data)
+
+
+def split_request_frames(chunk: bytes) -> list[bytes]:
+    """
+    Splits a written chunk into request frames. Requests carry no length, and the writer may
+    have coalesced several of them, so each frame ends at the first byte that is a valid CRC8
+    of the bytes before it. Bytes that do not start with a known command are dropped.
+    """
+    frames = []
+    start = 0
+    while start < len(chunk):
+        if chunk[start] not in COMMANDS_BY_CODE:
+            start += 1
+            continue
+        for end in range(start + 2, min(len(chunk), start + MAX_REQUEST_SIZE) + 1):
+            if crc8(chunk, start, end - 1) == chunk[end - 1]:
+                frames.append(chunk[start:end])
+                start = end
+                break
+        else:
+            start += 1
+    return frames
+
+
+def capture_summary(path: str) -> dict:
+    """Returns the chunk and byte counts and the duration of a capture."""
+    summary = {"chunks": 0, "rx_bytes": 0, "tx_bytes": 0, "duration_s": 0.0}
+    for chunk in read_capture(path):
+        summary["chunks"] += 1
+        summary["rx_bytes" if chunk.direction == RX else "tx_bytes"] += len(chunk.data)
+        summary["duration_s"] = chunk.time
+    return summary
+
+
+if __name__ == '__main__':
+    import sys
+    from PySide6.QtCore import QCoreApplication, QTimer
+    from serialbsp.protocol_fmcw import SerialProtocolFmcw
+    from serialbsp.serial_manager import SerialManager
+    from serialbsp.fd_transport import ReplayTransport
+
+    # Example: python -m serialbsp.capture field_issue.cap 10   (speed, "max" for as fast as possible)
+    path = sys.argv[1]
+    speed = None if len(sys.argv) < 3 or sys.argv[2] == "max" else float(sys.argv[2])
+    print(capture_summary(path))
+
+    app = QCoreApplication(sys.argv)
+    manager = SerialManager()
+    protocol = SerialProtocolFmcw()
+    manager.data_received.connect(protocol.handle_raw_data)
+    frames = []
+    protocol.data_received.connect(frames.append)
+    protocol.error_occurred.connect(lambda message: print(f"Error: {message}"))
+
+    def replay_request(chunk: bytes) -> None:
+        # Re-issue the captured requests so the responses are routed like in the original session
+        for frame in split_request_frames(chunk):
+            protocol.request(COMMANDS_BY_CODE[frame[0]], list(frame[1:-1]))
+
+    transport = ReplayTransport(path, speed=speed, on_tx=replay_request)
+    manager.open_serial_port(f"replay://{path}", transport=transport)
+    started = time.perf_counter()
+
+    def report():
+        if transport.finished.is_set() and protocol.pending_request_count() == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{len(frames)} frames, {transport.rx_bytes} bytes in {elapsed:.3f} s "
+                  f"({transport.rx_bytes / elapsed / 1e6:.2f} MB/s), {protocol.resync_count} resyncs")
+            manager.close_serial_port()
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(report)
+    timer.start(50)
+    sys.exit(app.exec())
@@ -0,0 +1,264 @@
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from time import monotonic, time
+from typing import Callable
+
+import yaml
+
+from serialbsp.commands import Command, get_command_by_name
+from serialbsp.protocol_fmcw import PIPELINE_DEPTH
+from serialbsp.schemas import SchemaRecord
+
+DEFAULT_PIPELINE_DEPTH = PIPELINE_DEPTH  # Requests kept in flight at once
+
+
+@dataclass
+class ScriptStep:
+    """
+    One command of a script.
+
+    Args:
+        command (Command): The command to send.
+        data (list[int]): The data bytes of the command.
+        timeout_ms (int | None): Response timeout, defaults to the protocol's adaptive timeout.
+        label (str): Name of the step in the report, defaults to the command name.
+    """
+    command: Command
+    data: list[int] = field(default_factory=lambda: [0])
+    timeout_ms: int | None = None
+    label: str = ""
+
+    def __post_init__(self):
+        if not self.label:
+            self.label = self.command.name
+
+
+@dataclass
+class StepResult:
+    step: ScriptStep
+    response: bytes | None = None
+    error: str | None = None
+    latency_ms: float = 0.0
+    decoded: SchemaRecord | None = None
+    received_at: float = 0.0  # Unix time the response or error arrived
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ScriptResult:
+    name: str
+    steps: list[StepResult]
+    wall_time_ms: float
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.steps)
+
+    @property
+    def failed(self) -> list[StepResult]:
+        return [result for result in self.steps if not result.ok]
+
+    def report(self) -> str:
+        """Formats the per-step latencies and the total wall time."""
+        lines = [f"Script '{self.name}': {len(self.steps)} steps, {len(self.failed)} failed, {self.wall_time_ms:.1f} ms"]
+        for index, result in enumerate(self.steps, 1):
+            status = "ok" if result.ok else result.error
+            size = len(result.response) if result.response is not None else 0
+            lines.append(f"{index:>3} {result.step.label:<30} {result.latency_ms:>9.1f} ms {size:>5} B  {status}")
+        return "\n".join(lines)
+
+
+class CommandScript:
+    """
+    Sequence of commands executed as one pipelined job over a SerialProtocolFmcw.
+
+    Up to pipeline_depth requests are in flight at once and the next step is sent as soon as a
+    response (or timeout) frees a slot, so the job takes roughly the wire time of its commands.
+    Steps are sent in order and every response is collected in a ScriptResult, decoded with the
+    command's schema when it has one. A failing step does not stop the script.
+    """
+
+    def __init__(self, steps: list[ScriptStep], name: str = "script", pipeline_depth: int = DEFAULT_PIPELINE_DEPTH):
+        """
+        Initialize the script.
+
+        Args:
+            steps (list[ScriptStep]): The commands to send, in order.
+            name (str): Name of the script in the report.
+            pipeline_depth (int): Maximum number of requests in flight.
+        """
+        if pipeline_depth < 1:
+            raise ValueError("pipeline_depth must be at least 1")
+        self.steps = list(steps)
+        self.name = name
+        self.pipeline_depth = pipeline_depth
+
+    @classmethod
+    def from_dict(cls, script: dict) -> "CommandScript":
+        """
+        Builds a script from a dict:
+
+            name: acceptance
+            pipeline_depth: 4
+            steps:
+              - command: CMD_GET_DEVICE_STATUS
+              - command: CMD_START_FFT_MEAS_ANTENNA_1
+                data: [16]
+                timeout_ms: 3000
+                label: FFT antenna 1
+
+        Raises:
+            ValueError: If a command name is unknown or a step has no command.
+        """
+        steps = []
+        for index, entry in enumerate(script.get("steps") or [], 1):
+            if isinstance(entry, str):
+                entry = {"command": entry}
+            if "command" not in entry:
+                raise ValueError(f"Step {index} has no command")
+            steps.append(ScriptStep(
+                command=get_command_by_name(entry["command"]),
+                data=[int(byte) for byte in entry.get("data", [0])],
+                timeout_ms=entry.get("timeout_ms"),
+                label=entry.get("label", ""),
+            ))
+        return cls(steps, script.get("name", "script"), script.get("pipeline_depth", DEFAULT_PIPELINE_DEPTH))
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "CommandScript":
+        """Loads a script from a YAML file, see from_dict() for the format."""
+        with open(path, 'r') as file:
+            return cls.from_dict(yaml.safe_load(file) or {})
+
+    def start(self, protocol, on_step: Callable[[int, StepResult], None] | None = None) -> Future:
+        """
+        Starts the script without blocking.
+
+        The steps are chained on the request futures, so this can be called from the GUI thread:
+        each completion sends the next step from the thread that completed the previous one.
+
+        Args:
+            protocol (TxScheduler | SerialProtocolFmcw): Where the requests are sent. The GUI
+                passes its TxScheduler so the script shares the line with the other traffic,
+                headless tools without an event loop pass the protocol.
+            on_step (Callable[[int, StepResult], None] | None): Called with the index and result
+                of each step as it completes. It may take the response out of the result (set
+                it to None) so large frames are not kept until the end of the script; an
+                exception it raises becomes the step's error.
+
+        Returns:
+            Future[ScriptResult]: Completes once every step has a response or an error.
+        """
+        return _ScriptRun(self, protocol, on_step).start()
+
+    def run(self, protocol, timeout: float | None = None) -> ScriptResult:
+        """
+        Runs the script and waits for the result.
+
+        Only for headless tools where the received data is handed to the protocol from another
+        thread, on the GUI thread use start() instead.
+
+        Args:
+            protocol (SerialProtocolFmcw): The protocol of the connection to use, see start().
+            timeout (float | None): Maximum time to wait in seconds.
+
+        Raises:
+            TimeoutError: If the script does not finish in time.
+        """
+        return self.start(protocol).result(timeout)
+
+
+class _ScriptRun:
+    """State of one execution of a CommandScript."""
+
+    def __init__(self, script: CommandScript, protocol, on_step: Callable[[int, StepResult], None] | None = None):
+        self.script = script
+        self.protocol = protocol
+        self.on_step = on_step
+        self.results = [StepResult(step) for step in script.steps]
+        self.future = Future()
+        self._lock = threading.Lock()
+        self._next_step = 0
+        self._in_flight = 0
+        self._remaining = len(script.steps)
+        self._filling = False
+        self._started_at = 0.0
+
+    def start(self) -> Future:
+        self._started_at = monotonic()
+        if not self.results:
+            self._finish()
+        self._fill_pipeline()
+        return self.future
+
+    def _fill_pipeline(self) -> None:
+        """
+        Sends steps until pipeline_depth requests are in flight. Commands without a response
+        complete inside request(), the loop (instead of recursion) keeps long scripts of such
+        commands from growing the stack.
+        """
+        with self._lock:
+            if self._filling:
+                return # The filling loop further up the stack re-checks the pipeline
+            self._filling = True
+        while True:
+            with self._lock:
+                if self._next_step >= len(self.results) or self._in_flight >= self.script.pipeline_depth:
+                    self._filling = False
+                    return
+                index = self._next_step
+                self._next_step += 1
+                self._in_flight += 1
+            self._send(index)
+
+    def _send(self, index: int) -> None:
+        step = self.results[index].step
+        sent_at = monotonic()
+        try:
+            request = self.protocol.request(step.command, step.data, step.timeout_ms)
+        except Exception as e:
+            self._complete(index, sent_at, error=f"{type(e).__name__}: {e}")
+            return
+        request.add_done_callback(lambda done: self._on_response(index, sent_at, done))
+
+    def _on_response(self, index: int, sent_at: float, request: Future) -> None:
+        if request.cancelled():
+            self._complete(index, sent_at, error="Cancelled")
+        elif request.exception() is not None:
+            error = request.exception()
+            self._complete(index, sent_at, error=f"{type(error).__name__}: {error}")
+        else:
+            self._complete(index, sent_at, response=request.result())
+
+    def _complete(self, index: int, sent_at: float, response: bytes | None = None, error: str | None = None) -> None:
+        result = self.results[index]
+        result.latency_ms = (monotonic() - sent_at) * 1000
+        result.received_at = time()
+        result.response = response
+        result.error = error
+        if response and result.step.command.schema is not None:
+            try:
+                result.decoded = result.step.command.decode(response)
+            except Exception as e:
+                result.error = f"Decode failed: {e}"
+        if self.on_step is not None:
+            try:
+                self.on_step(index, result)
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+        with self._lock:
+            self._in_flight -= 1
+            self._remaining -= 1
+            finished = self._remaining == 0
+        if finished:
+            self._finish()
+        else:
+            self._fill_pipeline()
+
+    def _finish(self) -> None:
+        wall_time_ms = (monotonic() - self._started_at) * 1000
+        self.future.set_result(ScriptResult(self.script.name, self.results, wall_time_ms))
@@ -1,6 +1,14 @@
 from dataclasses import dataclass
 
 from bms.isl94203_constants import ISL94203_MEMORY_SIZE, ISL94203_RAM_SIZE
+from serialbsp.schemas import (
+    DEVICE_STATUS_SCHEMA,
+    FILTER_CONFIG_SCHEMA,
+    PAYLOAD_OFFSET,
+    SD_CARD_STATUS_SCHEMA,
+    ResponseSchema,
+    SchemaRecord,
+)
 
 ERROR_BYTE = 0x09
 BOARD_TRIGGERED = 0x0A
@@ -12,14 +20,37 @@ class Command:
     code: int
     response_size: int
     description: str = ""
+    schema: ResponseSchema | None = None  # Layout of the response data, None if not decoded
+
+    def __post_init__(self):
+        if self.schema is not None and PAYLOAD_OFFSET + self.schema.size + 1 > self.response_size:
+            raise ValueError(f"Schema {self.schema.name} does not fit into the {self.response_size}-byte response of {self.name}")
+
+    def decode(self, packet) -> SchemaRecord:
+        """
+        Decodes the response data with the command's schema.
+
+        Args:
+            packet (bytes | bytearray | memoryview): The complete response frame.
+
+        Returns:
+            SchemaRecord: The decoded record.
+
+        Raises:
+            ValueError: If the command has no schema.
+            struct.error: If the packet is too short.
+        """
+        if self.schema is None:
+            raise ValueError(f"Command {self.name} has no response schema")
+        return self.schema.decode(packet)
 
 # Define all commands
 #response_size  is  [cmd, cmd, data, checksum]
 COMMANDS = [
-    Command(name="CMD_GET_DEVICE_STATUS", code=0x08, response_size=25, description="Get device status"),
+    Command(name="CMD_GET_DEVICE_STATUS", code=0x08, response_size=25, description="Get device status", schema=DEVICE_STATUS_SCHEMA),
     Command(name="CMD_START_CALIBRATION", code=0x0B, response_size=20, description="Start calibration"),
     Command(name="CMD_GET_BOOTLOADER_STATUS", code=0x0C, response_size=11, description="Get bootloader status"),
-    Command(name="CMD_GET_SDCARD_STATUS", code=0x0D, response_size=17, description="Get SD card status"),
+    Command(name="CMD_GET_SDCARD_STATUS", code=0x0D, response_size=17, description="Get SD card status", schema=SD_CARD_STATUS_SCHEMA),
     Command(name="CMD_GET_REMOTE_STATUS", code=0x0E, response_size=26, description="Get remote status"),
     Command(name="CMD_START_FFT_MEAS_ANTENNA_1", code=0x10, response_size=483, description="Start FFT measurement on antenna 1"),
     Command(name="CMD_START_ADC_MEAS_ANTENNA_1", code=0x11, response_size=1027, description="Start ADC measurement on antenna 1"),
@@ -41,7 +72,7 @@ COMMANDS = [
     Command(name="CMD_DIGITAL_POTI_2", code=0x21, response_size=8, description="Set digital potentiometer 2"),
     Command(name="CMD_DIGITAL_POTI_3", code=0x22, response_size=8, description="Set digital potentiometer 3"),
     Command(name="CMD_DIGITAL_POTI_4", code=0x23, response_size=8, description="Set digital potentiometer 4"),
-    Command(name="CMD_FILTER_REQUEST", code=0x24, response_size=7, description="Request filter data"),
+    Command(name="CMD_FILTER_REQUEST", code=0x24, response_size=7, description="Request filter data", schema=FILTER_CONFIG_SCHEMA),
     Command(name="CMD_RESET_TUSB3410", code=0x28, response_size=2, description="Reset TUSB3410"),
     Command(name="CMD_RESET_ISM", code=0x29, response_size=2, description="Reset ISM module"),
     Command(name="CMD_RESET_RS485", code=0x2A, response_size=2, description="Reset RS485 module"),
@@ -77,24 +108,28 @@ COMMANDS = [
     Command(name="CMD_TEST", code=0xFF, response_size=1, description="Test command"),
 ]
 
+# Lookup tables built once at import
+COMMANDS_BY_NAME = {command.name: command for command in COMMANDS}
+COMMANDS_BY_CODE = {command.code: command for command in COMMANDS}
+
 def get_command_by_name(name: str) -> Command:
     """
     Retrieve a Command object by its name.
     """
-    for command in COMMANDS:
-        if command.name == name:
-            return command
-    raise ValueError(f"Command with name '{name}' not found")
+    try:
+        return COMMANDS_BY_NAME[name]
+    except KeyError:
+        raise ValueError(f"Command with name '{name}' not found") from None
 
 
 def get_command_by_code(code: int) -> Command:
     """
     Retrieve a Command object by its code.
     """
-    for command in COMMANDS:
-        if command.code == code:
-            return command
-    raise ValueError(f"Command with code 0x{code:02X} not found")
+    try:
+        return COMMANDS_BY_CODE[code]
+    except KeyError:
+        raise ValueError(f"Command with code 0x{code:02X} not found") from None
 
 if "__main__" == __name__:
     # Example usage
@@ -1,3 +1,10 @@
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 crc8_table = [
     0, 94, 188, 226, 97, 63, 221, 131, 194, 156, 126, 32, 163, 253, 31, 65,
     157, 195, 33, 127, 252, 162, 64, 30, 95, 1, 227, 189, 62, 96, 130, 220,
@@ -18,12 +25,124 @@ crc8_table = [
 ]
 
 
-def calculate_crc(data):
+CRC8_TABLE = tuple(crc8_table)  # Immutable copy bound as a local in the hot loops
+
+VECTOR_MIN_BYTES = 256  # Shorter ranges are faster in the table loop than through NumPy
+VECTOR_SPAN = 2048  # Bytes covered by the position table, longer ranges are done in spans
+_position_table = None  # (VECTOR_SPAN * 256,) uint8, built on first use
+
+
+def _crc8_positions():
+    """
+    Returns the flattened position table of the vectorized CRC.
+
+    The CRC is linear over GF(2), so the CRC of n bytes is the xor of the contribution of each
+    byte, and the contribution of byte b followed by k more bytes is the table lookup of b
+    repeated k + 1 times. Row VECTOR_SPAN - 1 - k holds those contributions for all 256 bytes.
+    """
+    global _position_table
+    if _position_table is None:
+        table = np.array(CRC8_TABLE, dtype=np.uint8)
+        rows = np.empty((VECTOR_SPAN, 256), dtype=np.uint8)
+        rows[-1] = table
+        for row in range(VECTOR_SPAN - 2, -1, -1):
+            rows[row] = table[rows[row + 1]]
+        _position_table = rows.ravel()
+    return _position_table
+
+
+def _row_offsets(count: int):
+    """Flat offsets of the position table rows for the last count bytes of a span."""
+    return np.arange(VECTOR_SPAN - count, VECTOR_SPAN, dtype=np.intp) * 256
+
+
+def _crc8_vector(data: memoryview) -> int:
+    """CRC8 of a byte range with one NumPy gather and xor per span instead of a lookup per byte."""
+    positions = _crc8_positions()
     crc = 0
-    for byte in data[:-1]:  # Exclude the last byte (CRC byte)
-        crc = crc8_table[crc ^ byte]
+    for first in range(0, len(data), VECTOR_SPAN):
+        span = np.frombuffer(data[first:first + VECTOR_SPAN], dtype=np.uint8)
+        offset = (VECTOR_SPAN - len(span)) * 256
+        # The CRC of the previous spans enters like an extra first byte
+        crc = int(positions[offset + crc]) ^ int(np.bitwise_xor.reduce(positions[_row_offsets(len(span)) + span]))
     return crc
 
+
+def crc8(data, start: int = 0, end: int | None = None, _table=CRC8_TABLE) -> int:
+    """
+    Calculates the CRC8 (Dallas/Maxim) of data[start:end].
+
+    Accepts bytes, bytearray or memoryview as-is, so a frame can be checked straight out of the
+    receive buffer without building a list first. The range is read through a memoryview slice,
+    which does not copy. Ranges of VECTOR_MIN_BYTES or more, such as measurement frames, are
+    checksummed with NumPy in a few array operations (see _crc8_positions()), shorter ones
+    byte by byte through the table. Other iterables such as a list of ints are read in place
+    with islice().
+
+    Args:
+        data (bytes | bytearray | memoryview | list[int]): The bytes to checksum.
+        start (int): Offset of the first byte.
+        end (int | None): Offset after the last byte, defaults to the end of data.
+
+    Returns:
+        int: The CRC8 value.
+    """
+    if end is None:
+        end = len(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = memoryview(data)[start:end]
+        if np is not None and len(data) >= VECTOR_MIN_BYTES:
+            return _crc8_vector(data)
+    elif start or end != len(data):
+        data = islice(data, start, end)
+    crc = 0
+    for byte in data:
+        crc = _table[crc ^ byte]
+    return crc
+
+
+def crc8_many(buffers, end_offset: int = 0) -> list[int]:
+    """
+    Calculates the CRC8 of many buffers in one call.
+
+    Buffers of the same length are checksummed together with NumPy, one gather over the
+    position table and one xor per row for the whole group, which is what makes batch
+    validation of captured ADC frames cheap. Without NumPy, for a single buffer or for buffers
+    longer than VECTOR_SPAN, it falls back to crc8().
+
+    Args:
+        buffers (Iterable[bytes | bytearray | memoryview]): The buffers to checksum.
+        end_offset (int): Number of trailing bytes to leave out of each buffer, 1 skips the CRC byte.
+
+    Returns:
+        list[int]: The CRC8 of each buffer, in order.
+    """
+    buffers = list(buffers)
+    if len(buffers) < 2 or np is None:
+        return [crc8(buffer, 0, len(buffer) - end_offset) for buffer in buffers]
+
+    results = [0] * len(buffers)
+    groups: dict[int, list[int]] = {}
+    for index, buffer in enumerate(buffers):
+        groups.setdefault(len(buffer), []).append(index)
+    for length, indexes in groups.items():
+        size = max(length - end_offset, 0)
+        if size > VECTOR_SPAN:
+            for i in indexes:
+                results[i] = crc8(buffers[i], 0, size)
+            continue
+        frames = np.frombuffer(b"".join(bytes(buffers[i]) for i in indexes), dtype=np.uint8)
+        frames = frames.reshape(len(indexes), length)[:, :size]
+        crc = np.bitwise_xor.reduce(_crc8_positions()[_row_offsets(size) + frames], axis=1)
+        for i, value in zip(indexes, crc.tolist()):
+            results[i] = value
+    return results
+
+
+def calculate_crc(data):
+    """Calculates the CRC8 of all bytes but the last one (the CRC byte placeholder)."""
+    return crc8(data, 0, len(data) - 1)
+
 def check_crc(data):
     crc = calculate_crc(data)
     if crc != data[-1]:  # Compare with the last byte (CRC byte)
@@ -0,0 +1,220 @@
+import logging
+from concurrent.futures import Future
+from dataclasses import dataclass
+from time import monotonic
+
+from PySide6.QtCore import QObject, Signal
+
+from bms.isl94203_driver import ISL94203Driver
+from bms.isl94203_factory import ISL94203Factory
+from serialbsp.commands import Command
+from serialbsp.protocol_fmcw import SerialProtocolFmcw
+from serialbsp.protocol_worker import ProtocolWorker
+from serialbsp.serial_manager import SerialManager
+from serialbsp.traffic_trace import TrafficTrace
+from serialbsp.tx_scheduler import TxScheduler
+
+DEFAULT_BAUDRATE = 9600
+
+
+@dataclass
+class DeviceCounters:
+    rx_bytes: int = 0
+    tx_bytes: int = 0
+    frames: int = 0
+    errors: int = 0
+    opened_at: float | None = None
+
+    def as_dict(self) -> dict:
+        elapsed = monotonic() - self.opened_at if self.opened_at is not None else 0.0
+        return {
+            "rx_bytes": self.rx_bytes,
+            "tx_bytes": self.tx_bytes,
+            "frames": self.frames,
+            "errors": self.errors,
+            "rx_bytes_per_s": self.rx_bytes / elapsed if elapsed > 0 else 0.0,
+            "frames_per_s": self.frames / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class FmcwDevice:
+    """
+    One FMCW unit of a DevicePool: its serial port with its own reader thread, protocol
+    thread (ProtocolWorker, as in the GUI), transmit scheduler, traffic trace and BMS driver
+    with a register image of its own.
+    """
+
+    def __init__(self, name: str, port: str, parent: QObject | None = None):
+        self.name = name
+        self.port = port
+        self.serial_manager = SerialManager(parent)
+        self.trace = TrafficTrace(name=name)
+        self.protocol = SerialProtocolFmcw(metrics=self.serial_manager.metrics, trace=self.trace)
+        self.worker = ProtocolWorker(self.protocol, parent=parent)
+        self.scheduler = TxScheduler(self.protocol, parent=parent)
+        self.bms_driver = ISL94203Driver(hal=ISL94203Factory.create_device_instance())
+        self.counters = DeviceCounters()
+
+        # Framing, CRC checks and decoding run in the protocol's thread, one per device
+        self.serial_manager.data_received.connect(self.protocol.handle_raw_data)
+        self.serial_manager.data_received.connect(self._count_rx)
+        self.protocol.gui_signals.command_encoded.connect(self._send)
+        self.protocol.gui_signals.error_occurred.connect(self._on_error)
+        self.serial_manager.error_occurred.connect(self._on_error)
+        self.worker.start()
+
+    def open(self, baudrate: int = DEFAULT_BAUDRATE) -> bool:
+        """Opens the port, returns True on success."""
+        self.serial_manager.open_serial_port(self.port, baudrate)
+        if not self.serial_manager.is_open():
+            return False
+        self.protocol.baudrate = baudrate
+        self.counters = DeviceCounters(opened_at=monotonic())
+        return True
+
+    def close(self) -> None:
+        self.serial_manager.close_serial_port()
+
+    def shutdown(self) -> None:
+        """Closes the port and stops the protocol thread, the device cannot be used afterwards."""
+        self.close()
+        self.worker.stop()
+
+    def is_open(self) -> bool:
+        return self.serial_manager.is_open()
+
+    def request(self, cmd: Command, data: list[int], priority: int | None = None) -> Future:
+        """Queues a command on the device's scheduler, see TxScheduler.submit()."""
+        return self.scheduler.submit(cmd, data, priority)
+
+    def stats(self) -> dict:
+        return {
+            "port": self.port,
+            "open": self.is_open(),
+            **self.counters.as_dict(),
+            "pending": self.protocol.pending_request_count(),
+            "resyncs": self.protocol.resync_count,
+            "reader": self.serial_manager.get_reader_stats(),
+            "link": self.serial_manager.metrics.snapshot(),
+        }
+
+    def _send(self, encoded_data) -> None:
+        data = bytes(encoded_data)
+        self.counters.tx_bytes += len(data)
+        self.serial_manager.send_data(data)
+
+    def _count_rx(self, data: bytes) -> None:
+        self.counters.rx_bytes += len(data)
+
+    def _on_error(self, message: str) -> None:
+        self.counters.errors += 1
+        logging.error(f"{self.name}: {message}")
+
+
+class DevicePool(QObject):
+    """
+    Drives several FMCW units from one process.
+
+    Each device has its own reader thread, protocol thread and BMS driver, so the units do not
+    share any receive state and are framed and decoded in parallel. Responses are delivered
+    in the pool's thread through frame_received and frame_decoded, and stats() aggregates the
+    throughput of the rack.
+    """
+    frame_received = Signal(str, bytes)  # device name, response frame
+    frame_decoded = Signal(str, int, object)  # device name, command code, decoded record
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.devices: dict[str, FmcwDevice] = {}
+
+    def add_device(self, port: str, name: str | None = None) -> FmcwDevice:
+        """
+        Adds a unit on the given port, the port is opened by open_all() or device.open().
+
+        Raises:
+            ValueError: If a device with the same name already exists.
+        """
+        name = name or port
+        if name in self.devices:
+            raise ValueError(f"Device '{name}' already exists")
+        device = FmcwDevice(name, port, self)
+        device.protocol.gui_signals.data_received.connect(lambda packet, device=device: self._on_frame(device, packet))
+        device.protocol.gui_signals.response_decoded.connect(
+            lambda code, record, name=name: self.frame_decoded.emit(name, code, record))
+        self.devices[name] = device
+        return device
+
+    def remove_device(self, name: str) -> None:
+        device = self.devices.pop(name)
+        device.shutdown()
+
+    def open_all(self, baudrate: int = DEFAULT_BAUDRATE) -> dict[str, bool]:
+        """Opens every device, returns whether each port could be opened."""
+        return {name: device.open(baudrate) for name, device in self.devices.items()}
+
+    def close_all(self) -> None:
+        for device in self.devices.values():
+            device.close()
+
+    def shutdown(self) -> None:
+        """Closes every device and stops the protocol threads."""
+        for device in self.devices.values():
+            device.shutdown()
+
+    def request_all(self, cmd: Command, data: list[int], priority: int | None = None) -> dict[str, Future]:
+        """Sends the same command to every open device."""
+        return {name: device.request(cmd, data, priority) for name, device in self.devices.items() if device.is_open()}
+
+    def run_script(self, script) -> dict[str, Future]:
+        """Starts a CommandScript on every open device, each completes with its ScriptResult."""
+        return {name: script.start(device.scheduler) for name, device in self.devices.items() if device.is_open()}
+
+    def stats(self) -> dict:
+        """
+        Returns the statistics of every device and the totals of the pool.
+        """
+        devices = {name: device.stats() for name, device in self.devices.items()}
+        totals = {key: sum(stats[key] for stats in devices.values())
+                  for key in ("rx_bytes", "tx_bytes", "frames", "errors", "rx_bytes_per_s", "frames_per_s")}
+        totals["open"] = sum(stats["open"] for stats in devices.values())
+        return {"devices": devices, "total": totals}
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    def __iter__(self):
+        return iter(self.devices.values())
+
+    def __getitem__(self, name: str) -> FmcwDevice:
+        return self.devices[name]
+
+    def _on_frame(self, device: FmcwDevice, packet: bytes) -> None:
+        device.counters.frames += 1
+        self.frame_received.emit(device.name, packet)
+
+
+if __name__ == '__main__':
+    import sys
+    from PySide6.QtCore import QCoreApplication, QTimer
+    from serialbsp.command_script import CommandScript
+
+    # Example: python -m serialbsp.device_pool ../config/acceptance_script.yaml /dev/ttyUSB0 /dev/ttyUSB1
+    app = QCoreApplication(sys.argv)
+    pool = DevicePool()
+    for port in sys.argv[2:]:
+        pool.add_device(port)
+    print(pool.open_all())
+    jobs = pool.run_script(CommandScript.from_yaml(sys.argv[1]))
+
+    def report():
+        if all(job.done() for job in jobs.values()):
+            for name, job in jobs.items():
+                print(f"[{name}]\n{job.result().report()}")
+            print(pool.stats()["total"])
+            pool.shutdown()
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(report)
+    timer.start(100)
+    sys.exit(app.exec())
@@ -0,0 +1,321 @@
+"""
+File descriptor transports: pty, loopback, TCP and capture replay.
+
+They wait on their descriptor with select() and read it with os.read(), which only works on
+POSIX, so serialbsp.transport imports this module when one of their URLs is opened. On Windows
+the app uses the pyserial backend.
+"""
+import fcntl
+import os
+import pty
+import select
+import socket
+import struct
+import termios
+import threading
+import tty
+from abc import ABC, abstractmethod
+from time import monotonic, perf_counter
+from typing import Callable
+
+from serial import SerialException
+
+from serialbsp.capture import read_capture
+from serialbsp.traffic_trace import TX
+
+READ_SIZE = 65536
+
+
+class FdTransport(ABC):
+    """
+    Transport over a non-blocking file descriptor, the base of the pty, loopback and TCP backends.
+
+    read() follows pyserial: it returns after size bytes, after timeout seconds (None blocks,
+    0 does not wait) or when the line is quiet for inter_byte_timeout. Errors are raised as
+    SerialException so the reader handles them like a disconnected adapter.
+    """
+
+    def __init__(self, port: str | None = None, baudrate: int = 0):
+        self.port = port
+        self.baudrate = baudrate  # Not used on the wire, kept for the timeout floor calculation
+        self.timeout = None
+        self.inter_byte_timeout = None
+        self._fd = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._fd is not None
+
+    @abstractmethod
+    def open(self) -> None:
+        """Opens the descriptor and sets _fd."""
+
+    def close(self) -> None:
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            os.close(fd)
+
+    def fileno(self) -> int:
+        if self._fd is None:
+            raise SerialException("Transport is not open")
+        return self._fd
+
+    @property
+    def in_waiting(self) -> int:
+        buffer = fcntl.ioctl(self.fileno(), termios.FIONREAD, b"\0\0\0\0")
+        return struct.unpack("I", buffer)[0]
+
+    def read(self, size: int = 1) -> bytes:
+        fd = self.fileno()
+        data = bytearray()
+        deadline = None if self.timeout is None else monotonic() + self.timeout
+        while len(data) < size:
+            wait = None if deadline is None else max(0.0, deadline - monotonic())
+            if data and self.inter_byte_timeout is not None:
+                wait = self.inter_byte_timeout if wait is None else min(wait, self.inter_byte_timeout)
+            readable, _, _ = select.select([fd], [], [], wait)
+            if not readable:
+                break
+            try:
+                chunk = os.read(fd, size - len(data))
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                raise SerialException(f"Read failed: {e}") from e
+            if not chunk:
+                raise SerialException("Connection closed by peer")
+            data += chunk
+        return bytes(data)
+
+    def read_all(self) -> bytes:
+        waiting = self.in_waiting
+        if not waiting:
+            return b""
+        try:
+            return os.read(self.fileno(), waiting)
+        except BlockingIOError:
+            return b""
+        except OSError as e:
+            raise SerialException(f"Read failed: {e}") from e
+
+    def write(self, data) -> int:
+        fd = self.fileno()
+        view = memoryview(data)
+        written = 0
+        while written < len(view):
+            select.select([], [fd], [])
+            try:
+                written += os.write(fd, view[written:])
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                raise SerialException(f"Write failed: {e}") from e
+        return written
+
+    def flush(self) -> None:
+        pass
+
+    def reset_input_buffer(self) -> None:
+        while self.is_open and self.read_all():
+            pass
+
+    def reset_output_buffer(self) -> None:
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class PtyTransport(FdTransport):
+    """
+    Linux pseudo-terminal pair. The transport owns the master side, device_path names the slave
+    side, which a device simulator (or any program using pyserial) can open like a real port.
+    """
+
+    def __init__(self, port: str | None = None, baudrate: int = 0):
+        super().__init__(port, baudrate)
+        self.device_path = None
+        self._slave_fd = None
+
+    def open(self) -> None:
+        master, slave = pty.openpty()
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        self._fd, self._slave_fd = master, slave
+        self.device_path = os.ttyname(slave)
+
+    def close(self) -> None:
+        super().close()
+        if self._slave_fd is not None:
+            os.close(self._slave_fd)
+            self._slave_fd = None
+
+
+class LoopbackTransport(FdTransport):
+    """
+    In-memory loopback over a socket pair. Without a responder every written byte is echoed
+    back. With a responder, it is called from a helper thread with each chunk the host wrote and
+    its return value (bytes, or None for no answer) is sent back, which makes it an in-process
+    stand-in for the device.
+    """
+
+    def __init__(self, port: str | None = None, baudrate: int = 0, responder: Callable[[bytes], bytes | None] | None = None):
+        super().__init__(port, baudrate)
+        self.responder = responder
+        self._host = None
+        self._peer = None
+        self._peer_thread = None
+
+    def open(self) -> None:
+        self._host, self._peer = socket.socketpair()
+        self._host.setblocking(False)
+        for sock in (self._host, self._peer):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._fd = self._host.fileno()
+        self._peer_thread = threading.Thread(target=self._serve, name="loopback-peer", daemon=True)
+        self._peer_thread.start()
+
+    def close(self) -> None:
+        if self._host is not None:
+            self._fd = None
+            self._peer.shutdown(socket.SHUT_RDWR)
+            self._host.close()
+            self._peer_thread.join()
+            self._peer.close()
+            self._host = self._peer = None
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                data = self._peer.recv(READ_SIZE)
+            except OSError:
+                return
+            if not data:
+                return
+            reply = data if self.responder is None else self.responder(data)
+            if reply:
+                try:
+                    self._peer.sendall(reply)
+                except OSError:
+                    return
+
+
+class TcpTransport(FdTransport):
+    """
+    TCP client, for serial servers (ser2net, RS485 gateways) or a remote device simulator.
+    The port is given as "host:port".
+    """
+
+    def __init__(self, port: str | None = None, baudrate: int = 0, connect_timeout: float = 5.0):
+        super().__init__(port, baudrate)
+        self.connect_timeout = connect_timeout
+        self._socket = None
+
+    def open(self) -> None:
+        host, _, port = (self.port or "").rpartition(":")
+        if not host or not port.isdigit():
+            raise SerialException(f"Invalid TCP address '{self.port}', expected host:port")
+        try:
+            self._socket = socket.create_connection((host, int(port)), self.connect_timeout)
+        except OSError as e:
+            raise SerialException(f"Could not connect to {self.port}: {e}") from e
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.setblocking(False)
+        self._fd = self._socket.fileno()
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._fd = None
+            self._socket.close()
+            self._socket = None
+
+
+class ReplayTransport(FdTransport):
+    """
+    Plays the received data of a capture file (see serialbsp.capture) back to the host.
+
+    The Rx chunks are sent from a helper thread at their captured times divided by speed, or
+    back-to-back when speed is None. Data written by the host is read and discarded. Captured
+    Tx chunks are passed to on_tx in order, before the Rx chunks that followed them, so a
+    replay tool can re-issue the original requests. finished is set after the last chunk.
+    """
+
+    def __init__(self, path: str, baudrate: int = 0, speed: float | None = 1.0,
+                 on_tx: Callable[[bytes], None] | None = None):
+        super().__init__(path, baudrate)
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None for as fast as possible")
+        self.path = path
+        self.speed = speed
+        self.on_tx = on_tx
+        self.rx_bytes = 0
+        self.finished = threading.Event()
+        self._host = None
+        self._peer = None
+        self._peer_thread = None
+        self._stop = threading.Event()
+
+    def open(self) -> None:
+        try:
+            chunks = read_capture(self.path)
+        except (OSError, ValueError) as e:
+            raise SerialException(f"Could not open capture {self.path}: {e}") from e
+        self._host, self._peer = socket.socketpair()
+        self._host.setblocking(False)
+        for sock in (self._host, self._peer):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._fd = self._host.fileno()
+        self._stop.clear()
+        self.finished.clear()
+        self._peer_thread = threading.Thread(target=self._play, args=(chunks,), name="capture-replay", daemon=True)
+        self._peer_thread.start()
+
+    def close(self) -> None:
+        if self._host is not None:
+            self._stop.set()
+            self._fd = None
+            self._peer.shutdown(socket.SHUT_RDWR)
+            self._host.close()
+            self._peer_thread.join()
+            self._peer.close()
+            self._host = self._peer = None
+
+    def _wait_until(self, due: float | None) -> bool:
+        """Discards host writes until due (perf_counter time, None for ever), returns False once closed."""
+        while not self._stop.is_set():
+            wait = None if due is None else due - perf_counter()
+            readable, _, _ = select.select([self._peer], [], [], None if wait is None else max(0.0, wait))
+            if readable:
+                try:
+                    if not self._peer.recv(READ_SIZE):
+                        return False
+                except OSError:
+                    return False
+            elif wait is not None and wait <= 0:
+                return True
+        return False
+
+    def _play(self, chunks) -> None:
+        started = perf_counter()
+        try:
+            for chunk in chunks:
+                if chunk.direction == TX:
+                    if self.on_tx is not None:
+                        self.on_tx(chunk.data)
+                    continue
+                due = started + chunk.time / self.speed if self.speed is not None else 0.0
+                if not self._wait_until(due):
+                    return
+                self._peer.sendall(chunk.data)
+                self.rx_bytes += len(chunk.data)
+        except OSError:
+            return
+        finally:
+            self.finished.set()
+        self._wait_until(None)  # Keep discarding host writes until the transport is closed
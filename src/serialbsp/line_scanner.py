@@ -0,0 +1,52 @@
+CR = 0x0D
+LF = 0x0A
+
+
+class LineScanner:
+    """
+    Incremental finder for ``\\r``, ``\\n`` or ``\\r\\n`` terminated lines in a receive buffer.
+
+    The scanner remembers how far the buffer has already been searched, so each call only looks
+    at bytes that arrived since the previous call instead of decoding and searching the whole
+    buffer again. The buffer owner must report every byte it removes from the front with
+    consumed() (or call reset() when it clears the buffer) to keep the offset aligned.
+    """
+
+    def __init__(self):
+        self.scan_offset = 0
+
+    def find_line_end(self, buffer) -> int:
+        """
+        Looks for the end of the first line in the buffer.
+
+        Args:
+            buffer (RingBuffer | bytearray): The buffer to search, it must provide find() and len().
+
+        Returns:
+            int: The length of the first line including its delimiter, or -1 if no delimiter
+            has been received yet.
+        """
+        start = self.scan_offset
+        end = buffer.find(b"\r", start)
+        if end == -1:
+            end = buffer.find(b"\n", start)
+        else:
+            lf = buffer.find(b"\n", start, end)
+            if lf != -1:
+                end = lf
+        if end == -1:
+            self.scan_offset = len(buffer)
+            return -1
+
+        line_length = end + 1
+        if buffer[end] == CR and line_length < len(buffer) and buffer[line_length] == LF:
+            line_length += 1
+        return line_length
+
+    def consumed(self, count: int) -> None:
+        """Shifts the scan offset after count bytes were removed from the front of the buffer."""
+        self.scan_offset = self.scan_offset - count if self.scan_offset > count else 0
+
+    def reset(self) -> None:
+        """Restarts scanning at the front of the buffer."""
+        self.scan_offset = 0
@@ -0,0 +1,177 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from serialbsp.rtt_stats import BUCKET_EDGES_MS
+
+# Histograms kept by LinkMetrics
+READ_LATENCY = "read_latency"  # first byte of a chunk on the line until it is delivered
+WRITE_LATENCY = "write_latency"  # send_data() until the frame is written
+RESPONSE_LATENCY = "response_latency"  # request sent until its response is extracted
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram. Only counts are kept, so recording is O(log buckets)
+    and the memory use does not grow with the number of samples.
+    """
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, latency_ms: float) -> None:
+        self.counts[bisect_left(BUCKET_EDGES_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def percentile(self, percent: float) -> float | None:
+        """Returns the upper edge of the bucket holding the percentile, None without samples."""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKET_EDGES_MS[index] if index < len(BUCKET_EDGES_MS) else self.max_ms
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip([f"<={edge}" for edge in BUCKET_EDGES_MS] + [f">{BUCKET_EDGES_MS[-1]}"], self.counts)),
+        }
+
+
+class LinkMetrics:
+    """
+    Throughput and error counters of one serial link.
+
+    One instance is shared by the SerialManager (bytes, chunks, empty reads, read and write
+    latency) and the SerialProtocolFmcw (frames per command code, CRC failures, resyncs,
+    timeouts, response latency). Recording is a few integer updates under a lock, so the
+    metrics stay on in normal operation. Read them with snapshot() or write them to a file with
+    dump().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.monotonic()
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.chunks_in = 0
+            self.writes = 0
+            self.empty_reads = 0
+            self.frames = Counter()  # Response frames per command code
+            self.unsolicited = 0
+            self.crc_failures = 0
+            self.command_mismatches = 0
+            self.resyncs = 0
+            self.resync_bytes = 0
+            self.timeouts = Counter()  # Timeouts per command code
+            self.buffer_overflows = 0
+            self.histograms = {name: LatencyHistogram() for name in (READ_LATENCY, WRITE_LATENCY, RESPONSE_LATENCY)}
+
+    def record_read(self, size: int, latency: float) -> None:
+        """Counts a received chunk, latency in seconds. A size of 0 counts an empty read."""
+        with self._lock:
+            if not size:
+                self.empty_reads += 1
+                return
+            self.chunks_in += 1
+            self.bytes_in += size
+            self.histograms[READ_LATENCY].add(latency * 1000)
+
+    def record_write(self, size: int, latencies: list[float]) -> None:
+        """Counts a write to the port and the queueing latency of each frame in it, in seconds."""
+        with self._lock:
+            self.writes += 1
+            self.bytes_out += size
+            histogram = self.histograms[WRITE_LATENCY]
+            for latency in latencies:
+                histogram.add(latency * 1000)
+
+    def record_frame(self, code: int, latency: float | None = None) -> None:
+        """Counts a response frame, latency in seconds since its request was sent."""
+        with self._lock:
+            self.frames[code] += 1
+            if latency is not None:
+                self.histograms[RESPONSE_LATENCY].add(latency * 1000)
+
+    def record_unsolicited(self) -> None:
+        with self._lock:
+            self.unsolicited += 1
+
+    def record_mismatch(self, crc_failed: bool) -> None:
+        """Counts a rejected frame, a failed CRC or an unexpected command code."""
+        with self._lock:
+            if crc_failed:
+                self.crc_failures += 1
+            else:
+                self.command_mismatches += 1
+
+    def record_resync(self, skipped: int, new_event: bool = True) -> None:
+        """Adds skipped bytes, new_event is False for further skips while recovering from the same corruption."""
+        with self._lock:
+            if new_event:
+                self.resyncs += 1
+            self.resync_bytes += skipped
+
+    def record_timeout(self, code: int) -> None:
+        with self._lock:
+            self.timeouts[code] += 1
+
+    def record_overflow(self) -> None:
+        with self._lock:
+            self.buffer_overflows += 1
+
+    def snapshot(self) -> dict:
+        """Returns all counters, the rates since the last reset and the latency histograms."""
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            frames = sum(self.frames.values())
+            return {
+                "elapsed_s": round(elapsed, 3),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_in_per_s": round(self.bytes_in / elapsed, 1) if elapsed > 0 else 0.0,
+                "bytes_out_per_s": round(self.bytes_out / elapsed, 1) if elapsed > 0 else 0.0,
+                "chunks_in": self.chunks_in,
+                "writes": self.writes,
+                "empty_reads": self.empty_reads,
+                "frames": frames,
+                "frames_per_s": round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+                "frames_by_code": {f"0x{code:02X}": count for code, count in sorted(self.frames.items())},
+                "unsolicited": self.unsolicited,
+                "crc_failures": self.crc_failures,
+                "command_mismatches": self.command_mismatches,
+                "resyncs": self.resyncs,
+                "resync_bytes": self.resync_bytes,
+                "timeouts": sum(self.timeouts.values()),
+                "timeouts_by_code": {f"0x{code:02X}": count for code, count in sorted(self.timeouts.items())},
+                "buffer_overflows": self.buffer_overflows,
+                "latency": {name: histogram.as_dict() for name, histogram in self.histograms.items()},
+            }
+
+    def dump(self, path: str) -> None:
+        """Writes a snapshot as JSON, with the wall clock time it was taken."""
+        snapshot = self.snapshot()
+        snapshot["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(path, 'w') as file:
+            json.dump(snapshot, file, indent=2)
@@ -0,0 +1,170 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+from serial.tools import list_ports
+
+POLL_INTERVAL = 2.0  # seconds between snapshots where inotify is not available
+SETTLE_DELAY = 0.3  # seconds to wait after a /dev event, udev creates the node before sysfs is complete
+STOP_CHECK_INTERVAL = 0.5  # seconds, how often an idle watcher checks the stop flag
+DEV_PATH = b"/dev"
+
+# inotify(7)
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+@dataclass(frozen=True)
+class PortInfo:
+    device: str
+    description: str
+    vid: str | None  # 4 hex digits, e.g. "2047"
+    pid: str | None
+
+
+def scan_ports(vid: str | None = None, pid: str | None = None) -> dict[str, PortInfo]:
+    """
+    Lists the serial ports, optionally only those with the given USB VID and PID.
+
+    Returns:
+        dict[str, PortInfo]: The ports by device name.
+    """
+    ports = {}
+    for port in list_ports.comports():
+        port_vid = f"{port.vid:04X}" if port.vid else None
+        port_pid = f"{port.pid:04X}" if port.pid else None
+        if vid is not None and port_vid != vid:
+            continue
+        if pid is not None and port_pid != pid:
+            continue
+        ports[port.device] = PortInfo(port.device, port.description, port_vid, port_pid)
+    return ports
+
+
+def _open_dev_watch() -> int | None:
+    """Returns an inotify descriptor watching device nodes in /dev, None where not supported."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, DEV_PATH, IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def _tty_event(buffer: bytes) -> bool:
+    """Returns True if the inotify events in buffer concern a tty node."""
+    offset = 0
+    while offset + INOTIFY_EVENT.size <= len(buffer):
+        _wd, _mask, _cookie, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+        name = buffer[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length]
+        if name.startswith(b"tty") or name.startswith(b"rfcomm"):
+            return True
+        offset += INOTIFY_EVENT.size + length
+    return False
+
+
+class PortMonitor(QObject):
+    """
+    Watches for serial ports being plugged in and removed.
+
+    The ports are enumerated in a background thread: on Linux only when inotify reports a tty
+    node appearing in or leaving /dev, elsewhere by comparing a snapshot every POLL_INTERVAL.
+    The GUI thread only receives port_added and port_removed for ports matching the VID/PID
+    filter, list_ports.comports() never runs there.
+
+    Create the monitor in the GUI thread, its signals are emitted in the thread it lives in.
+    """
+    port_added = Signal(object)  # PortInfo
+    port_removed = Signal(str)  # device name
+    _snapshot_changed = Signal(object)
+
+    def __init__(self, vid: str | None = None, pid: str | None = None, poll_interval: float = POLL_INTERVAL, parent=None):
+        """
+        Initialize the monitor.
+
+        Args:
+            vid (str | None): Only report ports with this USB vendor id ("2047"), None for all.
+            pid (str | None): Only report ports with this USB product id, None for all.
+            poll_interval (float): Seconds between snapshots when inotify is not available.
+            parent (QObject | None): Parent object.
+        """
+        super().__init__(parent)
+        self.vid = vid
+        self.pid = pid
+        self.poll_interval = poll_interval
+        self.ports: dict[str, PortInfo] = {}  # Ports reported so far
+        self.rescans = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._snapshot_changed.connect(self._apply_snapshot, Qt.QueuedConnection)
+
+    def start(self) -> None:
+        """Starts watching, the ports present now are reported as added."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="port-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self) -> None:
+        fd = _open_dev_watch()
+        snapshot = None
+        try:
+            while not self._stop.is_set():
+                current = scan_ports(self.vid, self.pid)
+                self.rescans += 1
+                if current != snapshot:
+                    snapshot = current
+                    self._snapshot_changed.emit(current)
+                if fd is None:
+                    self._stop.wait(self.poll_interval)
+                    continue
+                changed = False
+                while not changed and not self._stop.is_set():
+                    readable, _, _ = select.select([fd], [], [], STOP_CHECK_INTERVAL)
+                    if readable:
+                        changed = _tty_event(os.read(fd, 4096))
+                # Let udev finish the node and sysfs, and merge the events of a multi-port adapter
+                self._stop.wait(SETTLE_DELAY)
+                try:
+                    while os.read(fd, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    @Slot(object)
+    def _apply_snapshot(self, current: dict) -> None:
+        removed = [device for device in self.ports if device not in current]
+        added = [info for device, info in current.items() if device not in self.ports]
+        self.ports = dict(current)
+        for device in removed:
+            self.port_removed.emit(device)
+        for info in added:
+            self.port_added.emit(info)
@@ -1,39 +1,124 @@
+import asyncio
+import math
+import threading
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+
 from PySide6.QtCore import QObject, Signal, Slot, QByteArray, QTimer
-from serialbsp.crc8 import calculate_crc, check_crc
+from serialbsp.crc8 import crc8
 from serialbsp.commands import *
-from time import time, sleep
+from serialbsp.ring_buffer import RingBuffer
+from serialbsp.rtt_stats import RttStats
+from serialbsp.line_scanner import LineScanner
+from serialbsp.link_metrics import LinkMetrics
+from serialbsp.traffic_trace import RX, TX, TrafficTrace, format_hex, traffic_trace
+from time import monotonic
 
 MINIMUM_PACKET_SIZE = 3  # Minimum packet size (cmd, length, checksum)
 MAXIMUM_PACKET_SIZE = 1024  # Maximum packet size
+DEFAULT_BAUDRATE = 9600  # Same default as SerialManager.open_serial_port()
+RECEIVE_BUFFER_SIZE = 16 * MAXIMUM_PACKET_SIZE  # Capacity of the receive ring buffer
+PIPELINE_DEPTH = 4  # Requests a sender keeps in flight at once, responses are matched per command code
+
+
+@dataclass
+class PendingRequest:
+    """
+    A command that was sent and is still waiting for its response.
+
+    The device answers in send order, so a request only starts waiting once the responses
+    ahead of it are in. Its deadline and RTT count from then, see start().
+    """
+    command: Command
+    sent_at: float  # monotonic() timestamp when the command was encoded
+    timeout: float  # Response timeout in seconds
+    started_at: float | None = None  # monotonic() timestamp when it reached the head of the queue
+    deadline: float = math.inf  # monotonic() timestamp after which the request times out
+    future: Future = field(default_factory=Future)  # Completed with the response frame
+
+    def start(self, now: float) -> None:
+        """Starts the timeout of the request, called when it reaches the head of the queue."""
+        self.started_at = now
+        self.deadline = now + self.timeout
+
+
+def _resolve_future(future: Future, result=None, exception: BaseException | None = None) -> None:
+    """
+    Completes a future unless the caller cancelled it. The check and the completion are not
+    atomic, a cancel() from another thread in between is ignored.
+    """
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass  # Cancelled by the caller
 
 
 class SerialProtocolFmcw(QObject):
     """
     Handles encoding/decoding of serial communication for the FMCW system.
+
+    Several commands can be in flight at the same time. Every sent command with a response
+    is queued in a pending-request table keyed by command code, with a FIFO per code for
+    repeated commands. A received frame is matched to the oldest pending request with the
+    same code, and the request's response size tells how many bytes belong to it. The
+    response timeout and RTT of a request start when the responses sent before it are in,
+    so pipelined requests are not timed out for waiting behind each other.
+
+    request() returns a concurrent.futures.Future for the response, and request_async() can be
+    awaited from asyncio code. Both may be called from any thread. Headless tools that run
+    without a Qt event loop connect SerialManager.data_received with Qt.DirectConnection, so
+    frames are extracted in the reader thread, and bound their waits with future.result(timeout):
+    the response timeouts are run by a QTimer in the protocol's thread, which is only re-armed
+    through a queued signal and so never fires without an event loop.
+
+    The GUI runs the protocol in its own thread through ProtocolWorker. Receivers that touch
+    widgets connect to the signals of gui_signals, which re-emits them in the GUI thread.
     """
     data_received = Signal(bytes)  # Signal for processed data received
+    response_decoded = Signal(int, object)  # Command code and schema record of a decoded response
     command_encoded = Signal(QByteArray)  # Signal for encoded command to send
     log_message = Signal(str)  # Signal for log messages
     error_occurred = Signal(str)  # Signal for errors
+    _timeout_timer_restart_requested = Signal()  # Re-arms the timeout timer in the protocol's thread
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, metrics: LinkMetrics | None = None, trace: TrafficTrace | None = None):
         super().__init__(parent)
-        self.receive_buffer = bytearray()
-        self._expected_response_cmd = None
-        self._expected_packet_length = None
+        self.trace = trace if trace is not None else traffic_trace  # Pass a trace of its own when several connections run in one process
+        self.receive_buffer = RingBuffer(RECEIVE_BUFFER_SIZE)
+        self._line_scanner = LineScanner()  # Remembers how far unsolicited text has been scanned
+        self._pending_requests: dict[int, deque[PendingRequest]] = {}
+        self._request_order: deque[PendingRequest] = deque()  # All pending requests in send order
         self._pending_response = None # Store the pending response from the last command
+        self._lock = threading.RLock()  # Guards the receive buffer and the pending requests
+        self._data_available = threading.Condition(self._lock)
 
         # Timer for packet receive timeout
-        self.packet_rx_timeout_timer = QTimer()
+        self.packet_rx_timeout_timer = QTimer(self)  # Child, so it moves with the protocol's thread
         self.packet_rx_timeout_timer.setSingleShot(True)
         self.packet_rx_timeout_timer.timeout.connect(self._handle_packet_timeout)
-        self.packet_timeout = 4000  # milliseconds
+        self.packet_timeout = 4000  # milliseconds, used until a command has enough RTT samples
+        self.adaptive_timeouts = True  # Derive each command's timeout from its measured RTT
+        self.baudrate = DEFAULT_BAUDRATE  # Link speed, used for the size-based timeout floor
+        self.rtt_stats = RttStats()
+        self.metrics = metrics or LinkMetrics()  # Pass the SerialManager's metrics to count the whole link in one place
+        self.resync_on_mismatch = True  # Skip to the next valid frame instead of resetting the buffer
+        self.resync_count = 0  # Number of corrupted frames recovered by resynchronization
+        self.resync_skipped_bytes = 0  # Total bytes discarded while resynchronizing
+        self._resyncing = False  # Skipping a corrupted frame, set until the next frame validates
+        self._timeout_timer_restart_requested.connect(self._restart_timeout_timer)
 
         # Timer Used for debugging purposes to log the command and byte count
-        self.dbg_logging_timer = QTimer()
+        self.dbg_logging_timer = QTimer(self)
         self.dbg_logging_timer.setSingleShot(True)
         self.dbg_logging_timer.timeout.connect(self._log_command_and_byte_count)
         self.logging_timeout = 5000 # milliseconds
+
+        # Object whose signals GUI code connects to, replaced by ProtocolWorker when threaded
+        self.gui_signals = self
         
     def read_packet(self, expected_size: int, timeout: float = 4.0) -> bytes:
         """
@@ -49,35 +134,77 @@ class SerialProtocolFmcw(QObject):
         Raises:
             TimeoutError: If the expected number of bytes is not received within the timeout.
         """
-        start_time = time()
-        while len(self.receive_buffer) < expected_size:
-            print( len(self.receive_buffer), expected_size, time() - start_time, timeout)
-            if time() - start_time > timeout:
+        with self._data_available:
+            if not self._data_available.wait_for(lambda: len(self.receive_buffer) >= expected_size, timeout):
                 raise TimeoutError(f"Timeout waiting for {expected_size} bytes. Received {len(self.receive_buffer)} bytes.")
-            sleep(1)
-        packet = bytes(self.receive_buffer[:expected_size])
-        del self.receive_buffer[:expected_size]
+            packet = bytes(self.receive_buffer.view(0, expected_size))
+            self._consume_receive_buffer(expected_size)
         return packet
     
     def encode_command(self, cmd: Command, data: list[int]) -> None:
         """
         Encodes a command and its data into a byte array with checksum.
+        Commands with a response are added to the pending-request table, so several
+        commands can be sent back-to-back without waiting for each response.
 
         Args:
         cmd: The command byte.
         data: A list of data bytes.
         """
-        self._expected_response_cmd = cmd.code
-        self._expected_packet_length = cmd.response_size   
+        self.request(cmd, data)
+        
+        #self.dbg_logging_timer.start(self.logging_timeout)
+
+    def request(self, cmd: Command, data: list[int], timeout_ms: int | None = None) -> Future:
+        """
+        Sends a command and returns a future for its response.
+
+        Args:
+            cmd (Command): The command to send.
+            data (list[int]): The data bytes of the command.
+            timeout_ms (int | None): Response timeout, defaults to response_timeout(cmd).
+
+        Returns:
+            Future[bytes]: Completes with the response frame as soon as it is extracted, or fails
+            with TimeoutError when the timeout expires. The timeout starts once the responses
+            to the requests sent before this one are in. Commands without a response complete
+            with b"" once they are sent.
+        """
+        future = Future()
+        if cmd.response_size > 0:
+            if timeout_ms is None:
+                timeout_ms = self.response_timeout(cmd, len(data) + 2)
+            pending = PendingRequest(cmd, monotonic(), timeout_ms / 1000, future=future)
+            with self._lock:
+                self._pending_requests.setdefault(cmd.code, deque()).append(pending)
+                self._request_order.append(pending)
+                if len(self._request_order) == 1:
+                    pending.start(pending.sent_at)
 
         packet = [cmd.code] + data
-        checksum = calculate_crc(packet + [0])
+        checksum = crc8(bytes(packet))
         packet.append(checksum)
-        encoded_data = QByteArray(bytearray(packet))
+        packet = bytes(packet)
+        self.trace.record(TX, packet)
+        encoded_data = QByteArray(packet)
         self.command_encoded.emit(encoded_data)   
-        self.packet_rx_timeout_timer.start(self.packet_timeout)
-        
-        #self.dbg_logging_timer.start(self.logging_timeout)
+        self._timeout_timer_restart_requested.emit()
+
+        if cmd.response_size <= 0:
+            _resolve_future(future, b"")
+        return future
+
+    async def request_async(self, cmd: Command, data: list[int], timeout_ms: int | None = None) -> bytes:
+        """
+        Awaitable variant of request().
+
+        Returns:
+            bytes: The response frame.
+
+        Raises:
+            TimeoutError: If no response is received within the timeout.
+        """
+        return await asyncio.wrap_future(self.request(cmd, data, timeout_ms))
 
     @Slot(bytes)
     def handle_raw_data(self, raw_data: bytes) -> None:
@@ -85,18 +212,90 @@ class SerialProtocolFmcw(QObject):
         Handles raw data received from the serial port.
         This method is connected to the SerialManager's data_received signal.
         """
-        self.receive_buffer.extend(raw_data)
-        #print("\nBuffer:\n", " ".join(f"0x{byte:02X}" for byte in self.receive_buffer))
+        with self._data_available:
+            try:
+                self.receive_buffer.extend(raw_data)
+            except BufferError:
+                self.metrics.record_overflow()
+                self.log_message.emit("Receive buffer overflow, clearing buffer.")
+                self._clear_receive_buffer()
+                self.receive_buffer.extend(raw_data[-self.receive_buffer.capacity:])
+            #print("\nBuffer:\n", format_hex(self.receive_buffer.view()))
+
+            self._try_extract_packets()
+            self._data_available.notify_all()
+
+    def response_timeout(self, cmd: Command, request_size: int = 0) -> int:
+        """
+        Returns the response timeout for a command in milliseconds.
+
+        With adaptive_timeouts the value comes from the measured round-trip times of the command,
+        see RttStats.timeout_for(), otherwise it is packet_timeout.
 
-        self._try_extract_packets()
+        Args:
+            cmd (Command): The command to send.
+            request_size (int): Size of the encoded request in bytes.
+        """
+        if not self.adaptive_timeouts:
+            return self.packet_timeout
+        return self.rtt_stats.timeout_for(cmd, self.baudrate, self.packet_timeout, request_size)
+
+    def rtt_report(self) -> str:
+        """
+        Returns the round-trip statistics of all commands as a table, slowest first.
+        """
+        return self.rtt_stats.report({command.code: command.name for command in COMMANDS})
+
+    def pending_request_count(self) -> int:
+        """
+        Returns the number of commands still waiting for a response.
+        """
+        with self._lock:
+            return sum(len(requests) for requests in self._pending_requests.values())
 
     def _is_answer_to_command(self) -> bool:
         """
-        Checks if the first byte of the receive buffer matches the expected response command.
+        Checks if the first byte of the receive buffer matches a pending request.
+        """
+        return bool(self.receive_buffer) and self.receive_buffer[0] in self._pending_requests
+
+    def _complete_request(self, code: int) -> PendingRequest:
+        """
+        Removes the oldest pending request for the command code and returns it.
+        """
+        requests = self._pending_requests[code]
+        request = requests.popleft()
+        if not requests:
+            del self._pending_requests[code]
+        self._remove_from_order(request, monotonic())
+        # Called from the thread feeding handle_raw_data, the timer is re-armed in the protocol's thread
+        self._timeout_timer_restart_requested.emit()
+        return request
+
+    def _remove_from_order(self, request: PendingRequest, now: float) -> None:
+        """
+        Removes a completed request from the send order and starts the timeout of the next one.
+        """
+        if self._request_order and self._request_order[0] is request:
+            self._request_order.popleft()
+        else:
+            self._request_order.remove(request)  # Answered out of order
+            if request.started_at is None:
+                request.start(now)
+        if self._request_order and self._request_order[0].started_at is None:
+            self._request_order[0].start(now)
+
+    @Slot()
+    def _restart_timeout_timer(self) -> None:
+        """
+        Arms the receive timeout timer for the earliest pending deadline.
         """
-        if self._expected_response_cmd is not None and self.receive_buffer and self.receive_buffer[0] == self._expected_response_cmd:
-            return True
-        return False
+        with self._lock:
+            if not self._pending_requests:
+                self.packet_rx_timeout_timer.stop()
+                return
+            deadline = min(requests[0].deadline for requests in self._pending_requests.values())
+        self.packet_rx_timeout_timer.start(max(0, int((deadline - monotonic()) * 1000) + 1))
 
     def _try_extract_packets(self) -> None: 
         while True:
@@ -104,105 +303,192 @@ class SerialProtocolFmcw(QObject):
                 # Try to extract the expected response
                 packet, consumed = self._extract_expected_packet()
                 if packet:
-                    self.log_message.emit(f"Rx: {' '.join(f'0x{byte:02X}' for byte in packet)}\n")
+                    packet = bytes(packet) # The packet outlives the receive buffer
+                    request = self._complete_request(packet[0])
+                    rtt = monotonic() - request.started_at
+                    self.rtt_stats.record(request.command.code, rtt * 1000)
+                    self.metrics.record_frame(request.command.code, rtt)
+                    _resolve_future(request.future, packet)
+                    self.trace.record(RX, packet)
+                    log_line = self.trace.log_line(RX, packet)
+                    if log_line:
+                        self.log_message.emit(log_line + "\n")
                     self._pending_response = packet # Store the response
                     self.data_received.emit(packet) # Still emit for potential further processing
+                    self._emit_decoded_response(request.command, packet)
                     if consumed > 0:
-                        del self.receive_buffer[:consumed]
+                        self._consume_receive_buffer(consumed)
                     continue # Try to extract more packets
+                elif consumed > 0:
+                    self._consume_receive_buffer(consumed) # Drop corrupted bytes and retry
+                    continue
                 else:
                     break # Need more data for the expected response
             else:
                 # Try to extract an unsolicited message
                 unsolicited_packet, consumed = self._extract_unsolicited_packet()
                 if unsolicited_packet:
+                    self.metrics.record_unsolicited()
                     try:
-                        decoded_message = unsolicited_packet.decode('utf-8', errors='ignore').strip()
+                        decoded_message = str(unsolicited_packet, 'utf-8', errors='ignore').strip()
                         if decoded_message:
                             self.log_message.emit(f"{decoded_message}")
                             #self.data_received.emit(unsolicited_packet) # Emit unsolicited data as well
                     except UnicodeDecodeError:
-                        self.log_message.emit(f"FMCW (bytes): {' '.join(f'0x{byte:02X}' for byte in unsolicited_packet)}")
+                        self.log_message.emit(f"FMCW (bytes): {format_hex(unsolicited_packet)}")
                         #self.data_received.emit(unsolicited_packet)
                     if consumed > 0:
-                        del self.receive_buffer[:consumed]
+                        self._consume_receive_buffer(consumed)
                     continue # Try to extract more packets
                 else:
                     break # No more complete packets in the buffer
                 break # If neither expected nor unsolicited could be extracted
 
-    def _extract_expected_packet(self) -> tuple[bytes | None, int]:
+    def _emit_decoded_response(self, command: Command, packet: bytes) -> None:
+        """
+        Decodes a response with the command's schema and emits the record.
+        """
+        if command.schema is None:
+            return
+        try:
+            record = command.decode(packet)
+        except Exception as e:
+            self.error_occurred.emit(f"Failed to decode {command.name}: {e}")
+            return
+        self.response_decoded.emit(command.code, record)
+
+    def _extract_expected_packet(self) -> tuple[memoryview | None, int]:
         """
         Attempts to extract the expected response packet from the buffer.
-        Returns the packet and the number of bytes consumed from the buffer.
+        Returns a view of the packet and the number of bytes consumed from the buffer.
+        The view is only valid until the next data is appended to the buffer.
         """
-        if self._expected_response_cmd is None or self._expected_packet_length is None:
+        if not self._is_answer_to_command():
             return None, 0
 
         if len(self.receive_buffer) < MINIMUM_PACKET_SIZE:
             return None, 0
 
+        expected_cmd = self.receive_buffer[0]
+        expected_packet_length = self._pending_requests[expected_cmd][0].command.response_size
+
         # Ensure the buffer has enough data for the expected packet length
-        if len(self.receive_buffer) >= self._expected_packet_length:
-            packet = bytes(self.receive_buffer[:self._expected_packet_length])
+        if len(self.receive_buffer) >= expected_packet_length:
+            packet = self.receive_buffer.view(0, expected_packet_length)
             if not packet:  # Check if the packet is empty
                 return None, 0 
                       
             received_cmd = packet[0]
             if len(packet) >= MINIMUM_PACKET_SIZE:
                 received_checksum = packet[-1]
-                calculated_checksum = calculate_crc(list(packet[:-1]) + [0])
-                if received_checksum == calculated_checksum and received_cmd == self._expected_response_cmd:
-                    self.packet_rx_timeout_timer.stop()
-                    return packet, self._expected_packet_length
+                calculated_checksum = crc8(packet, 0, len(packet) - 1)
+                if received_checksum == calculated_checksum and received_cmd == expected_cmd:
+                    self._resyncing = False
+                    return packet, expected_packet_length
                 else:
-                    self.log_message.emit(f"Checksum or Command mismatch for expected response. Received: 0x{received_checksum:02X}, Expected: 0x{calculated_checksum:02X}, Received CMD: 0x{received_cmd:02X}, Expected CMD: 0x{self._expected_response_cmd:02X}")
+                    if not self._resyncing:  # A false candidate inside the corrupted frame is not another frame
+                        self.metrics.record_mismatch(received_checksum != calculated_checksum)
+                    self.log_message.emit(f"Checksum or Command mismatch for expected response. Received: 0x{received_checksum:02X}, Expected: 0x{calculated_checksum:02X}, Received CMD: 0x{received_cmd:02X}, Expected CMD: 0x{expected_cmd:02X}")
+                    if self.resync_on_mismatch:
+                        return None, self._resync_receive_buffer() # Skip to the next candidate frame
                     self._reset_receive_buffer()
                     return None, 1 # Consume at least one byte to avoid getting stuck
             else:
                 return None, 1 # Consume at least one byte
         return None, 0 # Not enough data for the expected length
 
-    def _reset_receive_buffer(self) -> None:
+    def _consume_receive_buffer(self, count: int) -> None:
+        """
+        Drops count bytes from the front of the receive buffer.
+        """
+        self.receive_buffer.consume(count)
+        self._line_scanner.consumed(count)
+
+    def _clear_receive_buffer(self) -> None:
         """
-        Resets the receive buffer and clears any expected response.
+        Drops all bytes from the receive buffer.
         """
         self.receive_buffer.clear()
-        self._expected_response_cmd = None
-        self._expected_packet_length = None
+        self._line_scanner.reset()
+        self._resyncing = False
+
+    def _find_resync_offset(self) -> int:
+        """
+        Finds the next offset after the corrupted frame at the front of the buffer where a frame
+        for a pending command can start. A candidate is accepted when its command code matches a
+        pending request and, once its full length is buffered, its CRC validates.
+
+        Returns:
+            int: The offset of the next candidate frame, or the buffer length if there is none.
+        """
+        buffer = self.receive_buffer
+        offset = 1
+        while True:
+            candidates = [buffer.find(code, offset) for code in self._pending_requests]
+            candidates = [index for index in candidates if index != -1]
+            if not candidates:
+                return len(buffer)
+            offset = min(candidates)
+            frame_length = self._pending_requests[buffer[offset]][0].command.response_size
+            if offset + frame_length > len(buffer):
+                return offset # Not complete yet, the next call validates it
+            if crc8(buffer.view(offset, offset + frame_length - 1)) == buffer[offset + frame_length - 1]:
+                return offset
+            offset += 1
+
+    def _resync_receive_buffer(self) -> int:
+        """
+        Counts the corrupted bytes at the front of the receive buffer up to the next candidate
+        frame. Pending requests are kept, so the response that follows the corrupted bytes is
+        still matched without waiting for the command timeout. A candidate that turns out to be
+        part of the corrupted frame is skipped as part of the same resync, so resync_count counts
+        corruption events rather than skips.
+
+        Returns:
+            int: The number of bytes the caller has to drop.
+        """
+        skipped = self._find_resync_offset()
+        if not self._resyncing:
+            self.resync_count += 1
+        self.resync_skipped_bytes += skipped
+        self.metrics.record_resync(skipped, new_event=not self._resyncing)
+        self._resyncing = True
+        self.log_message.emit(f"Resynchronized receive buffer, skipped {skipped} bytes.")
+        return skipped
+
+    def _reset_receive_buffer(self) -> None:
+        """
+        Resets the receive buffer and clears all pending requests.
+        """
+        self._clear_receive_buffer()
+        for requests in self._pending_requests.values():
+            for request in requests:
+                _resolve_future(request.future, exception=ConnectionResetError(
+                    f"Receive buffer reset while waiting for CMD: 0x{request.command.code:02X}"))
+        self._pending_requests.clear()
+        self._request_order.clear()
         self._pending_response = None
-        self.packet_rx_timeout_timer.stop()  
+        self._timeout_timer_restart_requested.emit()  # Stops the timer, nothing is pending
 
-    def _extract_unsolicited_packet(self) -> tuple[bytes | None, int]:
+    def _extract_unsolicited_packet(self) -> tuple[memoryview | None, int]:
         """
         Attempts to extract an unsolicited string message from the buffer.
-        Looks for valid UTF-8 encoded substrings delimited by a newline.
+        Looks for a line delimited by \r\n, \n or \r. Only bytes received since the
+        previous call are searched, the caller decodes just the extracted line.
         Returns the packet and the number of bytes consumed.
         """
-        if not self.receive_buffer or (self._expected_response_cmd is not None and self.receive_buffer[0] == self._expected_response_cmd):
+        if not self.receive_buffer or self._is_answer_to_command():
             return None, 0
 
-        try:
-            decoded_buffer = self.receive_buffer.decode('utf-8', errors='ignore')
-            if decoded_buffer:
-                # Look for any of the common line endings: \r\n, \n, or \r
-                for delimiter in ['\r\n', '\n', '\r']:
-                    end_index = decoded_buffer.find(delimiter)
-                    if end_index != -1:
-                        # Include the delimiter in the returned bytes
-                        delimiter_len = len(delimiter)
-                        unsolicited_message_bytes = self.receive_buffer[:end_index + delimiter_len]
-                        return unsolicited_message_bytes, end_index + delimiter_len
-                else:
-                    if len(self.receive_buffer) > 2 * MAXIMUM_PACKET_SIZE:
-                        self.log_message.emit("Potential runaway unsolicited message, clearing buffer.")
-                        self.receive_buffer.clear()
-                        return None, len(self.receive_buffer) # Consume the whole buffer
-                    return None, 0
-            else:
-                return None, 1 # Consume at least one byte if decoding fails at the start
-        except UnicodeDecodeError:
-            return None, 1 # Consume at least one byte if decoding fails at the start
+        line_length = self._line_scanner.find_line_end(self.receive_buffer)
+        if line_length != -1:
+            # Include the delimiter in the returned bytes
+            return self.receive_buffer.view(0, line_length), line_length
+
+        if len(self.receive_buffer) > 2 * MAXIMUM_PACKET_SIZE:
+            self.log_message.emit("Potential runaway unsolicited message, clearing buffer.")
+            self._clear_receive_buffer()
+        return None, 0
 
     def _process_packet(self, packet: bytes) -> None:
         """
@@ -216,18 +502,32 @@ class SerialProtocolFmcw(QObject):
         except UnicodeDecodeError:
             # If decoding fails, handle as raw bytes
             self.data_received.emit(packet)
-            self.log_message.emit(f"_process_packet: {' '.join(f'0x{byte:02X}' for byte in packet)}")
+            self.log_message.emit(f"_process_packet: {format_hex(packet)}")
 
     def _handle_packet_timeout(self) -> None:
         """
-        Handles the case where we don't receive the expected response
-        within the timeout period.
+        Handles the case where we don't receive the expected responses
+        within the timeout period. Only requests past their deadline are dropped.
         """
-        if self._expected_response_cmd is not None:
-            self.error_occurred.emit(f"Timeout waiting for response to CMD: 0x{self._expected_response_cmd:02X}")
-            self._expected_response_cmd = None
-            self._pending_response = None
-            self.receive_buffer.clear()  # Clear the buffer to avoid confusion in the next command
+        with self._lock:
+            now = monotonic()
+            for code in list(self._pending_requests):
+                requests = self._pending_requests[code]
+                while requests and requests[0].deadline <= now:
+                    request = requests.popleft()
+                    self._remove_from_order(request, now)
+                    error_message = f"Timeout waiting for response to CMD: 0x{code:02X}"
+                    self.rtt_stats.record_timeout(code)
+                    self.metrics.record_timeout(code)
+                    _resolve_future(request.future, exception=TimeoutError(error_message))
+                    self.error_occurred.emit(error_message)
+                if not requests:
+                    del self._pending_requests[code]
+
+            if not self._pending_requests:
+                self._pending_response = None
+                self._clear_receive_buffer()  # Clear the buffer to avoid confusion in the next command
+            self._restart_timeout_timer()
 
     def _log_command_and_byte_count(self) -> None:
         """
@@ -239,8 +539,8 @@ class SerialProtocolFmcw(QObject):
             cmd = self.receive_buffer[0] if len(self.receive_buffer) > 0 else None
             byte_count = len(self.receive_buffer)
             self.log_message.emit(f"[Debug]Command: 0x{cmd:02X}, Bytes received: {byte_count}")
-            self.log_message.emit(f"[Debug] Data received:\n{' '.join(f'0x{byte:02X}' for byte in self.receive_buffer)}")
-            self.receive_buffer.clear()
+            self.log_message.emit(f"[Debug] Data received:\n{format_hex(self.receive_buffer.view())}")
+            self._clear_receive_buffer()
         else:
             self.log_message.emit("Data Rx Timeout.")
     
\ No newline at end of file
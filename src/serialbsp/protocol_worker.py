@@ -0,0 +1,56 @@
+from PySide6.QtCore import QByteArray, QObject, QThread, Signal
+
+WORKER_STOP_TIMEOUT_MS = 2000  # Maximum wait for the protocol thread to finish
+
+
+class ProtocolWorker(QObject):
+    """
+    Runs a SerialProtocolFmcw in a thread of its own.
+
+    The protocol is moved to the worker thread, so received data is buffered, framed, CRC
+    checked and decoded with the command schemas there, and the GUI thread only handles the
+    finished responses. The worker re-emits the protocol's signals in the thread it was created
+    in (the GUI thread) and installs itself as the protocol's gui_signals, so widgets keep
+    connecting to serial_protocol.gui_signals whether the protocol is threaded or not.
+
+    The protocol must not have a parent. Requests may still be sent from any thread.
+    """
+    data_received = Signal(bytes)
+    response_decoded = Signal(int, object)
+    command_encoded = Signal(QByteArray)
+    log_message = Signal(str)
+    error_occurred = Signal(str)
+
+    def __init__(self, protocol, parent=None):
+        """
+        Initialize the worker and move the protocol to its thread.
+
+        Args:
+            protocol (SerialProtocolFmcw): The protocol to run, without a parent.
+            parent (QObject | None): Parent object, living in the GUI thread.
+        """
+        super().__init__(parent)
+        self.protocol = protocol
+        self._thread = QThread()
+        self._thread.setObjectName("fmcw-protocol")
+        protocol.moveToThread(self._thread)
+
+        # Signal to signal connections to an object of the GUI thread are queued
+        protocol.data_received.connect(self.data_received)
+        protocol.response_decoded.connect(self.response_decoded)
+        protocol.command_encoded.connect(self.command_encoded)
+        protocol.log_message.connect(self.log_message)
+        protocol.error_occurred.connect(self.error_occurred)
+        protocol.gui_signals = self
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the protocol thread, pending events of the protocol are discarded."""
+        if self._thread.isRunning():
+            self._thread.quit()
+            self._thread.wait(WORKER_STOP_TIMEOUT_MS)
+
+    def is_running(self) -> bool:
+        return self._thread.isRunning()
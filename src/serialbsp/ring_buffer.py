@@ -0,0 +1,110 @@
+DEFAULT_CAPACITY = 16384  # bytes, several 1027-byte ADC frames plus debug text
+
+
+class RingBuffer:
+    """
+    Fixed-capacity byte buffer with read and write cursors, used on the protocol receive path.
+
+    Appending copies the incoming chunk once into a preallocated bytearray and consuming only
+    advances the read cursor, so extracting a frame never shifts the remaining bytes. The unread
+    region is always kept contiguous: the cursors rewind to the start whenever the buffer runs
+    empty (the normal case with back-to-back frames), and the unread tail is moved to the front
+    only when the write cursor would run past the end.
+
+    view() hands out memoryview slices of the unread region without copying. A view is only valid
+    until the next extend(), so a frame that has to outlive the buffer must be copied with bytes().
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): Maximum number of unread bytes the buffer can hold.
+        """
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._memory = memoryview(self._buffer)
+        self._read = 0
+        self._write = 0
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    def __bool__(self) -> bool:
+        return self._write != self._read
+
+    def __getitem__(self, index: int) -> int:
+        """Returns the unread byte at the given position (negative positions count from the end)."""
+        size = self._write - self._read
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("RingBuffer index out of range")
+        return self._buffer[self._read + index]
+
+    def free_space(self) -> int:
+        """Returns the number of bytes that can still be appended."""
+        return self.capacity - len(self)
+
+    def extend(self, data) -> None:
+        """
+        Appends bytes to the buffer.
+
+        Args:
+            data (bytes | bytearray | memoryview): The bytes to append.
+
+        Raises:
+            BufferError: If the data does not fit into the free space.
+        """
+        size = len(data)
+        if self._write + size > self.capacity:
+            self._compact()
+            if self._write + size > self.capacity:
+                raise BufferError(f"RingBuffer overflow: {size} bytes do not fit into {self.free_space()} free bytes")
+        self._memory[self._write:self._write + size] = data
+        self._write += size
+
+    def view(self, start: int = 0, stop: int | None = None) -> memoryview:
+        """
+        Returns a zero-copy view of the unread bytes [start:stop].
+
+        Args:
+            start (int): Offset from the read cursor.
+            stop (int | None): End offset from the read cursor, defaults to all unread bytes.
+
+        Returns:
+            memoryview: The requested slice, valid until the next extend().
+        """
+        size = self._write - self._read
+        if stop is None or stop > size:
+            stop = size
+        return self._memory[self._read + start:self._read + stop]
+
+    def find(self, sub, start: int = 0, end: int | None = None) -> int:
+        """
+        Finds a byte or byte sequence in the unread region, like bytearray.find().
+
+        Returns:
+            int: The offset from the read cursor, or -1 if not found.
+        """
+        stop = self._write if end is None else min(self._read + end, self._write)
+        index = self._buffer.find(sub, self._read + start, stop)
+        return index - self._read if index != -1 else -1
+
+    def consume(self, count: int) -> None:
+        """Drops up to count bytes from the front of the unread region."""
+        self._read = min(self._read + count, self._write)
+        if self._read == self._write:
+            self._read = self._write = 0
+
+    def clear(self) -> None:
+        """Drops all unread bytes."""
+        self._read = self._write = 0
+
+    def _compact(self) -> None:
+        """Moves the unread bytes to the front of the buffer."""
+        size = self._write - self._read
+        if self._read:
+            self._memory[:size] = self._memory[self._read:self._write]
+            self._read, self._write = 0, size
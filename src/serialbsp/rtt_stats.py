@@ -0,0 +1,153 @@
+import math
+import threading
+from bisect import bisect_left
+from collections import deque
+
+RTT_WINDOW = 256  # Samples kept per command, older samples roll out
+MIN_SAMPLES = 8  # Samples needed before the measured RTT replaces the default timeout
+TIMEOUT_PERCENTILE = 99
+TIMEOUT_MARGIN = 3.0  # Timeout = percentile RTT * margin
+BITS_PER_BYTE = 10  # 8N1: start + 8 data + stop bit
+TRANSFER_MARGIN = 1.5  # Margin on the wire time of request + response
+MIN_TIMEOUT_MS = 100  # Fixed allowance for the firmware turnaround
+BUCKET_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def transfer_time_ms(byte_count: int, baudrate: int) -> float:
+    """Returns the time needed to transfer byte_count bytes at the given baud rate."""
+    return byte_count * BITS_PER_BYTE * 1000 / baudrate
+
+
+class RttHistogram:
+    """
+    Rolling window of round-trip times of one command.
+    """
+
+    def __init__(self, window: int = RTT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.total_count = 0
+        self.timeouts = 0
+        self.consecutive_timeouts = 0
+
+    def add(self, rtt_ms: float) -> None:
+        self.samples.append(rtt_ms)
+        self.total_count += 1
+        self.consecutive_timeouts = 0
+
+    def add_timeout(self) -> None:
+        self.timeouts += 1
+        self.consecutive_timeouts += 1
+
+    def percentile(self, percent: float) -> float | None:
+        """Returns the given percentile of the window (nearest rank), or None without samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def buckets(self) -> list[int]:
+        """Returns the sample count per BUCKET_EDGES_MS bucket, the last entry counts slower samples."""
+        counts = [0] * (len(BUCKET_EDGES_MS) + 1)
+        for sample in self.samples:
+            counts[bisect_left(BUCKET_EDGES_MS, sample)] += 1
+        return counts
+
+    def summary(self) -> dict:
+        return {
+            "count": self.total_count,
+            "timeouts": self.timeouts,
+            "min_ms": min(self.samples, default=None),
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": max(self.samples, default=None),
+        }
+
+
+class RttStats:
+    """
+    Round-trip statistics per command code and the adaptive response timeouts derived from them.
+
+    Until a command has MIN_SAMPLES measurements its timeout is the default. Afterwards it is
+    the TIMEOUT_PERCENTILE RTT times TIMEOUT_MARGIN, but never less than the wire time of the
+    request and response at the current baud rate. The protocol starts the timeout when the
+    responses ahead of the request are in, so the RTT samples are the command's own as well.
+    Every consecutive timeout doubles the learned
+    value again, up to the default, so a device that slowed down is not cut off repeatedly.
+    """
+
+    def __init__(self, window: int = RTT_WINDOW):
+        self.window = window
+        self._histograms: dict[int, RttHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, code: int) -> RttHistogram:
+        histogram = self._histograms.get(code)
+        if histogram is None:
+            histogram = self._histograms[code] = RttHistogram(self.window)
+        return histogram
+
+    def record(self, code: int, rtt_ms: float) -> None:
+        """Adds a measured round-trip time for the command code."""
+        with self._lock:
+            self._histogram(code).add(rtt_ms)
+
+    def record_timeout(self, code: int) -> None:
+        """Counts a response timeout for the command code."""
+        with self._lock:
+            self._histogram(code).add_timeout()
+
+    def timeout_for(self, cmd, baudrate: int, default_ms: int, request_size: int = 0) -> int:
+        """
+        Returns the response timeout for a command.
+
+        Args:
+            cmd (Command): The command to send.
+            baudrate (int): The current baud rate of the link.
+            default_ms (int): Timeout used while there are not enough samples.
+            request_size (int): Size of the encoded request in bytes.
+
+        Returns:
+            int: The timeout in milliseconds.
+        """
+        floor_ms = transfer_time_ms(request_size + cmd.response_size, baudrate) * TRANSFER_MARGIN + MIN_TIMEOUT_MS
+        with self._lock:
+            histogram = self._histograms.get(cmd.code)
+            if histogram is None or len(histogram.samples) < MIN_SAMPLES:
+                return int(max(default_ms, floor_ms))
+            timeout_ms = max(floor_ms, histogram.percentile(TIMEOUT_PERCENTILE) * TIMEOUT_MARGIN)
+            if histogram.consecutive_timeouts:
+                timeout_ms = min(timeout_ms * 2 ** histogram.consecutive_timeouts, max(default_ms, timeout_ms))
+        return int(timeout_ms)
+
+    def summary(self) -> dict[int, dict]:
+        """Returns the statistics of every command code seen so far."""
+        with self._lock:
+            return {code: histogram.summary() for code, histogram in sorted(self._histograms.items())}
+
+    def histogram(self, code: int) -> list[int]:
+        """Returns the bucket counts of one command code, see RttHistogram.buckets()."""
+        with self._lock:
+            histogram = self._histograms.get(code)
+            return histogram.buckets() if histogram else [0] * (len(BUCKET_EDGES_MS) + 1)
+
+    def report(self, names: dict[int, str] | None = None) -> str:
+        """
+        Formats the statistics as a table, slowest commands first.
+
+        Args:
+            names (dict[int, str] | None): Optional command names by code.
+        """
+        names = names or {}
+        rows = sorted(self.summary().items(), key=lambda item: item[1]["p99_ms"] or 0, reverse=True)
+        lines = [f"{'command':<30} {'count':>6} {'tmo':>4} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for code, stats in rows:
+            name = names.get(code, f"0x{code:02X}")
+            p50, p99, maximum = (f"{stats[key]:.1f}" if stats[key] is not None else "-" for key in ("p50_ms", "p99_ms", "max_ms"))
+            lines.append(f"{name:<30} {stats['count']:>6} {stats['timeouts']:>4} {p50:>8} {p99:>8} {maximum:>8}")
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
@@ -0,0 +1,140 @@
+import struct
+from dataclasses import dataclass
+from typing import Callable
+
+PAYLOAD_OFFSET = 2  # Response data starts after [cmd, cmd]
+LITTLE_ENDIAN = "<"
+BIG_ENDIAN = ">"
+
+
+def years_since_1900(value: int) -> int:
+    """Converts a struct tm year (years since 1900) to the calendar year."""
+    return value + 1900
+
+
+def version_string(value: int) -> str:
+    """Converts a version word (major in the high byte, minor in the low byte) to 'major.minor'."""
+    return f"{value >> 8}.{value & 0xFF:02}"
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One field of a response payload.
+
+    Args:
+        name (str): Attribute name in the decoded record.
+        format (str): struct format character(s) without byte order, e.g. "H" or "8s".
+        convert (Callable | None): Optional conversion applied to the raw value, e.g. years_since_1900.
+    """
+    name: str
+    format: str
+    convert: Callable | None = None
+
+
+class SchemaRecord:
+    """
+    Base class of the records produced by ResponseSchema.decode().
+
+    Subclasses are generated per schema with __slots__ set to the field names, so a decoded
+    response is a small fixed-layout object rather than a dict.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class ResponseSchema:
+    """
+    Declarative layout of a response payload.
+
+    The field formats are compiled once into a struct.Struct and decoding is a single
+    unpack_from() at the payload offset, so frames can be decoded straight from a memoryview of
+    the receive buffer or of a capture file without slicing. Only the fields with a converter
+    are touched after unpacking.
+    """
+
+    def __init__(self, name: str, fields: list[Field], byte_order: str = LITTLE_ENDIAN):
+        """
+        Initialize the schema.
+
+        Args:
+            name (str): Name of the generated record class.
+            fields (list[Field]): The payload fields in wire order.
+            byte_order (str): LITTLE_ENDIAN or BIG_ENDIAN, applies to all fields.
+        """
+        self.name = name
+        self.fields = tuple(fields)
+        self.byte_order = byte_order
+        self.struct = struct.Struct(byte_order + "".join(field.format for field in self.fields))
+        self.size = self.struct.size
+        self.record_type = type(name, (SchemaRecord,), {"__slots__": tuple(field.name for field in self.fields)})
+        self._conversions = tuple((index, field.convert) for index, field in enumerate(self.fields) if field.convert)
+
+    def decode(self, packet, offset: int = PAYLOAD_OFFSET) -> SchemaRecord:
+        """
+        Decodes one response payload.
+
+        Args:
+            packet (bytes | bytearray | memoryview): The complete response frame.
+            offset (int): Offset of the payload in the frame.
+
+        Returns:
+            SchemaRecord: The decoded record.
+
+        Raises:
+            struct.error: If the packet is too short.
+        """
+        values = self.struct.unpack_from(packet, offset)
+        if self._conversions:
+            values = list(values)
+            for index, convert in self._conversions:
+                values[index] = convert(values[index])
+        return self.record_type(*values)
+
+
+DEVICE_STATUS_SCHEMA = ResponseSchema("DeviceStatus", [
+    Field("adc_battery", "H"),
+    Field("adc_3v3", "H"),
+    Field("adc_5v", "H"),
+    Field("adc_12v", "H"),
+    Field("adc_20v", "H"),
+    Field("adc_temp", "H"),
+    Field("tm_min", "B"),
+    Field("tm_hour", "B"),
+    Field("tm_mday", "B"),
+    Field("tm_sec", "B"),
+    Field("tm_mon", "B"),
+    Field("tm_wday", "B"),
+    Field("tm_year", "H", years_since_1900),
+    Field("software_version", "H", version_string),
+])
+
+SD_CARD_STATUS_SCHEMA = ResponseSchema("SdCardStatus", [
+    Field("sector_address", "Q"),
+    Field("sector_cnt", "I"),
+    Field("card_type", "H"),
+], byte_order=BIG_ENDIAN)
+
+FILTER_CONFIG_SCHEMA = ResponseSchema("FilterConfig", [
+    Field("poti1", "B"),
+    Field("poti2", "B"),
+    Field("poti3", "B"),
+    Field("poti4", "B"),
+])
+
+if __name__ == '__main__':
+    frame = bytes([0x08, 0x00]) + DEVICE_STATUS_SCHEMA.struct.pack(1500, 2048, 2048, 1800, 1900, 900, 30, 12, 24, 5, 10, 4, 125, 0x0103) + b"\x00"
+    print(DEVICE_STATUS_SCHEMA.decode(memoryview(frame)))
@@ -1,8 +1,35 @@
+import os
+import queue
+import select
+import time
+from dataclasses import dataclass
+
 from PySide6.QtCore import QObject, Signal, Slot, QThread
 import serial
 from serial.tools import list_ports
 from serial import SerialException
 
+from serialbsp.capture import CaptureWriter
+from serialbsp.link_metrics import LinkMetrics
+from serialbsp.traffic_trace import RX, TX
+from serialbsp.transport import create_transport
+
+# Reader modes
+READ_MODE_AUTO = "auto"          # select() on POSIX, blocking read elsewhere
+READ_MODE_SELECT = "select"      # wait on the port file descriptor with select()
+READ_MODE_BLOCKING = "blocking"  # blocking read bounded by timeout and inter-byte timeout
+READ_MODE_POLL = "poll"          # legacy read_all() busy loop, kept for comparison
+
+READ_CHUNK_SIZE = 4096
+DEFAULT_MAX_LATENCY_MS = 10  # Upper bound between the first byte of a chunk and its delivery
+DEFAULT_INTER_BYTE_TIMEOUT_MS = 2  # A gap this long on the line ends the current chunk
+IDLE_WAKEUP_INTERVAL = 0.1  # seconds, how often an idle select() wakes up to check the stop flag
+
+WRITE_QUEUE_SIZE = 64  # Frames waiting for the writer thread
+WRITE_BLOCK_TIMEOUT = 0.5  # seconds send_data() waits for room in a full queue before dropping the frame
+COALESCE_LIMIT = 256  # Maximum bytes merged into one write
+WRITER_STOP_TIMEOUT = 1.0  # seconds close_serial_port() waits for queued frames to be written
+
 
 class SerialManager(QObject):
     """
@@ -13,21 +40,86 @@ class SerialManager(QObject):
     connection_status_changed = Signal(bool)
     error_occurred = Signal(str)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, read_mode: str = READ_MODE_AUTO, max_latency_ms: float = DEFAULT_MAX_LATENCY_MS,
+                 coalesce_writes: bool = True, metrics: LinkMetrics | None = None):
         super().__init__(parent)
         self.serial_port = serial.Serial()
+        self.read_mode = read_mode
+        self.max_latency_ms = max_latency_ms
+        self.coalesce_writes = coalesce_writes  # Merge queued frames into one write, disable for strict per-frame timing
+        self.capture = None  # CaptureWriter while a capture is running
+        self.metrics = metrics or LinkMetrics()  # Shared with the protocol, see LinkMetrics
         self.read_thread = QThread()
-        self.reader = SerialPortReader()
-        self.reader.moveToThread(self.read_thread)
-        self.reader.data_received.connect(self.data_received)
-        self.reader.error_occurred.connect(self.error_occurred)
-        self.reader.connection_status_changed.connect(self.connection_status_changed)
-
-        # Start the reader when the thread starts
-        self.read_thread.started.connect(self.reader.run)
+        self.reader = self._create_reader()
+        self.write_thread = None
+        self.writer = None
         self.current_port = None
         print("SerialManager is running")
 
+    def _create_reader(self) -> "SerialPortReader":
+        """Creates a reader bound to the current read thread and forwards its signals."""
+        reader = SerialPortReader(self.read_mode, self.max_latency_ms)
+        reader.capture = self.capture
+        reader.metrics = self.metrics
+        reader.moveToThread(self.read_thread)
+        reader.data_received.connect(self.data_received)
+        reader.error_occurred.connect(self.error_occurred)
+        reader.connection_status_changed.connect(self.connection_status_changed)
+
+        # Start the reader when the thread starts
+        self.read_thread.started.connect(reader.run)
+        return reader
+
+    def _start_writer(self) -> None:
+        """Starts a writer thread for the open port."""
+        self.write_thread = QThread()
+        self.writer = SerialPortWriter(self.serial_port, coalesce=self.coalesce_writes)
+        self.writer.capture = self.capture
+        self.writer.metrics = self.metrics
+        self.writer.moveToThread(self.write_thread)
+        self.writer.error_occurred.connect(self.error_occurred)
+        self.write_thread.started.connect(self.writer.run)
+        self.write_thread.start()
+
+    def _stop_writer(self) -> None:
+        """Writes the queued frames (bounded by WRITER_STOP_TIMEOUT) and stops the writer thread."""
+        if self.writer:
+            self.writer.stop(WRITER_STOP_TIMEOUT)
+        if self.write_thread and self.write_thread.isRunning():
+            self.write_thread.quit()
+            self.write_thread.wait()
+        self.writer = None
+        self.write_thread = None
+
+    def start_capture(self, path: str) -> CaptureWriter:
+        """
+        Starts writing the raw received and sent chunks to a capture file, which can be played
+        back with a ReplayTransport. Replaces a running capture.
+
+        Args:
+            path (str): The capture file to create.
+
+        Returns:
+            CaptureWriter: The capture, with its chunk and byte counters.
+        """
+        self.stop_capture()
+        self.capture = CaptureWriter(path)
+        self._set_capture(self.capture)
+        return self.capture
+
+    def stop_capture(self) -> None:
+        """Stops and closes the running capture, if any."""
+        capture, self.capture = self.capture, None
+        self._set_capture(None)
+        if capture is not None:
+            capture.close()
+
+    def _set_capture(self, capture: CaptureWriter | None) -> None:
+        if self.reader:
+            self.reader.capture = capture
+        if self.writer:
+            self.writer.capture = capture
+
     def get_available_ports(self) -> list[tuple[str, str, str, str]]:
         """
         Returns a list of available serial ports with their descriptions, VID, and PID.
@@ -43,9 +135,18 @@ class SerialManager(QObject):
             available_ports.append((port.device, port.description, vid, pid))
         return available_ports
 
-    def open_serial_port(self, port: str, baudrate: int = 9600, timeout: float = 2) -> None:
-        """Opens the specified serial port."""
-        self.serial_port.port = port
+    def open_serial_port(self, port: str, baudrate: int = 9600, timeout: float = 2, transport=None) -> None:
+        """
+        Opens the specified serial port.
+
+        Args:
+            port (str): Serial device name, or a transport URL ("pty://", "loop://", "tcp://host:port").
+            baudrate (int): Baud rate of a serial device.
+            timeout (float): Read timeout in seconds.
+            transport (Transport | None): Transport to open instead of the one created for port,
+                e.g. a LoopbackTransport with a responder.
+        """
+        self.serial_port = transport or create_transport(port)
         self.serial_port.baudrate = baudrate
         self.serial_port.timeout = timeout
         self.current_port = port
@@ -55,16 +156,12 @@ class SerialManager(QObject):
             # If the thread is not running, create a new thread and a new reader
             if not self.read_thread.isRunning():
                 self.read_thread = QThread()
-                self.reader = SerialPortReader()  # <-- Create a new instance!
+                self.reader = self._create_reader()  # <-- Create a new instance!
                 self.reader.set_serial_port(self.serial_port)
-                self.reader.moveToThread(self.read_thread)
-                self.read_thread.started.connect(self.reader.run)
-                self.reader.data_received.connect(self.data_received)
-                self.reader.error_occurred.connect(self.error_occurred)
-                self.reader.connection_status_changed.connect(self.connection_status_changed)
                 self.read_thread.start()
             else:
                 self.reader.set_serial_port(self.serial_port)
+            self._start_writer()
             self.connection_status_changed.emit(True)
         except SerialException as e:
             self.error_occurred.emit(f"Error opening serial port: {e}")
@@ -74,6 +171,7 @@ class SerialManager(QObject):
         """Closes the currently open serial port."""
         try:
             if self.serial_port.is_open:
+                self._stop_writer()
                 self.stop_reading()
                 try:
                     self.serial_port.close()
@@ -89,15 +187,64 @@ class SerialManager(QObject):
         """Returns True if the serial port is currently open."""
         return self.serial_port.is_open
 
-    def send_data(self, data: bytes) -> None:
-        """Sends raw bytes over the serial port."""
-        try:
-            if self.serial_port.is_open:
+    def send_data(self, data: bytes, timeout: float | None = WRITE_BLOCK_TIMEOUT) -> bool:
+        """
+        Queues raw bytes for the writer thread, so a slow adapter does not block the caller.
+
+        When the queue is full the caller is held back for up to timeout seconds
+        (backpressure) before the frame is dropped.
+
+        Args:
+            data (bytes): The bytes to send.
+            timeout (float | None): Maximum time to wait for room in the queue, None waits forever.
+
+        Returns:
+            bool: True if the data was queued.
+        """
+        if not self.serial_port.is_open:
+            self.error_occurred.emit("Serial port is not open")
+            return False
+        if self.writer is None:
+            # No writer thread (port opened outside open_serial_port), write synchronously
+            try:
                 self.serial_port.write(data)
-            else:
-                self.error_occurred.emit("Serial port is not open")
-        except SerialException as e:
-            self.error_occurred.emit(f"Error sending data: {e}")
+                self.metrics.record_write(len(data), [])  # Not queued, no latency sample
+                if self.capture is not None:
+                    self.capture.record(TX, data)
+                return True
+            except SerialException as e:
+                self.error_occurred.emit(f"Error sending data: {e}")
+                return False
+        if not self.writer.enqueue(data, timeout):
+            self.error_occurred.emit(f"Write queue full, dropped {len(data)} bytes")
+            return False
+        return True
+
+    def write_queue_depth(self) -> int:
+        """Returns the number of frames waiting to be written."""
+        return self.writer.queue_depth() if self.writer else 0
+
+    def get_writer_stats(self) -> dict:
+        """
+        Returns the statistics of the current writer (queue depth, coalescing, write latency).
+
+        Returns:
+            dict: The writer statistics, empty if no writer is active.
+        """
+        if self.writer:
+            return self.writer.stats.as_dict()
+        return {}
+
+    def get_reader_stats(self) -> dict:
+        """
+        Returns the statistics of the current reader (CPU usage, delivery latency, throughput).
+
+        Returns:
+            dict: The reader statistics, empty if no reader is active.
+        """
+        if self.reader:
+            return self.reader.stats.as_dict()
+        return {}
 
     def stop_reading(self) -> None:
         """Stops the serial reading thread."""
@@ -116,29 +263,105 @@ class SerialManager(QObject):
             self.serial_port.reset_input_buffer()
 
     def reset_output_buffer(self) -> None:
-        """Clears the output buffer of the serial port."""
+        """
+        Clears the output buffer of the serial port. Frames still in the writer queue are kept,
+        other components may have requests waiting for their responses.
+        """
         if self.serial_port.is_open:
             self.serial_port.reset_output_buffer()
 
 
+@dataclass
+class ReaderStats:
+    """
+    Counters collected by the SerialPortReader while it runs.
+
+    CPU time is measured with time.thread_time() from inside the reader thread, so
+    cpu_percent reports the share of one core used by the reader alone.
+    """
+    read_mode: str = ""
+    wall_time: float = 0.0  # seconds since run() started
+    cpu_time: float = 0.0  # seconds of CPU used by the reader thread
+    wakeups: int = 0
+    empty_wakeups: int = 0
+    chunks: int = 0
+    bytes_received: int = 0
+    total_latency: float = 0.0  # seconds, summed over all chunks
+    max_latency: float = 0.0  # seconds
+
+    @property
+    def cpu_percent(self) -> float:
+        return 100.0 * self.cpu_time / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def avg_latency_ms(self) -> float:
+        return 1000.0 * self.total_latency / self.chunks if self.chunks else 0.0
+
+    def record_chunk(self, size: int, latency: float) -> None:
+        self.chunks += 1
+        self.bytes_received += size
+        self.total_latency += latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+    def as_dict(self) -> dict:
+        return {
+            "read_mode": self.read_mode,
+            "wall_time_s": round(self.wall_time, 3),
+            "cpu_time_s": round(self.cpu_time, 3),
+            "cpu_percent": round(self.cpu_percent, 2),
+            "wakeups": self.wakeups,
+            "empty_wakeups": self.empty_wakeups,
+            "chunks": self.chunks,
+            "bytes_received": self.bytes_received,
+            "avg_latency_ms": round(self.avg_latency_ms, 3),
+            "max_latency_ms": round(1000.0 * self.max_latency, 3),
+        }
+
+
 class SerialPortReader(QObject):
     """
     Reads data from the serial port in a separate thread.
+
+    The reader blocks while the line is idle instead of spinning on read_all():
+
+    - ``select``: waits on the port file descriptor (POSIX only).
+    - ``blocking``: relies on the port read timeout and inter-byte timeout.
+    - ``poll``: the original read_all() busy loop, only useful for comparison.
+
+    Once the first byte of a chunk is available, the reader keeps collecting bytes until the
+    line goes quiet for the inter-byte timeout or max_latency_ms has elapsed, so one frame
+    usually arrives as one data_received emission and no byte waits longer than the bound.
     """
 
     data_received = Signal(bytes)
     error_occurred = Signal(str)
     connection_status_changed = Signal(bool) 
 
-    def __init__(self):
+    def __init__(self, read_mode: str = READ_MODE_AUTO, max_latency_ms: float = DEFAULT_MAX_LATENCY_MS,
+                 inter_byte_timeout_ms: float = DEFAULT_INTER_BYTE_TIMEOUT_MS):
         super().__init__()
         self.serial_port = None
         self._stop_flag = False
+        self.read_mode = read_mode
+        self.max_latency = max_latency_ms / 1000.0
+        self.inter_byte_timeout = inter_byte_timeout_ms / 1000.0
+        self.stats = ReaderStats()
+        self.capture = None  # CaptureWriter the received chunks are recorded to
+        self.metrics = None  # LinkMetrics of the link
 
     def stop(self):
         """Sets the stop flag to exit the reading loop."""
         self._stop_flag = True
 
+    def _resolve_read_mode(self) -> str:
+        """Picks the concrete read mode for the current port."""
+        if self.read_mode != READ_MODE_AUTO:
+            return self.read_mode
+        if os.name == "posix" and hasattr(self.serial_port, "fileno"):
+            return READ_MODE_SELECT
+        return READ_MODE_BLOCKING
+
     @Slot()
     def run(self) -> None:
         """
@@ -146,22 +369,210 @@ class SerialPortReader(QObject):
         This method should be called when the QThread starts.
         """
         self._stop_flag = False 
-        print("SerialPortReader: run() started")
+        read_mode = self._resolve_read_mode()
+        read_chunk = {
+            READ_MODE_SELECT: self._read_chunk_select,
+            READ_MODE_BLOCKING: self._read_chunk_blocking,
+            READ_MODE_POLL: self._read_chunk_poll,
+        }[read_mode]
+        if read_mode == READ_MODE_BLOCKING and self.serial_port:
+            self.serial_port.timeout = self.max_latency
+            self.serial_port.inter_byte_timeout = self.inter_byte_timeout
+
+        self.stats = ReaderStats(read_mode=read_mode)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        print(f"SerialPortReader: run() started ({read_mode})")
         while self.serial_port and self.serial_port.is_open and not self._stop_flag:
             try:
-                data = self.serial_port.read_all()
+                data, first_byte_time = read_chunk()
+                self.stats.wakeups += 1
                 if data:
+                    capture = self.capture
+                    if capture is not None:
+                        capture.record(RX, data)
                     self.data_received.emit(data)
+                    latency = time.perf_counter() - first_byte_time
+                    self.stats.record_chunk(len(data), latency)
+                    if self.metrics is not None:
+                        self.metrics.record_read(len(data), latency)
+                else:
+                    self.stats.empty_wakeups += 1
+                    if self.metrics is not None:
+                        self.metrics.record_read(0, 0.0)
 
-            except SerialException as e:
+            except (SerialException, OSError) as e:
                 self.error_occurred.emit(f"Serial exception: {e}")
                 if self.serial_port and self.serial_port.is_open:
                     self.serial_port.close()
                 self.connection_status_changed.emit(False) 
                 break  # Exit the loop on error
-        print("SerialPortReader: run() stopped")
+            finally:
+                self.stats.wall_time = time.perf_counter() - wall_start
+                self.stats.cpu_time = time.thread_time() - cpu_start
+        print(f"SerialPortReader: run() stopped {self.stats.as_dict()}")
+
+    def _read_chunk_select(self) -> tuple[bytes, float]:
+        """Waits on the file descriptor, then gathers bytes until the line is quiet."""
+        fd = self.serial_port.fileno()
+        readable, _, _ = select.select([fd], [], [], IDLE_WAKEUP_INTERVAL)
+        if not readable:
+            return b"", 0.0
+        first_byte_time = time.perf_counter()
+        deadline = first_byte_time + self.max_latency
+        data = bytearray()
+        while True:
+            waiting = self.serial_port.in_waiting
+            if waiting:
+                data += self.serial_port.read(min(waiting, READ_CHUNK_SIZE))
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or len(data) >= READ_CHUNK_SIZE:
+                break
+            readable, _, _ = select.select([fd], [], [], min(self.inter_byte_timeout, remaining))
+            if not readable:
+                break
+        return bytes(data), first_byte_time
+
+    def _read_chunk_blocking(self) -> tuple[bytes, float]:
+        """
+        Blocks in the driver until the first byte arrives or the read timeout expires.
+        The port timeout is max_latency and the inter-byte timeout ends the chunk early.
+        """
+        data = self.serial_port.read(1)
+        if not data:
+            return b"", 0.0
+        first_byte_time = time.perf_counter()
+        if self.serial_port.in_waiting:
+            # Returns once the line is quiet for the inter-byte timeout, at most max_latency later
+            data += self.serial_port.read(READ_CHUNK_SIZE - 1)
+        return data, first_byte_time
+
+    def _read_chunk_poll(self) -> tuple[bytes, float]:
+        """Legacy busy loop: returns whatever is buffered without blocking."""
+        return self.serial_port.read_all(), time.perf_counter()
 
     def set_serial_port(self, serial_port: serial.Serial) -> None:
         """Sets the serial port for the reader."""
         self.serial_port = serial_port
-        
\ No newline at end of file
+
+
+@dataclass
+class WriterStats:
+    """
+    Counters collected by the SerialPortWriter.
+    """
+    frames: int = 0  # frames passed to send_data()
+    writes: int = 0  # write() calls on the port
+    bytes_written: int = 0
+    coalesced: int = 0  # frames merged into a write of an earlier frame
+    dropped: int = 0  # frames rejected because the queue stayed full
+    backpressure_waits: int = 0  # send_data() calls that found the queue full
+    max_queue_depth: int = 0
+    total_latency: float = 0.0  # seconds from send_data() to the end of the write, summed over frames
+    max_latency: float = 0.0  # seconds
+
+    @property
+    def avg_latency_ms(self) -> float:
+        written = self.frames - self.dropped
+        return 1000.0 * self.total_latency / written if written > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "writes": self.writes,
+            "bytes_written": self.bytes_written,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "backpressure_waits": self.backpressure_waits,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_latency_ms": round(self.avg_latency_ms, 3),
+            "max_latency_ms": round(1000.0 * self.max_latency, 3),
+        }
+
+
+class SerialPortWriter(QObject):
+    """
+    Writes queued frames to the serial port in a separate thread.
+
+    send_data() only puts the frame into a bounded queue, so a slow USB-serial adapter or a
+    full output buffer stalls the writer thread instead of the GUI. With coalescing enabled,
+    frames that are already queued when a write starts are merged into that write, up to
+    COALESCE_LIMIT bytes.
+    """
+
+    error_occurred = Signal(str)
+
+    def __init__(self, serial_port, queue_size: int = WRITE_QUEUE_SIZE, coalesce: bool = True):
+        super().__init__()
+        self.serial_port = serial_port
+        self.coalesce = coalesce
+        self.stats = WriterStats()
+        self.capture = None  # CaptureWriter the written chunks are recorded to
+        self.metrics = None  # LinkMetrics of the link
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop_flag = False
+        self._drain_deadline = None
+
+    def enqueue(self, data: bytes, timeout: float | None = WRITE_BLOCK_TIMEOUT) -> bool:
+        """Queues a frame, waiting up to timeout seconds for room. Returns False if it was dropped."""
+        self.stats.frames += 1
+        item = (bytes(data), time.perf_counter())
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats.backpressure_waits += 1
+            try:
+                self._queue.put(item, timeout=timeout)
+            except queue.Full:
+                self.stats.dropped += 1
+                return False
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._queue.qsize())
+        return True
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stop(self, drain_timeout: float = 0.0) -> None:
+        """Stops the writer after the queued frames are written or drain_timeout has passed."""
+        self._drain_deadline = time.perf_counter() + drain_timeout
+        self._stop_flag = True
+
+    @Slot()
+    def run(self) -> None:
+        while True:
+            if self._stop_flag and (self._queue.empty() or time.perf_counter() > self._drain_deadline):
+                break
+            try:
+                data, queued_at = self._queue.get(timeout=IDLE_WAKEUP_INTERVAL)
+            except queue.Empty:
+                continue
+            timestamps = [queued_at]
+            if self.coalesce:
+                buffer = bytearray(data)
+                while len(buffer) < COALESCE_LIMIT:
+                    try:
+                        data, queued_at = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    buffer += data
+                    timestamps.append(queued_at)
+                data = buffer
+            try:
+                self.serial_port.write(data)
+            except (SerialException, OSError) as e:
+                self.error_occurred.emit(f"Error sending data: {e}")
+                continue
+            capture = self.capture
+            if capture is not None:
+                capture.record(TX, data)
+            now = time.perf_counter()
+            self.stats.writes += 1
+            self.stats.bytes_written += len(data)
+            self.stats.coalesced += len(timestamps) - 1
+            for queued_at in timestamps:
+                latency = now - queued_at
+                self.stats.total_latency += latency
+                if latency > self.stats.max_latency:
+                    self.stats.max_latency = latency
+            if self.metrics is not None:
+                self.metrics.record_write(len(data), [now - queued_at for queued_at in timestamps])
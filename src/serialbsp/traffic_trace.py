@@ -0,0 +1,130 @@
+import logging
+import threading
+from collections import deque
+from time import monotonic
+
+TRACE_CAPACITY = 512  # Number of frames kept in memory
+LOG_HEX_LIMIT = 64  # Bytes shown per frame in the user log, longer frames are truncated
+TRAFFIC_LOGGER_NAME = "fmcw.traffic"
+
+RX = "Rx"
+TX = "Tx"
+
+
+def format_hex(data, limit: int | None = None) -> str:
+    """
+    Formats bytes as space separated upper case hex ("08 00 1F").
+
+    Args:
+        data (bytes | bytearray | memoryview): The bytes to format.
+        limit (int | None): Maximum number of bytes to format, the rest is summarized.
+
+    Returns:
+        str: The formatted bytes.
+    """
+    if limit is not None and len(data) > limit:
+        return f"{bytes(data[:limit]).hex(' ').upper()} ... (+{len(data) - limit} bytes)"
+    return bytes(data).hex(' ').upper()
+
+
+class HexDump:
+    """
+    Deferred hex formatting of a frame, for logging calls like logger.debug("%s", HexDump(frame)).
+    The string is only built if a handler actually emits the record.
+    """
+    __slots__ = ("data", "limit")
+
+    def __init__(self, data, limit: int | None = None):
+        self.data = data
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return format_hex(self.data, self.limit)
+
+
+class TrafficTrace:
+    """
+    Bounded in-memory record of the raw Rx/Tx frames.
+
+    Recording a frame only stores a reference to its bytes with a timestamp, hex strings are
+    built when a view asks for them with dump(), when the user log is switched on with log_hex
+    (off by default), or when the "fmcw.traffic" logger is set to DEBUG.
+    """
+
+    def __init__(self, capacity: int = TRACE_CAPACITY, name: str | None = None):
+        """
+        Initialize the trace.
+
+        Args:
+            capacity (int): Number of frames kept, older frames are dropped.
+            name (str | None): Device the trace belongs to, logged as "fmcw.traffic.<name>".
+        """
+        self.name = name
+        self._frames = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(f"{TRAFFIC_LOGGER_NAME}.{name}" if name else TRAFFIC_LOGGER_NAME)
+        self.log_hex = False  # Show the frames in the user log, Tools > Log traffic as hex
+        self.log_hex_limit = LOG_HEX_LIMIT
+
+    def record(self, direction: str, data: bytes) -> None:
+        """
+        Stores a frame.
+
+        Args:
+            direction (str): RX or TX.
+            data (bytes): The frame, it must not be modified afterwards.
+        """
+        with self._lock:
+            self._frames.append((monotonic(), direction, data))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s: %s", direction, HexDump(data))
+
+    def log_line(self, direction: str, data) -> str | None:
+        """
+        Returns the user log line for a frame, or None if hex logging is disabled.
+        """
+        if not self.log_hex:
+            return None
+        prefix = f"[{self.name}] " if self.name else ""
+        return f"{prefix}{direction}: {format_hex(data, self.log_hex_limit)}"
+
+    def frames(self, direction: str | None = None) -> list[tuple[float, str, bytes]]:
+        """
+        Returns the recorded frames as (timestamp, direction, data), optionally for one direction.
+        """
+        with self._lock:
+            frames = list(self._frames)
+        if direction is not None:
+            frames = [frame for frame in frames if frame[1] == direction]
+        return frames
+
+    def dump(self, last: int | None = None, limit: int | None = None) -> str:
+        """
+        Formats the recorded frames, one per line.
+
+        Args:
+            last (int | None): Only format the newest frames.
+            limit (int | None): Maximum number of bytes shown per frame.
+
+        Returns:
+            str: The formatted trace.
+        """
+        frames = self.frames()
+        if last is not None:
+            frames = frames[-last:]
+        if not frames:
+            return ""
+        start = frames[0][0]
+        return "\n".join(f"{timestamp - start:10.4f} {direction} [{len(data):4}] {format_hex(data, limit)}"
+                         for timestamp, direction, data in frames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+# Trace of the GUI's connection, shared by its protocol and MainTab. Every DevicePool unit has its own
+traffic_trace = TrafficTrace()
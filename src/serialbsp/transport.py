@@ -0,0 +1,50 @@
+import serial
+
+# Port names with one of these prefixes are opened with the matching transport
+PTY_URL = "pty://"
+LOOPBACK_URL = "loop://"
+TCP_URL = "tcp://"
+REPLAY_URL = "replay://"  # replay://<capture file>[?speed=<factor>|max]
+
+
+class SerialTransport(serial.Serial):
+    """
+    The pyserial backend. serial.Serial already provides the transport interface used by
+    SerialManager and SerialPortReader:
+
+    - ``port``, ``baudrate``, ``timeout``, ``inter_byte_timeout`` and ``is_open``
+    - ``open()``, ``close()``, ``read(size)``, ``read_all()``, ``write(data)``
+    - ``in_waiting``, ``fileno()``, ``reset_input_buffer()``, ``reset_output_buffer()``
+    """
+
+
+def create_transport(port: str):
+    """
+    Creates the transport for a port name: "pty://", "loop://", "tcp://host:port",
+    "replay://<capture>[?speed=<factor>|max]" or a serial device name for pyserial.
+    The transport is returned closed with its port set. The URL transports are POSIX only
+    (see serialbsp.fd_transport) and imported on first use, so the pyserial path also works on
+    Windows.
+
+    Args:
+        port (str): The port name or transport URL.
+    """
+    if port.startswith((PTY_URL, LOOPBACK_URL, TCP_URL, REPLAY_URL)):
+        return _create_fd_transport(port)
+    transport = SerialTransport()
+    transport.port = port
+    return transport
+
+
+def _create_fd_transport(port: str):
+    from serialbsp.fd_transport import LoopbackTransport, PtyTransport, ReplayTransport, TcpTransport
+
+    if port.startswith(PTY_URL):
+        return PtyTransport(port)
+    if port.startswith(LOOPBACK_URL):
+        return LoopbackTransport(port)
+    if port.startswith(TCP_URL):
+        return TcpTransport(port[len(TCP_URL):])
+    if port.startswith(REPLAY_URL):
+        path, _, query = port[len(REPLAY_URL):].partition("?speed=")
+        return ReplayTransport(path, speed=None if query == "max" else float(query or 1.0))
@@ -0,0 +1,304 @@
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import partial
+from time import monotonic
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot
+
+from serialbsp.commands import Command
+from serialbsp.protocol_fmcw import PIPELINE_DEPTH
+
+# Priority classes, lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_MEASUREMENT = 1
+PRIORITY_BACKGROUND = 2
+
+DEFAULT_MAX_IN_FLIGHT = PIPELINE_DEPTH  # Requests on the line at once
+
+
+def default_priority(cmd: Command) -> int:
+    """Returns the priority class of a command sent without an explicit priority."""
+    return PRIORITY_MEASUREMENT if "_MEAS_" in cmd.name else PRIORITY_INTERACTIVE
+
+
+@dataclass
+class TrafficClass:
+    """
+    Rate limit and counters of one priority class.
+
+    Args:
+        name (str): Name of the class in the statistics.
+        min_interval_ms (int): Minimum time between two requests of this class, 0 for no limit.
+    """
+    name: str
+    min_interval_ms: int = 0
+    last_sent: float = float("-inf")
+    sent: int = 0
+    failed: int = 0
+    total_wait: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "avg_wait_ms": self.total_wait / self.sent * 1000 if self.sent else 0.0,
+            "min_interval_ms": self.min_interval_ms,
+        }
+
+
+@dataclass
+class QueuedRequest:
+    command: Command
+    data: list[int]
+    priority: int
+    timeout_ms: int | None
+    queued_at: float
+    future: Future = field(default_factory=Future)
+
+
+@dataclass
+class PeriodicJob:
+    """
+    Command sent at a fixed cadence, see TxScheduler.add_periodic().
+    """
+    name: str
+    command: Command
+    data: list[int]
+    interval_ms: int
+    callback: Callable | None
+    priority: int
+    timer: QTimer
+    next_due: float = 0.0
+    in_queue: bool = False
+    samples: int = 0
+    skipped: int = 0
+
+
+class TxScheduler(QObject):
+    """
+    Transmit scheduler in front of SerialProtocolFmcw.
+
+    Requests are queued per priority class (interactive, measurement, background telemetry) and
+    released onto the line highest priority first, with at most max_in_flight requests waiting
+    for a response and an optional minimum interval per class. Background polling therefore
+    yields the line to interactive requests instead of interleaving with them.
+
+    Periodic jobs keep their cadence on absolute due times: a sample delayed by interactive
+    traffic does not shift the following ones, and a sample that is still queued when the next
+    one is due is coalesced instead of piling up. The scheduler must live in the GUI thread, its
+    timers and the protocol's signals are used from there.
+
+    Completions are handed back to the scheduler's thread before the returned futures are set,
+    so callbacks of submit() futures and periodic jobs run in the GUI thread even when the
+    protocol extracts responses in a worker thread.
+
+    In the GUI the scheduler is the only send path: request() has the signature of
+    SerialProtocolFmcw.request(), so command scripts, antenna sweeps and continuous acquisition
+    are started on the scheduler and their requests are counted and prioritized with the rest.
+    Only headless tools without an event loop call the protocol directly.
+    """
+    _request_finished = Signal(object, object)  # QueuedRequest, completed protocol request
+
+    def __init__(self, protocol, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, parent=None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            protocol (SerialProtocolFmcw): The protocol to send the requests with.
+            max_in_flight (int): Number of requests allowed on the line at once.
+            parent (QObject | None): Parent object.
+        """
+        super().__init__(parent)
+        self.protocol = protocol
+        self.max_in_flight = max_in_flight
+        self.classes = {
+            PRIORITY_INTERACTIVE: TrafficClass("interactive"),
+            PRIORITY_MEASUREMENT: TrafficClass("measurement"),
+            PRIORITY_BACKGROUND: TrafficClass("background"),
+        }
+        self._queues = {priority: deque() for priority in self.classes}
+        self._jobs: dict[str, PeriodicJob] = {}
+        self._in_flight = 0
+        self._dispatching = False
+        self._lock = threading.RLock()
+
+        self._rate_timer = QTimer(self)
+        self._rate_timer.setSingleShot(True)
+        self._rate_timer.timeout.connect(self._dispatch)
+        self._request_finished.connect(self._on_request_finished, Qt.QueuedConnection)
+
+    def set_rate_limit(self, priority: int, min_interval_ms: int) -> None:
+        """Sets the minimum time between two requests of a priority class."""
+        self.classes[priority].min_interval_ms = min_interval_ms
+
+    def submit(self, cmd: Command, data: list[int], priority: int | None = None, timeout_ms: int | None = None) -> Future:
+        """
+        Queues a request.
+
+        Args:
+            cmd (Command): The command to send.
+            data (list[int]): The data bytes of the command.
+            priority (int | None): PRIORITY_*, defaults to default_priority(cmd).
+            timeout_ms (int | None): Response timeout, defaults to the protocol's.
+
+        Returns:
+            Future[bytes]: Completes like SerialProtocolFmcw.request() once the request was sent.
+        """
+        if priority is None:
+            priority = default_priority(cmd)
+        entry = QueuedRequest(cmd, list(data), priority, timeout_ms, monotonic())
+        with self._lock:
+            self._queues[priority].append(entry)
+        self._dispatch()
+        return entry.future
+
+    def request(self, cmd: Command, data: list[int], timeout_ms: int | None = None,
+                priority: int | None = None) -> Future:
+        """Same as submit(), with the argument order of SerialProtocolFmcw.request()."""
+        return self.submit(cmd, data, priority, timeout_ms)
+
+    def add_periodic(self, name: str, cmd: Command, data: list[int], interval_ms: int,
+                     callback: Callable | None = None, priority: int = PRIORITY_BACKGROUND) -> PeriodicJob:
+        """
+        Sends a command every interval_ms, starting now. Replaces a job with the same name.
+
+        Args:
+            name (str): Name of the job.
+            cmd (Command): The command to send.
+            data (list[int]): The data bytes of the command.
+            interval_ms (int): The sampling interval.
+            callback (Callable | None): Called with the completed future of each sample.
+            priority (int): PRIORITY_* of the samples.
+
+        Returns:
+            PeriodicJob: The job, with its sample and skip counters.
+        """
+        self.remove_periodic(name)
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setTimerType(Qt.PreciseTimer)
+        job = PeriodicJob(name, cmd, list(data), interval_ms, callback, priority, timer, next_due=monotonic())
+        timer.timeout.connect(partial(self._run_periodic, job))
+        self._jobs[name] = job
+        self._run_periodic(job)
+        return job
+
+    def remove_periodic(self, name: str) -> None:
+        """Stops a periodic job, a sample already on the line still completes."""
+        job = self._jobs.pop(name, None)
+        if job is not None:
+            job.timer.stop()
+            job.timer.deleteLater()
+
+    def pending_count(self) -> int:
+        """Returns the number of queued requests not yet sent."""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> dict:
+        """Returns the counters per priority class and per periodic job."""
+        with self._lock:
+            return {
+                "classes": {traffic_class.name: traffic_class.as_dict() for traffic_class in self.classes.values()},
+                "jobs": {job.name: {"samples": job.samples, "skipped": job.skipped} for job in self._jobs.values()},
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "in_flight": self._in_flight,
+            }
+
+    @Slot()
+    def _dispatch(self) -> None:
+        """
+        Sends queued requests while the line has room. Re-entrant calls (a callback that submits
+        a new request) return at once, the outer loop picks up the new request.
+        """
+        with self._lock:
+            if self._dispatching:
+                return
+            self._dispatching = True
+            try:
+                while self._in_flight < self.max_in_flight:
+                    entry, wait = self._next_request(monotonic())
+                    if entry is None:
+                        if wait is not None:
+                            self._rate_timer.start(max(1, int(wait * 1000) + 1))
+                        return
+                    self._send(entry)
+            finally:
+                self._dispatching = False
+
+    def _next_request(self, now: float) -> tuple[QueuedRequest | None, float | None]:
+        """
+        Picks the request of the highest priority class that is not rate limited.
+
+        Returns:
+            tuple: The request (or None) and the time in seconds until a rate limited class
+            becomes ready (or None).
+        """
+        wait = None
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+            if not queue:
+                continue
+            traffic_class = self.classes[priority]
+            ready_at = traffic_class.last_sent + traffic_class.min_interval_ms / 1000
+            if now >= ready_at:
+                return queue.popleft(), None
+            wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return None, wait
+
+    def _send(self, entry: QueuedRequest) -> None:
+        now = monotonic()
+        traffic_class = self.classes[entry.priority]
+        traffic_class.last_sent = now
+        traffic_class.sent += 1
+        traffic_class.total_wait += now - entry.queued_at
+        self._in_flight += 1
+        try:
+            request = self.protocol.request(entry.command, entry.data, entry.timeout_ms)
+        except Exception as e:
+            self._in_flight -= 1
+            traffic_class.failed += 1
+            entry.future.set_exception(e)
+            return
+        request.add_done_callback(partial(self._request_finished.emit, entry))
+
+    @Slot(object, object)
+    def _on_request_finished(self, entry: QueuedRequest, request: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if request.cancelled() or request.exception() is not None:
+                self.classes[entry.priority].failed += 1
+        if request.cancelled():
+            entry.future.cancel()
+        elif request.exception() is not None:
+            entry.future.set_exception(request.exception())
+        else:
+            entry.future.set_result(request.result())
+        self._dispatch()
+
+    def _run_periodic(self, job: PeriodicJob) -> None:
+        if self._jobs.get(job.name) is not job:
+            return
+        now = monotonic()
+        if job.in_queue:
+            job.skipped += 1 # The previous sample has not completed yet, coalesce
+        else:
+            job.in_queue = True
+            job.samples += 1
+            self.submit(job.command, job.data, job.priority).add_done_callback(partial(self._on_periodic_done, job))
+
+        interval = job.interval_ms / 1000
+        job.next_due += interval
+        if job.next_due <= now: # Fell behind by more than one interval, stay on the original grid
+            missed = int((now - job.next_due) / interval) + 1
+            job.skipped += missed
+            job.next_due += missed * interval
+        job.timer.start(max(0, int((job.next_due - now) * 1000)))
+
+    def _on_periodic_done(self, job: PeriodicJob, request: Future) -> None:
+        job.in_queue = False
+        if job.callback is not None:
+            job.callback(request)
@@ -0,0 +1,67 @@
+import os
+import sys
+from collections import deque
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from serialbsp import protocol_fmcw
+from serialbsp.commands import get_command_by_code
+from serialbsp.crc8 import crc8
+from serialbsp.protocol_fmcw import SerialProtocolFmcw
+from serialbsp.rtt_stats import transfer_time_ms
+
+
+def response_frame(cmd) -> bytes:
+    """A valid response of the command's size with a counting payload."""
+    body = bytes([cmd.code, 0]) + bytes(index % 256 for index in range(cmd.response_size - 3))
+    return body + bytes([crc8(body)])
+
+
+class SimulatedDevice:
+    """
+    Answers the commands of a protocol in send order, advancing the clock by the wire time of
+    each response the way a device on a link of the protocol's baud rate would.
+    """
+
+    def __init__(self, protocol: SerialProtocolFmcw, clock: list[float]):
+        self.protocol = protocol
+        self.clock = clock
+        self.sent = deque()
+        protocol.command_encoded.connect(lambda encoded: self.sent.append(bytes(encoded)))
+
+    def answer_all(self) -> int:
+        """Answers until nothing is left to send, including requests sent from completion callbacks."""
+        answered = 0
+        while self.sent:
+            cmd = get_command_by_code(self.sent.popleft()[0])
+            if cmd.response_size <= 0:
+                continue
+            self.clock[0] += transfer_time_ms(cmd.response_size, self.protocol.baudrate) / 1000
+            self.protocol._handle_packet_timeout()
+            self.protocol.handle_raw_data(response_frame(cmd))
+            answered += 1
+        return answered
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the protocol's monotonic() with a clock the test advances."""
+    QCoreApplication.instance() or QCoreApplication([])
+    now = [1000.0]
+    monkeypatch.setattr(protocol_fmcw, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def protocol(clock):
+    protocol = SerialProtocolFmcw()
+    protocol.baudrate = 9600
+    return protocol
+
+
+@pytest.fixture
+def device(protocol, clock):
+    return SimulatedDevice(protocol, clock)
@@ -0,0 +1,13 @@
+import os
+
+from serialbsp.command_script import CommandScript
+
+ACCEPTANCE_SCRIPT = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'acceptance_script.yaml')
+
+
+def test_acceptance_script_passes_at_9600_baud(protocol, device):
+    script = CommandScript.from_yaml(ACCEPTANCE_SCRIPT)
+    job = script.start(protocol)
+    assert device.answer_all() == len(script.steps)
+    result = job.result(timeout=0)
+    assert result.ok, result.report()
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from serialbsp.crc8 import VECTOR_MIN_BYTES, VECTOR_SPAN, check_crc, crc8, crc8_many
+
+
+def reference_crc8(data: bytes) -> int:
+    """Bitwise Dallas/Maxim CRC8 (reflected polynomial 0x8C, initial value 0)."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x8C if crc & 1 else crc >> 1
+    return crc
+
+
+def test_check_value():
+    assert crc8(b"123456789") == 0xA1
+    assert crc8(b"123456789" * 100) == reference_crc8(b"123456789" * 100)
+
+
+@pytest.mark.parametrize("size", [0, 1, 4, 25, VECTOR_MIN_BYTES - 1, VECTOR_MIN_BYTES, 1026, 1027,
+                                  VECTOR_SPAN, VECTOR_SPAN + 1, 3 * VECTOR_SPAN + 17])
+def test_matches_reference(size):
+    data = bytes(random.Random(size).randrange(256) for _ in range(size))
+    expected = reference_crc8(data)
+    assert crc8(data) == expected
+    assert crc8(bytearray(data)) == expected
+    assert crc8(list(data)) == expected
+    padded = memoryview(b"\xAA" * 3 + data + b"\x55" * 2)
+    assert crc8(padded, 3, 3 + size) == expected
+
+
+def test_frame_with_crc_byte_validates():
+    frame = bytearray(random.Random(1).randrange(256) for _ in range(1026))
+    frame.append(reference_crc8(frame))
+    assert check_crc(frame)
+    frame[500] ^= 0x01
+    assert not check_crc(frame)
+
+
+def test_many_matches_reference():
+    rng = random.Random(2)
+    buffers = [bytes(rng.randrange(256) for _ in range(size)) for size in (4, 4, 150, 1027, 1027, 1027, VECTOR_SPAN + 5, VECTOR_SPAN + 5)]
+    assert crc8_many(buffers) == [reference_crc8(buffer) for buffer in buffers]
+    assert crc8_many(buffers, end_offset=1) == [reference_crc8(buffer[:-1]) for buffer in buffers]
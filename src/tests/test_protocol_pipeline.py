@@ -0,0 +1,40 @@
+import pytest
+
+from serialbsp.commands import get_command_by_name
+from serialbsp.protocol_fmcw import PIPELINE_DEPTH
+from serialbsp.rtt_stats import transfer_time_ms
+from tests.conftest import response_frame
+
+ADC_COMMANDS = [get_command_by_name(f"CMD_START_ADC_MEAS_ANTENNA_{antenna}") for antenna in range(1, 5)]
+
+
+def test_pipelined_adc_reads_at_9600_baud_do_not_time_out(protocol, clock):
+    commands = ADC_COMMANDS[:PIPELINE_DEPTH]
+    futures = [protocol.request(cmd, [0]) for cmd in commands]
+    wire_time = transfer_time_ms(commands[0].response_size, protocol.baudrate) / 1000
+    # Back to back the responses take longer than the default timeout of a single request
+    assert len(commands) * wire_time > protocol.packet_timeout / 1000
+
+    for cmd, future in zip(commands, futures):
+        clock[0] += wire_time
+        protocol._handle_packet_timeout()
+        protocol.handle_raw_data(response_frame(cmd))
+        assert future.result(timeout=0) == response_frame(cmd)
+
+    assert protocol.pending_request_count() == 0
+    # Each RTT is the request's own transfer, not the time spent behind the others
+    for cmd in commands:
+        assert protocol.rtt_stats.summary()[cmd.code]["max_ms"] == pytest.approx(wire_time * 1000)
+
+
+def test_request_behind_a_lost_response_times_out_after_its_own_timeout(protocol, clock):
+    first, second = (protocol.request(cmd, [0], timeout_ms=500) for cmd in ADC_COMMANDS[:2])
+
+    clock[0] += 0.5
+    protocol._handle_packet_timeout()
+    assert isinstance(first.exception(timeout=0), TimeoutError)
+    assert not second.done()
+
+    clock[0] += 0.5
+    protocol._handle_packet_timeout()
+    assert isinstance(second.exception(timeout=0), TimeoutError)
@@ -0,0 +1,35 @@
+from serialbsp.commands import get_command_by_name
+from tests.conftest import response_frame
+
+STATUS = get_command_by_name("CMD_GET_DEVICE_STATUS")
+SD_STATUS = get_command_by_name("CMD_GET_SDCARD_STATUS")
+
+
+def corrupted(frame: bytes) -> bytes:
+    frame = bytearray(frame)
+    frame[5] ^= 0xFF
+    return bytes(frame)
+
+
+def test_one_corrupted_frame_counts_one_resync(protocol):
+    futures = [protocol.request(cmd, [0]) for cmd in (STATUS, SD_STATUS, STATUS)]
+    # The corrupted payload holds both pending command codes, the frame after it is split
+    protocol.handle_raw_data(corrupted(response_frame(STATUS)) + response_frame(SD_STATUS)[:5])
+    protocol.handle_raw_data(response_frame(SD_STATUS)[5:] + response_frame(STATUS))
+
+    assert futures[1].result(timeout=0) == response_frame(SD_STATUS)
+    assert protocol.pending_request_count() == 1  # One status request waits for its timeout
+    assert protocol.resync_count == 1
+    assert protocol.resync_skipped_bytes == STATUS.response_size
+    link = protocol.metrics.snapshot()
+    assert (link["resyncs"], link["crc_failures"], link["resync_bytes"]) == (1, 1, STATUS.response_size)
+
+
+def test_corruptions_separated_by_a_valid_frame_count_twice(protocol):
+    futures = [protocol.request(cmd, [0]) for cmd in (STATUS, SD_STATUS, STATUS, SD_STATUS)]
+    protocol.handle_raw_data(corrupted(response_frame(STATUS)) + response_frame(SD_STATUS))
+    protocol.handle_raw_data(corrupted(response_frame(STATUS)) + response_frame(SD_STATUS))
+
+    assert [future.done() for future in futures] == [False, True, False, True]
+    assert protocol.resync_count == 2
+    assert protocol.metrics.snapshot()["resyncs"] == 2
@@ -0,0 +1,12 @@
+from measurement.frames import ADC, ANTENNAS, FFT
+from measurement.streaming import ContinuousAcquisition
+
+
+def test_continuous_acquisition_at_9600_baud_has_no_timeouts(protocol, device):
+    for source in (FFT, ADC):
+        acquisition = ContinuousAcquisition(protocol, source)
+        stopped = acquisition.start(max_sweeps=3)
+        assert device.answer_all() == 3 * len(ANTENNAS)
+        assert stopped.result(timeout=0) == 3
+        assert acquisition.failed_frames == 0
+        assert {antenna: stats.count for antenna, stats in acquisition.snapshot().items()} == {antenna: 3 for antenna in ANTENNAS}
@@ -0,0 +1,17 @@
+import numpy as np
+
+from measurement.frames import ADC, ANTENNAS, FFT
+from measurement.sweep import AntennaSweep
+
+
+def test_sweep_of_full_size_frames_at_9600_baud(protocol, device):
+    sweep = AntennaSweep((ADC, FFT))
+    job = sweep.start(protocol, sweeps=2)
+    assert device.answer_all() == 2 * len(ANTENNAS) * 2
+    result = job.result(timeout=0)
+    assert result.errors == []
+    for kind in (ADC, FFT):
+        block = result.blocks[kind]
+        assert block.valid.all()
+        # The counting payload of the simulated device starts right after the header
+        assert np.all(block.samples[:, :, 0] == block.samples[0, 0, 0])